@@ -59,3 +59,373 @@ for timeline in timelines:
     globals()[suite.__name__] = suite
 
 timeline = None
+
+
+class Mem_WriteFrames:
+    '''
+    输出视频时，稳定状态下每帧在 Python 中产生的临时内存分配
+
+    在预热若干帧之后重置 ``tracemalloc`` 的峰值记录，之后的峰值与当时的差值即为单帧临时分配的上限；
+    因为像素数据是写入循环使用的缓冲区中的，所以这个值不应随分辨率（也就是每帧的字节数）增长
+    '''
+    unit = 'bytes'
+    params = ([(1280, 720), (3840, 2160)], [True, False])
+    param_names = ['resolution', 'use_pbo']
+    warmup_frames = 10
+
+    def setup(self, resolution, use_pbo):
+        from janim.imports import Circle, Square
+        from janim.render.writer import VideoWriter
+
+        class Static(Timeline):
+            CONFIG = Config(pixel_width=resolution[0], pixel_height=resolution[1], fps=30)
+
+            def construct(self):
+                Circle().show()
+                self.play(Square().anim.points.shift([1, 0, 0]))
+
+        self.writer = VideoWriter(Static().build(quiet=True))
+
+    def track_steady_state_alloc(self, resolution, use_pbo):
+        import os
+        import tracemalloc
+
+        steady_begin = None
+
+        def on_progress(n: int) -> None:
+            nonlocal steady_begin
+            if self.writer.stats.frames == self.warmup_frames:
+                tracemalloc.reset_peak()
+                steady_begin = tracemalloc.get_traced_memory()[0]
+
+        tracemalloc.start()
+        try:
+            with open(os.devnull, 'wb') as f:
+                self.writer.write_frames(range(self.writer.frame_count),
+                                         f,
+                                         use_pbo=use_pbo,
+                                         transparent=False,
+                                         on_progress=on_progress)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return peak - steady_begin
+
+
+class Mem_BuildChanges:
+    '''
+    构建过程中 300 个物件共发生 2000 次变化（每次只改变一个物件的填充色）后，所记录的数据占用的内存
+
+    :class:`~.Display` 通过 ``store(readonly=True)`` 记录物件数据，没有变化的组件会被复用，
+    所以这个值应当随变化的数据量增长，而不是随“物件数量 × 变化次数”增长
+    '''
+    unit = 'bytes'
+
+    def track_retained(self):
+        import gc
+        import tracemalloc
+
+        from janim.imports import Square
+
+        class Changes(Timeline):
+            def construct(self):
+                items = [Square(side_length=0.1) for _ in range(300)]
+                self.show(*items)
+                for i in range(2000):
+                    items[i % 300].fill.set(alpha=(i % 7) / 7)
+                    self.forward(0.1)
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            built = Changes().build(quiet=True)
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        del built
+        return retained
+
+
+class Mem_ItemFootprint:
+    '''
+    每个 :class:`~.VItem` 以及每次 :meth:`~.Item.store` 得到的快照所占用的内存（取 5000 个的平均值）
+
+    这主要由组件、``refresh_data``、信号连接等附带的记录所决定，而不是由点的数据所决定
+    '''
+    unit = 'bytes'
+    number = 5000
+
+    def setup(self):
+        from janim.imports import LEFT, RIGHT, UP, VItem
+
+        self.create = lambda: VItem(LEFT, UP, RIGHT)
+        # 预先创建一次，使得类级别的缓存不被计入
+        self.create().store()
+
+    def _measure(self) -> tuple[float, float]:
+        import gc
+        import tracemalloc
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            items = [self.create() for _ in range(self.number)]
+            gc.collect()
+            after_create = tracemalloc.get_traced_memory()[0]
+            stored = [item.store() for item in items]
+            gc.collect()
+            after_store = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+        del items, stored
+        return after_create / self.number, (after_store - after_create) / self.number
+
+    def track_per_vitem(self):
+        return self._measure()[0]
+
+    def track_per_store(self):
+        return self._measure()[1]
+
+
+class Time_TypstColdCache:
+    '''
+    在没有缓存时构建 :mod:`janim.examples` 中使用了 Typst 的示例
+
+    - ``sequential``: 直接构建，每个物件都在创建时等待各自的编译完成
+    - ``prefetch``: 在构建前通过 :meth:`~.TypstDoc.prefetch` 提交示例中的所有文档，使得多个 typst 进程同时运行
+
+    示例中的文档在 ``setup`` 中通过一次构建记录下来；
+    每次都使用新的 ``temp_dir``，因此都需要重新编译；没有安装 typst 时跳过
+    '''
+    params = ['sequential', 'prefetch']
+    param_names = ['mode']
+    number = 1
+    warmup_time = 0
+
+    def setup(self, mode):
+        import shutil
+        import tempfile
+        from unittest.mock import patch
+
+        import janim.items.svg.typst as typst
+
+        if shutil.which(Config.get.typst_bin) is None:
+            raise NotImplementedError
+
+        self.timelines = [
+            timeline
+            for timeline in timelines
+            if 'Typst' in inspect.getsource(timeline)
+        ]
+
+        # 记录示例中编译的文档
+        self.sources: list[tuple] = []
+        compiler = typst.TypstCompiler()
+        submit = compiler.submit
+
+        def recording_submit(*args):
+            self.sources.append(args)
+            return submit(*args)
+
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                Config(temp_dir=temp_dir), \
+                patch.object(typst, 'typst_compiler', compiler), \
+                patch.object(compiler, 'submit', recording_submit):
+            for timeline in self.timelines:
+                timeline().build(quiet=True)
+
+    def time_build(self, mode):
+        import tempfile
+        from unittest.mock import patch
+
+        import janim.items.svg.typst as typst
+
+        compiler = typst.TypstCompiler()
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                Config(temp_dir=temp_dir), \
+                patch.object(typst, 'typst_compiler', compiler):
+            if mode == 'prefetch':
+                for source in self.sources:
+                    compiler.submit(*source)
+            for timeline in self.timelines:
+                timeline().build(quiet=True)
+
+
+class Time_SVGLoad:
+    '''
+    在新的进程中（也就是没有内存中的缓存时）得到含有 10k 个路径的 SVG 文件的解析结果
+
+    - ``parse``: 没有磁盘缓存，使用 svgelements 解析
+    - ``disk_cache``: 从 :class:`~.SVGCache` 的磁盘缓存中读取
+    '''
+    params = ['parse', 'disk_cache']
+    param_names = ['source']
+    count = 10000
+
+    def setup(self, source):
+        import hashlib
+        import os
+        import tempfile
+
+        from janim.items.svg.svg_item import SVG_CACHE_VERSION, SVGItem
+
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.config = Config(temp_dir=self.tempdir.name)
+        self.config.__enter__()
+
+        paths = []
+        for i in range(self.count):
+            x, y = i % 100 * 10, i // 100 * 10
+            paths.append(
+                f'<path d="M {x} {y} L {x + 4} {y} C {x + 6} {y + 1} {x + 6} {y + 3} {x + 4} {y + 4} '
+                f'Q {x + 2} {y + 6} {x} {y + 4} A 2 2 0 0 1 {x} {y} Z" transform="translate(1 1)"/>'
+            )
+        self.file_path = os.path.join(self.tempdir.name, 'paths.svg')
+        with open(self.file_path, 'w') as f:
+            f.write('<svg xmlns="http://www.w3.org/2000/svg" width="1000pt" height="1000pt" viewBox="0 0 1000 1000">')
+            f.write(''.join(paths))
+            f.write('</svg>')
+
+        with open(self.file_path, 'rb') as f:
+            self.cache_key = (hashlib.md5(f.read()).hexdigest(), False, None, SVG_CACHE_VERSION)
+        if source == 'disk_cache':
+            SVGItem.get_items_from_file(self.file_path)
+            SVGItem.vitem_builders_map.clear()
+
+    def teardown(self, source):
+        self.config.__exit__(None, None, None)
+        self.tempdir.cleanup()
+
+    def time_load(self, source):
+        from janim.items.svg.svg_item import SVGCache, SVGItem
+
+        if source == 'parse':
+            SVGItem.parse_file(self.file_path)
+        else:
+            assert SVGCache.get(self.cache_key) is not None
+
+
+class Time_AnimStack:
+    '''
+    单个物件上有 10k 个动画对象时，:class:`~.AnimStack` 的添加与查询
+
+    - ``overlapping``: 大量相互重叠的动画（例如长时间持续的 updater）
+    - ``sequential``: 依次进行的、覆盖先前动画的动画（例如连续的 ``.anim`` 变换）
+    '''
+    params = ['overlapping', 'sequential']
+    param_names = ['layout']
+    count = 10000
+
+    def setup(self, layout):
+        from types import SimpleNamespace
+
+        from janim.anims.anim_stack import AnimStack
+        from janim.anims.animation import TimeRange
+
+        if layout == 'overlapping':
+            self.anims = [
+                SimpleNamespace(t_range=TimeRange(i * 0.01, i * 0.01 + 5), _cover_previous_anims=False)
+                for i in range(self.count)
+            ]
+        else:
+            self.anims = [
+                SimpleNamespace(t_range=TimeRange(i * 0.5, i * 0.5 + 1), _cover_previous_anims=True)
+                for i in range(self.count)
+            ]
+        self.duration = self.anims[-1].t_range.end
+
+        self.make_stack = lambda: AnimStack(None, None)
+        self.stack = self.make_stack()
+        for anim in self.anims:
+            self.stack.append(anim)
+
+    def time_append(self, layout):
+        stack = self.make_stack()
+        for anim in self.anims:
+            stack.append(anim)
+
+    def time_get(self, layout):
+        for i in range(1000):
+            self.stack.get(i / 1000 * self.duration)
+
+
+class Time_TimeAligner:
+    '''
+    :meth:`~.TimeAligner.align_t` 记录 100k 个时间点，
+    ``random`` 表示以随机的顺序记录（例如大量的 ``schedule`` 以及字幕），``sequential`` 表示按时间顺序记录
+    '''
+    params = ['sequential', 'random']
+    param_names = ['order']
+    count = 100000
+
+    def setup(self, order):
+        import random
+
+        if order == 'sequential':
+            self.times = [i * 0.01 for i in range(self.count)]
+        else:
+            rnd = random.Random(0)
+            self.times = [rnd.random() * 7200 for _ in range(self.count)]
+
+    def time_align_t(self, order):
+        from janim.anims.animation import TimeAligner
+
+        aligner = TimeAligner()
+        for t in self.times:
+            aligner.align_t(t)
+
+
+class Time_TimeIntervals:
+    '''
+    20k 个短暂出现的物件集中在 4s 内时，:class:`~.TimeIntervals` 按帧查询可见物件
+
+    ``sequential`` 为按时间顺序查询（例如输出视频时），``random`` 为随机跳转（例如在预览窗口中拖动进度条）
+    '''
+    params = ['sequential', 'random']
+    param_names = ['order']
+    count = 20000
+    fps = 60
+
+    def setup(self, order):
+        import random
+
+        from janim.anims.animation import TimeIntervals, TimeRange
+
+        rnd = random.Random(0)
+        ranges = []
+        for _ in range(self.count):
+            at = rnd.random() * 4
+            ranges.append(TimeRange(at, at + rnd.random() * 2))
+
+        self.intervals = TimeIntervals(ranges, lambda rg: rg)
+        self.times = [i / self.fps for i in range(6 * self.fps)]
+        if order == 'random':
+            rnd.shuffle(self.times)
+
+    def time_get(self, order):
+        for t in self.times:
+            self.intervals.get(t)
+
+
+class Time_DetectChanges:
+    '''
+    场景中有 5000 个物件，并进行 500 次 ``play`` 时的构建，每次 ``play`` 只改变其中一个物件
+
+    :meth:`~.Timeline.detect_changes_of_all` 只会检查发生变化的物件，所以构建时间主要在于创建物件
+    '''
+
+    def time_build(self):
+        from janim.imports import RIGHT, Square
+
+        class ManyItems(Timeline):
+            def construct(self) -> None:
+                items = [Square(side_length=0.1) for _ in range(5000)]
+                self.show(*items)
+                for i in range(500):
+                    self.play(items[i].anim.points.shift(RIGHT * 0.1), duration=0.1)
+
+        ManyItems().build(quiet=True)
@@ -81,6 +81,18 @@ def render_args(
         action='store_true',
         help=_('Hide subtitles')
     )
+    parser.add_argument(
+        '--build_cache',
+        action='store_true',
+        help=_('Load the built timeline from cache if the source code and config are unchanged, '
+               'and write the cache after building')
+    )
+    parser.add_argument(
+        '--static_layers',
+        action='store_true',
+        help=_('Cache consecutive items that do not change over time into layers, '
+               'instead of drawing them again every frame')
+    )
 
 
 def run_parser(parser: ArgumentParser) -> None:
@@ -159,6 +171,26 @@ def write_parser(parser: ArgumentParser) -> None:
         action='store_true',
         help=_('Use hardware acceleration for writing video')
     )
+    other_options.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help=_('Number of processes used to render video in parallel (1 by default)')
+    )
+    other_options.add_argument(
+        '--segment_duration',
+        type=float,
+        default=None,
+        help=_('Write video in segments of the given duration (in seconds), '
+               'so that an interrupted export can be resumed')
+    )
+    other_options.add_argument(
+        '--profile',
+        metavar='FILE',
+        default=None,
+        help=_('Record the time spent on each stage of rendering and save it to FILE as a Chrome trace '
+               '(can be viewed in chrome://tracing or Perfetto)')
+    )
 
     parser.set_defaults(func=write)
 
@@ -174,6 +206,8 @@ def examples_parser(parser: ArgumentParser) -> None:
     parser.set_defaults(config=None)
     parser.set_defaults(func=run)
     parser.set_defaults(hide_subtitles=False)
+    parser.set_defaults(build_cache=False)
+    parser.set_defaults(static_layers=False)
     parser.set_defaults(interact=False)
 
 
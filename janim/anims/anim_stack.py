@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-from bisect import bisect_left, bisect_right
-from collections import defaultdict
+import math
+from collections import OrderedDict, defaultdict
 from typing import Generator
 
+import numpy as np
+
 from janim.anims.animation import ApplyAligner, ItemAnimation, TimeAligner
 from janim.anims.display import Display
 from janim.constants import FOREVER
 from janim.items.item import Item
+from janim.utils.data import Array
+from janim.utils.interval_tree import IntervalNode, IntervalTree
+from janim.utils.profiler import profile_span
 
 type ComputeAnimsGenerator = Generator[ApplyAligner, None, Item]
 
@@ -24,10 +29,17 @@ class AnimStack:
         # 如果发生变化，则记录新的 Display 对象
         self.prev_display: Display | None = None
 
-        # times 和 stacks 的元素是一一对应的
-        # times 中的元素表示 stacks 中对应位置动画序列的开始时间（以下一个时间点为结束时间）
-        self.times: list[float] = [0]
-        self.stacks: list[list[ItemAnimation]] = [[]]
+        # 记录各个动画对象作用的时间区段，区段的值为动画对象，seq 为添加的次序
+        # 被 _cover_previous_anims 覆盖的部分会被裁去，所以某一时刻的动画序列就是包含该时刻的区段按 seq 排序的结果
+        self.anims: IntervalTree[ItemAnimation] = IntervalTree()
+        self.seq = 0
+        # 每次添加动画对象时增加，使得 compute_cache 中先前的结果失效
+        self.version = 0
+
+        # 缓存 get 与 get_at_left 的结果，以及结果在哪个范围内保持不变
+        # 对于按时间顺序的查询（例如输出视频时），大多数情况下可以直接使用缓存
+        self.get_cache: tuple[float, float, list[ItemAnimation]] | None = None
+        self.get_at_left_cache: tuple[float, float, list[ItemAnimation]] | None = None
 
         # 用于缓存结果，具体处理另见 compute 方法
         self.clear_cache()
@@ -41,7 +53,7 @@ class AnimStack:
         if self.prev_display is None:
             at = 0
         if self.prev_display is None or force or not self.prev_display.data_orig.not_changed(item):
-            anim = Display(item, item.store(), at=at, duration=FOREVER, show_at_begin=False)
+            anim = Display(item, item.store(readonly=True), at=at, duration=FOREVER, show_at_begin=False)
             # finalize 会产生对 self.append 的调用，因此不用再另外 self.append
             anim.finalize()
             self.prev_display = anim
@@ -57,72 +69,80 @@ class AnimStack:
         '''
         向 :class:`AnimStack` 添加 :class:`~.Animation` 对象
         '''
-
-        # 下面这些代码主要是为了对区段进行优化处理，提前计算出特定区段中存在哪些动画对象
-        # 这样可以避免在 compute 以及渲染时重复判断哪些动画对象是否作用，提高效率
-
-        #
-        t_cnt = len(self.times)
         at = anim.t_range.at
-        end = anim.t_range.end
-        at_idx = None
-        end_idx = t_cnt if end is FOREVER else None
+        end = math.inf if anim.t_range.end is FOREVER else anim.t_range.end
 
         # 避免缓存导致的问题
         if self.cache_time is not None:
             self.clear_cache()
+        self.get_cache = None
+        self.get_at_left_cache = None
+        self.version += 1
+
+        if at >= end:
+            return
 
-        # 在大多数情况中，anim 会被添加到末尾的区段
-        # 所以这里从末尾开始遍历，而不是 bisect 二分查找
-        for i, t in enumerate(reversed(self.times)):
-            if end_idx is None:
-                if t <= end:
-                    # t_cnt - 1 - i 即 t 的下标
-                    end_idx = t_cnt - 1 - i
-            if end_idx is not None:
-                if t <= at:
-                    at_idx = t_cnt - 1 - i
-                    break
-
-        assert at_idx is not None
-        assert end_idx is not None
-
-        # 必要时在 at 处切一刀
-        if self.times[at_idx] != at:
-            at_idx += 1
-            self.times.insert(at_idx, at)
-            self.stacks.insert(at_idx, self.stacks[at_idx - 1].copy())
-            end_idx += 1
-
-        # 必要时在 end 处切一刀
-        if end_idx != len(self.times) and self.times[end_idx] != end:
-            end_idx += 1
-            self.times.insert(end_idx, end)
-            self.stacks.insert(end_idx, self.stacks[end_idx - 1].copy())
-
-        # 如果 _cover_previous_anims=True，则替换覆盖
-        # 否则，分别 append 到范围内的 stack 中
+        # 如果 _cover_previous_anims=True，则裁去先前的动画在 [at, end) 中的部分
         # 关于标记 _cover_previous_anims 的动机，可以参阅该变量在 ItemAnimation 中的声明
         if anim._cover_previous_anims:
-            if at_idx + 1 != end_idx:
-                # 删掉多余的区段
-                del self.times[at_idx + 1: end_idx]
-                del self.stacks[at_idx + 1: end_idx]
-            stack = self.stacks[at_idx]
-            stack.clear()
-            stack.append(anim)
-        else:
-            for idx in range(at_idx, end_idx):
-                self.stacks[idx].append(anim)
+            for node in self.anims.overlap(at, end):
+                node_end = node.end
+                if node.begin < at:
+                    self.anims.set_end(node, at)
+                else:
+                    self.anims.remove(node)
+                if node_end > end:
+                    self.anims.insert(end, node_end, node.seq, node.value)
+
+        self.anims.insert(at, end, self.seq, anim)
+        self.seq += 1
 
     def get_at_left(self, as_time: float) -> list[ItemAnimation]:
-        idx = bisect_left(self.times, as_time) - 1
-        return self.stacks[max(0, idx)]
+        '''
+        与 :meth:`get` 类似，但得到的是在 ``as_time`` 左侧紧邻 ``as_time`` 的动画序列（``as_time <= 0`` 时与 ``get(0)`` 相同）
+        '''
+        if as_time <= 0:
+            return self.get(0)
+
+        # 结果在 [as_time, end] 中保持不变，参考 IntervalTree.stable_end
+        cache = self.get_at_left_cache
+        if cache is not None and cache[0] <= as_time <= cache[1]:
+            return cache[2]
+
+        nodes = self.anims.stab(as_time, at_left=True)
+        end = self.anims.stable_end(as_time, nodes, at_left=True)
+        result = self._sorted(nodes)
+        self.get_at_left_cache = (as_time, end, result)
+        return result
 
     def get(self, as_time: float) -> list[ItemAnimation]:
-        idx = bisect_right(self.times, as_time) - 1
-        assert idx >= 0
-        return self.stacks[idx]
+        '''
+        得到在 ``as_time`` 作用的动画序列，按添加的次序排列
+        '''
+        # 结果在 [as_time, end) 中保持不变
+        cache = self.get_cache
+        if cache is not None and cache[0] <= as_time < cache[1]:
+            return cache[2]
+
+        nodes = self.anims.stab(as_time)
+        end = self.anims.stable_end(as_time, nodes)
+        result = self._sorted(nodes)
+        self.get_cache = (as_time, end, result)
+        return result
+
+    @staticmethod
+    def _sorted(nodes: list[IntervalNode[ItemAnimation]]) -> list[ItemAnimation]:
+        if len(nodes) > 1:
+            nodes.sort(key=lambda node: node.seq)
+        return [node.value for node in nodes]
+
+    def segments(self) -> list[tuple[float, float, ItemAnimation]]:
+        '''
+        得到各个动画对象实际作用的时间区段 ``(at, end, anim)``，按开始时间排列
+
+        被 ``_cover_previous_anims`` 覆盖的部分不包括在内，因此一个动画对象可能对应多个区段；一直持续的区段的 ``end`` 为 ``math.inf``
+        '''
+        return [(node.begin, node.end, node.value) for node in self.anims]
 
     def compute(self, as_time: float, readonly: bool, *, get_at_left: bool = False) -> Item:
         '''
@@ -144,6 +164,17 @@ class AnimStack:
         '''
         if as_time != self.cache_time:
             anims = (self.get_at_left if get_at_left else self.get)(as_time)
+
+            # 只有一个 Display 时，结果就是其记录的物件，不需要使用 compute_cache
+            use_compute_cache = compute_cache.max_bytes > 0 \
+                and (len(anims) > 1 or (len(anims) == 1 and not isinstance(anims[0], Display)))
+            if use_compute_cache:
+                cached = compute_cache.get(self, as_time, get_at_left)
+                if cached is not None:
+                    self.cache_time = as_time
+                    self.cache_data = cached
+                    return cached if readonly else cached.store()
+
             generator = self.compute_anims(as_time, anims)
 
             try:
@@ -208,6 +239,9 @@ class AnimStack:
                         if stack not in drop
                     }
 
+            if use_compute_cache:
+                compute_cache.put(self, as_time, get_at_left, self.cache_data)
+
         return self.cache_data if readonly else self.cache_data.store()
 
     def compute_anims(self, as_time: float, anims: list[ItemAnimation]) -> ComputeAnimsGenerator:
@@ -216,18 +250,116 @@ class AnimStack:
         
         params = ItemAnimation.ApplyParams(as_time, anims, 0)
 
+        def span(anim: ItemAnimation):
+            return profile_span('ItemAnimation.apply', 'anim',
+                                anim=anim, name=anim.name, generate_by=anim._generate_by, item=self.item)
+
         for i, anim in enumerate(anims):
             if i == 0:
-                data = anim.apply(None, params)
+                with span(anim):
+                    data = anim.apply(None, params)
             else:
                 if isinstance(anim, ApplyAligner):
                     anim.pre_apply(data, params)
                     yield anim
                 params.index = i
-                anim.apply(data, params)
+                with span(anim):
+                    anim.apply(data, params)
 
         return data
 
     def clear_cache(self) -> None:
         self.cache_time: float | None = None
         self.cache_data: Item | None = None
+
+
+# 预览窗口中 compute_cache 的内存预算
+COMPUTE_CACHE_BYTES = 256 * 1024 * 1024
+# 估算物件占用的内存时，每个物件以及每个组件额外计入的大小
+ITEM_OVERHEAD_BYTES = 1024
+COMPONENT_OVERHEAD_BYTES = 256
+
+
+def estimate_nbytes(item: Item) -> int:
+    '''
+    估算物件数据占用的内存，也就是各个组件中数组的大小之和，再加上固定的额外开销
+    '''
+    nbytes = ITEM_OVERHEAD_BYTES
+    for cmpt in item.components.values():
+        nbytes += COMPONENT_OVERHEAD_BYTES
+        for value in vars(cmpt).values():
+            if isinstance(value, Array):
+                nbytes += value.data.nbytes
+            elif isinstance(value, np.ndarray):
+                nbytes += value.nbytes
+    return nbytes
+
+
+class ComputeCache:
+    '''
+    :meth:`AnimStack.compute` 结果的 LRU 缓存，在所有的 :class:`AnimStack` 之间共用，通过 ``compute_cache`` 访问
+
+    - 每个 :class:`AnimStack` 自身只记录最近一次的结果，该缓存用于在预览窗口中来回拖动进度条时，
+      避免重复计算已经计算过的时刻
+    - ``max_bytes`` 为内存预算，物件的大小通过 :func:`estimate_nbytes` 估算；
+      默认为 ``0``，也就是不进行缓存（例如输出视频时按顺序渲染，缓存没有作用），预览窗口会将其设置为 :data:`COMPUTE_CACHE_BYTES`
+    - 只有 :class:`~.Display` 作用的时刻，结果就是其记录的物件，不会进入该缓存
+    '''
+    def __init__(self, max_bytes: int = 0):
+        self.max_bytes = max_bytes
+        # (id(stack), stack.version, as_time, get_at_left) -> (stack, data, nbytes)
+        # 记录 stack 本身使得其 id 在缓存期间不会被复用
+        self.entries: OrderedDict[tuple[int, int, float, bool], tuple[AnimStack, Item, int]] = OrderedDict()
+        self.nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, stack: AnimStack, as_time: float, get_at_left: bool) -> Item | None:
+        key = (id(stack), stack.version, as_time, get_at_left)
+        entry = self.entries.get(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, stack: AnimStack, as_time: float, get_at_left: bool, data: Item) -> None:
+        nbytes = estimate_nbytes(data)
+        if nbytes > self.max_bytes:
+            return
+
+        key = (id(stack), stack.version, as_time, get_at_left)
+        prev = self.entries.pop(key, None)
+        if prev is not None:
+            self.nbytes -= prev[2]
+        self.entries[key] = (stack, data, nbytes)
+        self.nbytes += nbytes
+
+        while self.nbytes > self.max_bytes:
+            _, (_, _, evicted) = self.entries.popitem(last=False)
+            self.nbytes -= evicted
+
+    def clear(self) -> None:
+        '''
+        清空缓存以及命中次数的统计
+        '''
+        self.entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return 1.0 if total == 0 else self.hits / total
+
+    def format(self) -> str:
+        return (
+            f'hit rate {self.hit_rate:.1%} ({self.hits}/{self.hits + self.misses}), '
+            f'{len(self.entries)} entries, {self.nbytes / 1024 / 1024:.2f} MB'
+        )
+
+
+compute_cache = ComputeCache()
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import itertools as it
 import math
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right
 from contextvars import ContextVar
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Callable, Iterable, Self, overload
@@ -11,6 +12,7 @@ from janim.exception import AnimationError
 from janim.items.item import Item
 from janim.locale.i18n import get_local_strings
 from janim.typing import ForeverType
+from janim.utils.interval_tree import IntervalTree
 from janim.utils.rate_functions import RateFunc, linear, smooth
 
 if TYPE_CHECKING:
@@ -20,6 +22,8 @@ if TYPE_CHECKING:
 _ = get_local_strings('animation')
 
 ALIGN_EPSILON = 1e-6
+# TimeAligner 中每个块最多记录的时间数量，超过时会被平分为两个块
+ALIGN_BLOCK_SIZE = 1000
 
 
 class Animation:
@@ -300,7 +304,17 @@ class TimeAligner:
     该类用于将相近的浮点数归化到同一个值，使得 :class:`TimeRange` 区间严丝合缝
     '''
     def __init__(self):
-        self.recorded_times = []
+        # 已记录的时间按升序分块存放，maxes 中是各块的最大值
+        # 这样插入时只需要移动一个块中的元素，即使时间不是按顺序记录的（例如 schedule 以及字幕），也不会退化为 O(n^2)
+        self.blocks: list[list[float]] = []
+        self.maxes: list[float] = []
+
+    @property
+    def recorded_times(self) -> list[float]:
+        '''
+        按升序排列的所有已记录的时间
+        '''
+        return list(it.chain.from_iterable(self.blocks))
 
     def align(self, anim: Animation) -> None:
         '''
@@ -317,60 +331,170 @@ class TimeAligner:
         对齐时间 `t`，确保相近的时间点归化到相同的值，返回归化后的时间值
         '''
         t = float(t)    # 避免 numpy 类型浮点数可能导致的问题（例如影响到 GUI 绘制时传给 Qt 的类型）
-        # 因为在大多数情况下，最新传入的 t 总是出现在列表的最后，所以倒序查找
-        for i, recorded_t in enumerate(reversed(self.recorded_times)):
-            # 尝试归化到已有的值
-            if abs(t - recorded_t) < ALIGN_EPSILON:
-                return recorded_t
-            # 尝试插入到中间位置
-            if t > recorded_t:
-                # len - 1 - i 是 recorded_t 的位置，所以这里用 len - i 表示插入到其后面
-                idx = len(self.recorded_times) - i
-                self.recorded_times.insert(idx, t)
-                return t
-
-        # 循环结束表明所有已记录的都比 t 大，所以将 t 插入到列表开头
-        self.recorded_times.insert(0, t)
+        block_idx, idx = self._locate(t)
+        recorded_t = self._find_close(t, block_idx, idx)
+        if recorded_t is not None:
+            return recorded_t
+
+        blocks = self.blocks
+        if not blocks:
+            blocks.append([t])
+            self.maxes.append(t)
+            return t
+
+        # 比所有已记录的都大时，插入到最后一个块的末尾
+        if block_idx == len(blocks):
+            block_idx -= 1
+            idx = len(blocks[block_idx])
+
+        block = blocks[block_idx]
+        block.insert(idx, t)
+        self.maxes[block_idx] = block[-1]
+
+        # 块过大时平分为两个块
+        if len(block) > ALIGN_BLOCK_SIZE:
+            half = len(block) // 2
+            blocks[block_idx: block_idx + 1] = [block[:half], block[half:]]
+            self.maxes[block_idx: block_idx + 1] = [block[half - 1], block[-1]]
+
         return t
 
     def align_t_for_render(self, t: float) -> float:
         '''
-        与 :meth:`align_t` 类似，但区别在于
+        与 :meth:`align_t` 类似，但区别在于该方法在查找后不记录 ``t`` 的值
+        '''
+        recorded_t = self._find_close(t, *self._locate(t))
+        return t if recorded_t is None else recorded_t
 
-        - 该方法使用二分查找而不是倒序查找
-        - 该方法在查找后不记录 ``t`` 的值
+    def _locate(self, t: float) -> tuple[int, int]:
         '''
-        idx = bisect_left(self.recorded_times, t)
-        if idx != len(self.recorded_times):
-            recorded_t = self.recorded_times[idx]
+        得到 ``t`` 在已记录的时间中的位置 ``(块的下标, 块中的下标)``，相当于对整个有序序列进行 ``bisect_left``
+
+        比所有已记录的都大时，返回 ``(len(self.blocks), 0)``
+        '''
+        block_idx = bisect_left(self.maxes, t)
+        if block_idx == len(self.blocks):
+            return block_idx, 0
+        return block_idx, bisect_left(self.blocks[block_idx], t)
+
+    def _find_close(self, t: float, block_idx: int, idx: int) -> float | None:
+        '''
+        在 ``t`` 所在位置的两侧查找与其相近的已记录的时间，优先使用不小于 ``t`` 的那个；没有则返回 ``None``
+        '''
+        blocks = self.blocks
+        if block_idx != len(blocks):
+            recorded_t = blocks[block_idx][idx]
             if abs(t - recorded_t) < ALIGN_EPSILON:
                 return recorded_t
+
         if idx != 0:
-            recorded_t = self.recorded_times[idx - 1]
-            if abs(t - recorded_t) < ALIGN_EPSILON:
-                return recorded_t
-        return t
+            recorded_t = blocks[block_idx][idx - 1]
+        elif block_idx != 0:
+            recorded_t = blocks[block_idx - 1][-1]
+        else:
+            return None
+        if abs(t - recorded_t) < ALIGN_EPSILON:
+            return recorded_t
+        return None
 
 
-class TimeSegments[T]:
-    def __init__(self, iterable: Iterable[T], key: Callable[[T], TimeRange | Iterable[TimeRange]], *, step: float = 4):
-        self.step = step
-        self.segments: list[list[T]] = []
+class TimeIntervals[T]:
+    '''
+    记录各个值所处的时间区段，用于得到在某一时刻所处区段包含该时刻的值
+
+    ``key`` 返回值所处的一个或多个（互不重叠的） :class:`TimeRange`，区段为左闭右开的，``end`` 可以是 ``FOREVER``
+
+    查询时维护一个游标，记录上一次查询的时刻以及当时的结果：
+
+    - 按时间顺序查询时（例如预览以及输出视频时），只需处理两次查询之间的区段开始与结束，
+      不会对所有值进行遍历
+    - 向前跳转，或者向后跳过了过多的区段时，使用 :class:`~.IntervalTree` 重新查询，复杂度为 O(log n + k)
+    '''
+    def __init__(self, iterable: Iterable[T], key: Callable[[T], TimeRange | Iterable[TimeRange]]):
+        self.tree: IntervalTree[T] = IntervalTree()
 
-        for val in iterable:
+        for seq, val in enumerate(iterable):
             ret = key(val)
-            prev_right = None
             for t_range in [ret] if isinstance(ret, TimeRange) else ret:
-                left = math.floor(t_range.at / step)
-                right = math.ceil(t_range.end / step)
-                if prev_right is not None and left < prev_right:
-                    left = prev_right
-                if len(self.segments) < right:
-                    self.segments.extend([].copy() for _ in range(right - len(self.segments)))
-                for i in range(left, right):
-                    self.segments[i].append(val)
-                prev_right = right
+                end = math.inf if t_range.end is FOREVER else t_range.end
+                if t_range.at < end:
+                    self.tree.insert(t_range.at, end, seq, val)
+
+        # 按开始时刻以及结束时刻排列的区段，用于在游标移动时得到进入以及离开的区段
+        self.enters = list(self.tree)
+        self.enter_times = [node.begin for node in self.enters]
+        self.exits = sorted((node for node in self.enters if node.end != math.inf), key=lambda node: node.end)
+        self.exit_times = [node.end for node in self.exits]
+
+        # 游标所在的时刻，以及已处理的进入、离开的区段数量
+        self.cursor_t: float | None = None
+        self.enter_idx = 0
+        self.exit_idx = 0
+
+        # 当前的结果，按照 seq（也就是传入的顺序）排列
+        self.active_seqs: list[int] = []
+        self.active_values: list[T] = []
+        self.result: list[T] | None = None
 
     def get(self, t: float) -> list[T]:
-        idx = math.floor(t / self.step)
-        return self.segments[idx] if idx < len(self.segments) else []
+        '''
+        得到所处区段包含 ``t`` 的值，按照传入的顺序排列
+
+        返回的列表可能会在之后的查询中被再次返回，请不要对其进行修改
+        '''
+        if self.cursor_t is None or t < self.cursor_t:
+            self.seek(t)
+        elif t != self.cursor_t:
+            self.advance(t)
+
+        if self.result is None:
+            self.result = self.active_values.copy()
+        return self.result
+
+    def seek(self, t: float) -> None:
+        '''
+        将游标直接移动到 ``t``，重新查询结果
+        '''
+        nodes = self.tree.stab(t)
+        nodes.sort(key=lambda node: node.seq)
+        self.active_seqs = [node.seq for node in nodes]
+        self.active_values = [node.value for node in nodes]
+        self.result = None
+
+        self.cursor_t = t
+        self.enter_idx = bisect_right(self.enter_times, t)
+        self.exit_idx = bisect_right(self.exit_times, t)
+
+    def advance(self, t: float) -> None:
+        '''
+        将游标向后移动到 ``t``，处理其间进入以及离开的区段
+        '''
+        enter_idx = bisect_right(self.enter_times, t, self.enter_idx)
+        exit_idx = bisect_right(self.exit_times, t, self.exit_idx)
+
+        changes = enter_idx - self.enter_idx + exit_idx - self.exit_idx
+        if changes == 0:
+            self.cursor_t = t
+            return
+        # 跳过的区段过多时，直接重新查询更快
+        if changes > len(self.active_seqs) + 64:
+            self.seek(t)
+            return
+
+        seqs = self.active_seqs
+        values = self.active_values
+
+        # 先处理进入再处理离开，这样在这期间进入又离开的区段也能被正确处理
+        for node in self.enters[self.enter_idx: enter_idx]:
+            idx = bisect_left(seqs, node.seq)
+            seqs.insert(idx, node.seq)
+            values.insert(idx, node.value)
+        for node in self.exits[self.exit_idx: exit_idx]:
+            idx = bisect_left(seqs, node.seq)
+            del seqs[idx]
+            del values[idx]
+
+        self.result = None
+        self.cursor_t = t
+        self.enter_idx = enter_idx
+        self.exit_idx = exit_idx
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import importlib
+import inspect
+import marshal
+import os
+import pickle
+import sys
+import time
+import types
+import weakref
+from typing import Any
+
+import attrs
+
+from janim import __version__
+from janim.anims.timeline import BuiltTimeline, Timeline
+from janim.components.depth import Cmpt_Depth
+from janim.locale.i18n import get_local_strings
+from janim.logger import log
+from janim.utils.config import Config, ConfigGetter, config_ctx_var
+from janim.utils.file_ops import atomic_write, guarantee_existence
+
+_ = get_local_strings('build_cache')
+
+# 只影响输出或者预览窗口，而不影响构建结果的配置，不参与缓存键的计算
+IGNORED_CONFIG_FIELDS = {'output_dir', 'wnd_pos', 'wnd_monitor', 'client_search_port'}
+
+
+def build_with_cache(
+    timeline_cls: type[Timeline],
+    *,
+    quiet=False,
+    hide_subtitles=False,
+    show_debug_notice=False
+) -> BuiltTimeline:
+    '''
+    与 ``timeline_cls().build(...)`` 作用相同，但是会优先读取磁盘中的缓存，从而跳过 :meth:`~.Timeline.construct` 的执行；
+    没有可用的缓存时，正常构建并写入缓存
+
+    缓存是否有效由以下内容决定：
+
+    - 定义该 :class:`~.Timeline` 的源文件，以及其通过 ``import`` 递归引用的本地模块的源文件（参考 :func:`get_local_dependencies`）
+    - 生效的配置，以及 ``hide_subtitles``
+    - JAnim 以及 Python 的版本
+
+    缓存无法写入时（例如在动画中引用了局部定义的类），会给出警告，但不影响构建的结果
+
+    .. warning::
+
+        资源文件（例如图片、音频、字体）以及外部程序（例如 Typst）的改变不会使缓存失效，
+        如果修改了这些内容，请不使用缓存重新构建一次
+    '''
+    timeline = timeline_cls()
+    with timeline.with_config():
+        cfg = ConfigGetter(config_ctx_var.get())
+        cache_path = get_cache_path(timeline_cls, cfg)
+        key = compute_cache_key(timeline_cls, cfg, hide_subtitles)
+
+    name = timeline_cls.__name__
+
+    built = load_built(cache_path, key)
+    if built is not None:
+        if not quiet:
+            log.info(_('Loaded "{name}" from build cache').format(name=name))
+        return built
+
+    built = timeline.build(quiet=quiet, hide_subtitles=hide_subtitles, show_debug_notice=show_debug_notice)
+
+    try:
+        save_built(cache_path, key, built)
+    except Exception as e:
+        log.warning(
+            _('Unable to write build cache of "{name}": {err}')
+            .format(name=name, err=f'{e.__class__.__name__}: {e}')
+        )
+
+    return built
+
+
+def get_cache_path(timeline_cls: type[Timeline], cfg: Config | ConfigGetter) -> str:
+    '''
+    缓存文件的路径，由定义 ``timeline_cls`` 的文件以及其名称决定
+    '''
+    file_path = os.path.abspath(inspect.getfile(timeline_cls))
+    name = hashlib.md5(f'{file_path}:{timeline_cls.__qualname__}'.encode()).hexdigest()
+    return os.path.join(guarantee_existence(os.path.join(cfg.temp_dir, 'build_cache')), f'{name}.pickle')
+
+
+def compute_cache_key(timeline_cls: type[Timeline], cfg: Config | ConfigGetter, hide_subtitles: bool) -> str:
+    '''
+    计算缓存所使用的键，源文件之外的部分；源文件的部分参考 :func:`get_local_dependencies`
+    '''
+    md5 = hashlib.md5(f'{__version__}:{sys.version}:{timeline_cls.__qualname__}:{hide_subtitles}'.encode())
+    for field in attrs.fields(Config):
+        if field.name in IGNORED_CONFIG_FIELDS:
+            continue
+        md5.update(f'{field.name}={getattr(cfg, field.name)!r}\n'.encode())
+    return md5.hexdigest()
+
+
+def get_local_dependencies(file_path: str) -> list[str]:
+    '''
+    得到 ``file_path`` 以及其通过 ``import`` 递归引用的本地模块的文件路径
+
+    仅包括位于 ``file_path`` 所在文件夹（及其子文件夹）中的模块；
+    这里只分析源代码中的 ``import`` 语句，而不会执行代码
+    '''
+    root = os.path.dirname(os.path.abspath(file_path))
+
+    def find_module_file(directory: str, name: str) -> str | None:
+        base = os.path.join(directory, *name.split('.'))
+        for candidate in (base + '.py', os.path.join(base, '__init__.py')):
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    result: list[str] = []
+    todo = [os.path.abspath(file_path)]
+
+    while todo:
+        path = todo.pop()
+        if path in result:
+            continue
+        result.append(path)
+
+        try:
+            with open(path, 'rb') as f:
+                tree = ast.parse(f.read(), path)
+        except (OSError, SyntaxError, ValueError):
+            continue
+
+        directory = os.path.dirname(path)
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                candidates = [(root, alias.name) for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                if node.level == 0:
+                    base_dir, module = root, node.module
+                else:
+                    base_dir = directory
+                    for _ in range(node.level - 1):
+                        base_dir = os.path.dirname(base_dir)
+                    module = node.module
+                # from x import y 中的 y 也可能是模块
+                candidates = [
+                    (base_dir, name)
+                    for alias in node.names
+                    for name in [f'{module}.{alias.name}' if module else alias.name]
+                ]
+                if module:
+                    candidates.append((base_dir, module))
+            else:
+                continue
+
+            for base_dir, name in candidates:
+                # 对于绝对导入，同时考虑以当前文件所在文件夹为起点的情况
+                for search_dir in {base_dir, directory}:
+                    module_file = find_module_file(search_dir, name)
+                    if module_file is not None and os.path.abspath(module_file).startswith(root + os.sep):
+                        todo.append(os.path.abspath(module_file))
+
+    return result
+
+
+def hash_files(file_paths: list[str]) -> dict[str, str]:
+    result = {}
+    for file_path in file_paths:
+        try:
+            with open(file_path, 'rb') as f:
+                result[file_path] = hashlib.md5(f.read()).hexdigest()
+        except OSError:
+            result[file_path] = ''
+    return result
+
+
+def load_built(cache_path: str, key: str) -> BuiltTimeline | None:
+    '''
+    读取缓存，如果不存在或者已经失效则返回 ``None``
+    '''
+    try:
+        with open(cache_path, 'rb') as f:
+            header = pickle.load(f)
+            if header['key'] != key or hash_files(list(header['dependencies'])) != header['dependencies']:
+                return None
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning(
+            _('Unable to read build cache: {err}')
+            .format(err=f'{e.__class__.__name__}: {e}')
+        )
+        return None
+
+    # 使得之后新创建的物件在深度相同时仍然是后创建的在上
+    for depth, order in payload['depth_counter'].items():
+        Cmpt_Depth._counter[depth] = min(Cmpt_Depth._counter[depth], order)
+
+    return payload['built']
+
+
+def save_built(cache_path: str, key: str, built: BuiltTimeline) -> None:
+    '''
+    将 ``built`` 写入缓存
+    '''
+    t = time.time()
+    file_path = inspect.getfile(built.timeline.__class__)
+    header = dict(key=key, dependencies=hash_files(get_local_dependencies(file_path)))
+    payload = dict(built=built, depth_counter=dict(Cmpt_Depth._counter))
+
+    with atomic_write(cache_path) as temp_path:
+        with open(temp_path, 'wb') as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            BuildCachePickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(payload)
+
+    log.debug(_('Build cache written in {elapsed:.2f} s').format(elapsed=time.time() - t))
+
+
+# region pickler
+
+class BuildCachePickler(pickle.Pickler):
+    '''
+    在 :mod:`pickle` 的基础上，额外支持以下对象的序列化：
+
+    - 无法通过模块属性访问到的函数（例如 ``lambda`` 以及在函数中定义的函数），以字节码以及闭包中的值进行序列化，
+      反序列化时使用所在模块的全局变量，因此所在模块需要已被导入或者是可导入的
+    - 弱引用，以其所引用的对象进行序列化
+    '''
+    def reducer_override(self, obj: Any):
+        if isinstance(obj, types.FunctionType) and not _is_importable(obj):
+            return _reduce_function(obj)
+        if type(obj) is weakref.ReferenceType:
+            return _make_weakref, (obj(),)
+        return NotImplemented
+
+
+def _is_importable(func: types.FunctionType) -> bool:
+    obj = sys.modules.get(func.__module__)
+    for name in func.__qualname__.split('.'):
+        obj = getattr(obj, name, None)
+    return obj is func
+
+
+class _EmptyCell:
+    def __reduce__(self):
+        return '_EMPTY_CELL'
+
+
+# 用于表示尚未赋值的闭包变量
+_EMPTY_CELL = _EmptyCell()
+
+
+def _reduce_function(func: types.FunctionType):
+    cell_values = []
+    for cell in func.__closure__ or ():
+        try:
+            cell_values.append(cell.cell_contents)
+        except ValueError:
+            cell_values.append(_EMPTY_CELL)
+
+    # 闭包中的值放在 state 中，使得 func 在此之前已被记录，从而支持循环引用（例如闭包中引用了包含该函数的对象）
+    return (
+        _make_function,
+        (marshal.dumps(func.__code__), func.__module__, func.__name__, func.__qualname__, len(cell_values)),
+        (func.__defaults__, func.__kwdefaults__, func.__dict__, cell_values),
+        None,
+        None,
+        _set_function_state
+    )
+
+
+def _make_function(
+    code: bytes,
+    module_name: str,
+    name: str,
+    qualname: str,
+    cell_count: int
+) -> types.FunctionType:
+    module = sys.modules.get(module_name) or importlib.import_module(module_name)
+    closure = tuple(types.CellType() for _ in range(cell_count)) or None
+    func = types.FunctionType(marshal.loads(code), module.__dict__, name, None, closure)
+    func.__qualname__ = qualname
+    return func
+
+
+def _set_function_state(func: types.FunctionType, state: tuple) -> None:
+    defaults, kwdefaults, dct, cell_values = state
+    func.__defaults__ = defaults
+    func.__kwdefaults__ = kwdefaults
+    func.__dict__.update(dct)
+    for cell, value in zip(func.__closure__ or (), cell_values):
+        if value is not _EMPTY_CELL:
+            cell.cell_contents = value
+
+
+class _DeadReferent:
+    pass
+
+
+def _make_weakref(obj: Any) -> weakref.ReferenceType:
+    if obj is None:
+        # 被引用的对象已经不存在，得到一个同样失效的弱引用
+        return weakref.ref(_DeadReferent())
+    return weakref.ref(obj)
+
+# endregion
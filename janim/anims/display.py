@@ -14,18 +14,25 @@ class Display(ItemAnimation):
     auto_detect = False
 
     def __init__(self, item: Item, data: Item, **kwargs):
+        '''
+        ``data`` 是记录的物件数据，只会被读取，一般由 ``item.store(readonly=True)`` 得到
+        '''
         super().__init__(item, **kwargs)
         self._cover_previous_anims = True
-        self.data = data
-        self.data_orig = data.store()
+        # 有后续动画时才会用到，在 apply 中创建
+        self.data: Item | None = None
+        self.data_orig = data
 
     def apply(self, data: None, p: ItemAnimation.ApplyParams) -> Item:
         '''
         返回记录的物件数据
 
-        将 ``self.data`` 重置为 ``self.data_orig`` 的数据并返回，避免 ``self.data_orig`` 被意外更改
+        若有后续的动画，则将 ``self.data`` 重置为 ``self.data_orig`` 的数据并返回，避免 ``self.data_orig`` 被后续动画更改
         '''
         if len(p.anims) == 1:
             return self.data_orig
-        self.data.restore(self.data_orig)
+        if self.data is None:
+            self.data = self.data_orig.store()
+        else:
+            self.data.restore(self.data_orig)
         return self.data
@@ -13,6 +13,7 @@ from collections import defaultdict
 from contextlib import contextmanager, nullcontext
 from contextvars import ContextVar
 from dataclasses import dataclass
+from functools import partial
 from typing import Callable, Iterable, Self, overload
 
 import moderngl as mgl
@@ -21,9 +22,10 @@ import OpenGL.GL as gl
 from PIL import Image
 
 from janim.anims.anim_stack import AnimStack
-from janim.anims.animation import (Animation, TimeAligner, TimeRange,
-                                   TimeSegments)
+from janim.anims.animation import (Animation, TimeAligner, TimeIntervals,
+                                   TimeRange)
 from janim.anims.composition import AnimGroup
+from janim.anims.display import Display
 from janim.anims.updater import updater_params_ctx
 from janim.camera.camera import Camera
 from janim.camera.camera_info import CameraInfo
@@ -39,15 +41,23 @@ from janim.items.svg.typst import TypstText
 from janim.items.text import Text
 from janim.locale.i18n import get_local_strings
 from janim.logger import log
-from janim.render.base import RenderData, Renderer, create_context
+from janim.render.audio_mixdown import AudioMixdown
+from janim.render.base import (RenderData, Renderer, create_context,
+                               programs_map)
 from janim.render.framebuffer import (FRAME_BUFFER_BINDING, blend_context,
                                       create_framebuffer, framebuffer_context,
                                       uniforms)
+from janim.render.renderer_vitem import (VItemBatchRenderer, VItemRenderer,
+                                         get_vitem_batch_renderer)
+from janim.render.static_layers import (MAX_STATIC_LAYERS,
+                                        MIN_STATIC_LAYER_ITEMS,
+                                        StaticLayerCache)
 from janim.render.uniform import get_uniforms_context_var
 from janim.typing import JAnimColor, SupportsAnim
 from janim.utils.config import Config, ConfigGetter, config_ctx_var
 from janim.utils.data import ContextSetter
 from janim.utils.iterables import resize_preserving_order
+from janim.utils.profiler import profile_span
 from janim.utils.simple_functions import clip
 
 _ = get_local_strings('timeline')
@@ -168,10 +178,17 @@ class Timeline(metaclass=ABCMeta):
         self.time_aligner: TimeAligner = TimeAligner()
         self.item_appearances = Timeline.ItemAppearancesDict(self.time_aligner)
 
+        # 用于 detect_changes_of_all，在构建完成后 dirty_items 会被置为 None
+        self.dirty_items: list[Item] | None = []
+        self.watched_items: list[Item] = []
+
         self.debug_list: list[Item] = []
 
         self.subtimeline_items: list[TimelineItem] = []
 
+        # 在 construct 结束后依次调用，用于完成被推迟的操作，例如 lazy=True 的 TypstDoc 的创建，使得其中的错误不会被忽略
+        self.construct_finalizers: list[Callable[[], None]] = []
+
     @abstractmethod
     def construct(self) -> None:
         '''
@@ -206,6 +223,10 @@ class Timeline(metaclass=ABCMeta):
             finally:
                 self._build_frame = None
 
+            for finalizer in self.construct_finalizers:
+                finalizer()
+            self.construct_finalizers.clear()
+
             if self.current_time == 0:
                 self.forward(DEFAULT_DURATION, _record_lineno=False)    # 使得没有任何前进时，产生一点时间，避免除零以及其它问题
                 if not quiet:   # pragma: no cover
@@ -221,6 +242,9 @@ class Timeline(metaclass=ABCMeta):
                 appr.stack.detect_change_if_not(item)
                 appr.stack.clear_cache()
 
+            # 构建完成后不再需要记录发生变化的物件
+            self.dirty_items = None
+
             built = BuiltTimeline(self)
 
             if not quiet:   # pragma: no cover
@@ -611,6 +635,13 @@ class Timeline(metaclass=ABCMeta):
             idx = bisect(self.visibility, t)
             return idx % 2 == 1
 
+        def is_static_at(self, t: float) -> bool:
+            '''
+            在 ``t`` 时刻所处的区段中，物件是否只有 :class:`~.Display` 的作用，也就是不随时间变化
+            '''
+            anims = self.stack.get(t)
+            return len(anims) == 1 and isinstance(anims[0], Display)
+
         def render(self, data: Item) -> None:
             if self.renderer is None:
                 self.renderer = data.create_renderer()
@@ -619,9 +650,12 @@ class Timeline(metaclass=ABCMeta):
     class ItemAppearancesDict(defaultdict[Item, ItemAppearance]):
         def __init__(self, time_aligner: TimeAligner):
             super().__init__(lambda key: Timeline.ItemAppearance(key, time_aligner))
+            # 自上次 detect_changes_of_all 以来新加入的物件
+            self.new_items: list[Item] = []
 
         def __missing__(self, key: Item) -> Timeline.ItemAppearance:
             self[key] = value = self.default_factory(key)
+            self.new_items.append(key)
             return value
 
     # region ItemAppearance.stack
@@ -642,9 +676,36 @@ class Timeline(metaclass=ABCMeta):
     def detect_changes_of_all(self) -> None:
         '''
         检查物件的变化并将变化记录为 :class:`~.Display`
+
+        为了避免每次都比较所有物件的数据，只会检查以下物件：
+
+        - 自上次检查以来新加入的物件
+        - 自上次检查以来被标记发生了变化的物件，参考 :meth:`~.Item.mark_dirty`
+        - 无法通过标记得知变化的物件，也就是含有 ``tracks_changes=False`` 的组件的物件（参考 :meth:`~.Item.tracks_changes`），
+          以及不是在该时间轴中创建的物件
         '''
-        for item, appr in self.item_appearances.items():
-            appr.stack.detect_change(item, self.current_time)
+        appearances = self.item_appearances
+        if self.dirty_items is None:
+            # 构建完成后不再记录发生变化的物件，此时检查所有的物件
+            for item, appr in appearances.items():
+                appr.stack.detect_change(item, self.current_time)
+            return
+
+        new_items = appearances.new_items
+        appearances.new_items = []
+        for item in new_items:
+            if item.timeline is not self or not item.tracks_changes():
+                self.watched_items.append(item)
+
+        dirty_items = self.dirty_items
+        self.dirty_items = []
+        for item in dirty_items:
+            item._dirty = False
+
+        for item in it.chain(new_items, dirty_items, self.watched_items):
+            appr = appearances.get(item, None)
+            if appr is not None:
+                appr.stack.detect_change(item, self.current_time)
 
     def detect_changes(self, items: Iterable[Item]) -> None:
         '''
@@ -882,31 +943,46 @@ class BuiltTimeline:
         self.timeline = timeline
         self.duration = timeline.time_aligner.align_t(timeline.current_time)
 
-        self.visible_item_segments = TimeSegments(
+        self.visible_item_segments = TimeIntervals(
             (
                 (item, appr)
                 for item, appr in timeline.item_appearances.items()
             ),
             lambda x: (
-                TimeRange(*range) if len(range) == 2 else TimeRange(*range, self.duration + 1)
+                TimeRange(*range) if len(range) == 2 else TimeRange(*range, FOREVER)
                 for range in it.batched(x[1].visibility, 2)
             )
         )
-        self.visible_additional_callbacks_segments = TimeSegments(
+        self.visible_additional_callbacks_segments = TimeIntervals(
             self.timeline.additional_render_calls_callbacks,
-            lambda x: (
-                x.t_range if x.t_range.end is not FOREVER else TimeRange(x.t_range.at, self.duration + 1)
-            )
+            lambda x: x.t_range
         )
 
         self._time: float = 0
 
         self.capture_ctx: mgl.Context | None = None
 
+        # 是否将不随时间变化的物件缓存到静态图层中，参考 render_all
+        self.use_static_layers: bool = False
+        self.static_layer_caches: dict[mgl.Context, StaticLayerCache] = {}
+
+        # 以音频采样率为键，参考 get_audio_mixdown
+        self.audio_mixdowns: dict[int, AudioMixdown] = {}
+
     @property
     def cfg(self) -> Config | ConfigGetter:
         return self.timeline.config_getter
 
+    def get_audio_mixdown(self, framerate: int) -> AudioMixdown:
+        '''
+        得到混合了所有音频（包括子 Timeline 的）的 :class:`~.AudioMixdown`，在第一次调用时进行混合
+        '''
+        mixdown = self.audio_mixdowns.get(framerate, None)
+        if mixdown is None:
+            with profile_span('BuiltTimeline.get_audio_mixdown', 'audio', timeline=self.timeline):
+                mixdown = self.audio_mixdowns[framerate] = AudioMixdown(self, framerate)
+        return mixdown
+
     def get_audio_samples_of_frame(
         self,
         fps: float,
@@ -916,52 +992,9 @@ class BuiltTimeline:
         count: int = 1
     ) -> np.ndarray:
         '''
-        提取特定帧的音频流
+        提取特定帧的音频流，是从 :meth:`get_audio_mixdown` 的结果中切片得到的
         '''
-        begin = frame / fps
-        end = (frame + count) / fps
-        channels = self.cfg.audio_channels
-
-        output_sample_count = math.floor(end * framerate) - math.floor(begin * framerate)
-        result = np.zeros((output_sample_count, channels), dtype=np.int16)
-
-        # 合并自身的 audio
-        for info in self.timeline.audio_infos:
-            if end < info.range.at or begin > info.range.end:
-                continue
-
-            audio = info.audio
-
-            frame_begin = int((begin - info.range.at + info.clip_range.at) * audio.framerate)
-            frame_end = int((end - info.range.at + info.clip_range.at) * audio.framerate)
-
-            clip_begin = max(0, int(audio.framerate * info.clip_range.at))
-            clip_end = min(audio.sample_count(), int(audio.framerate * info.clip_range.end))
-
-            left_blank = max(0, clip_begin - frame_begin)
-            right_blank = max(0, frame_end - clip_end)
-
-            data = audio._samples.data[max(clip_begin, frame_begin): min(clip_end, frame_end)]
-
-            if left_blank != 0 or right_blank != 0:
-                # channels = data.shape[1]
-                data = np.concatenate([
-                    np.zeros((left_blank, channels), dtype=np.int16),
-                    data,
-                    np.zeros((right_blank, channels), dtype=np.int16)
-                ])
-
-            result += resize_preserving_order(data, output_sample_count)
-
-        # 合并子 Timeline 的 audio
-        for item in self.timeline.subtimeline_items:
-            built = item._built
-            frame_offset = int(item.at * fps)
-
-            data = built.get_audio_samples_of_frame(fps, framerate, frame - frame_offset, count=count)
-            result += resize_preserving_order(data, output_sample_count)
-
-        return result
+        return self.get_audio_mixdown(framerate).samples_of_frame(fps, frame, count=count)
 
     def current_camera_info(self) -> CameraInfo:
         return self.timeline.compute_item(self.timeline.camera, self._time, True).points.info
@@ -976,8 +1009,10 @@ class BuiltTimeline:
         if global_t == self.duration:
             global_t -= 1e-4
         self._time = global_t
+        programs_map[ctx].buffer_pool.begin_frame()
         try:
-            with ContextSetter(Animation.global_t_ctx, global_t),   \
+            with profile_span('BuiltTimeline.render_all', 'render', timeline=self.timeline, t=global_t), \
+                 ContextSetter(Animation.global_t_ctx, global_t),   \
                  ContextSetter(Timeline.ctx_var, self.timeline),    \
                  self.timeline.with_config():
                 camera = timeline.compute_item(timeline.camera, global_t, True)
@@ -1000,39 +1035,50 @@ class BuiltTimeline:
                     # 反向遍历一遍所有物件，这是为了让一些效果标记原有的物件不进行渲染
                     # （会把所应用的物件的 render_disabled 置为 True，所以在下面可以判断这个变量过滤掉它们）
                     for _, appr in reversed(self.visible_item_segments.get(global_t)):
-                        if not appr.is_visible_at(global_t):
-                            continue
-                        data = appr.stack.compute(global_t, True)
+                        with profile_span('AnimStack.compute', 'anim', item=appr.stack.item):
+                            data = appr.stack.compute(global_t, True)
                         data._mark_render_disabled()
                         render_datas.append((appr, data))
                     # 添加额外的渲染调用，例如 Transform 产生的
                     # 这里也有可能产生 render_disabled 标记
                     additional: list[list[tuple[Item, Callable[[Item], None]]]] = []
                     for rcc in self.visible_additional_callbacks_segments.get(global_t):
-                        if rcc.t_range.end is FOREVER:
-                            if not rcc.t_range.at <= global_t:
-                                continue
-                        else:
-                            if not rcc.t_range.at <= global_t < rcc.t_range.end:
-                                continue
                         additional.append(rcc.func())
+                    blending = get_uniforms_context_var(ctx).get().get('JA_BLENDING')
+                    use_static_layers = blending and self.use_static_layers
                     # 剔除被标记 render_disabled 的物件，得到 render_items_final
+                    # 同时记录可以被缓存到静态图层中的物件
                     render_datas_final: list[tuple[Item, Callable]] = []
+                    static_ids: set[int] = set()
                     for appr, data in render_datas:
                         if appr.render_disabled:
                             appr.render_disabled = False    # 重置，因为每次都要重新标记
                             continue
                         render_datas_final.append((data, appr.render))
+                        if use_static_layers \
+                                and data.renderer_cls.static_cacheable \
+                                and appr.is_static_at(global_t):
+                            static_ids.add(id(data))
                     render_datas_final.extend(it.chain(*additional))
                     # 按深度排序
                     render_datas_final.sort(key=lambda x: x[0].depth, reverse=True)
                     # 渲染
-                    blending = get_uniforms_context_var(ctx).get().get('JA_BLENDING')
-                    for data, render in render_datas_final:
-                        render(data)
-                        # 如果没有 blending，我们认为当前是在向透明 framebuffer 绘制
-                        # 所以每次都需要使用 glFlush 更新 framebuffer 信息使得正确渲染
-                        if not blending:
+                    if blending:
+                        batch_renderer = None
+                        if VItemBatchRenderer.is_supported(ctx):
+                            batch_renderer = get_vitem_batch_renderer(ctx)
+                            batch_renderer.begin_frame()
+                        if static_ids:
+                            self._render_with_static_layers(ctx, render_datas_final, static_ids,
+                                                            batch_renderer, camera_info)
+                        else:
+                            self._render_datas(render_datas_final, batch_renderer)
+                    else:
+                        for data, render in render_datas_final:
+                            with profile_span('Renderer.render', 'render', renderer=data.renderer_cls, item=data):
+                                render(data)
+                            # 如果没有 blending，我们认为当前是在向透明 framebuffer 绘制
+                            # 所以每次都需要使用 glFlush 更新 framebuffer 信息使得正确渲染
                             gl.glFlush()
 
         except Exception:
@@ -1041,6 +1087,79 @@ class BuiltTimeline:
 
         return True
 
+    @staticmethod
+    def _render_datas(
+        render_datas: list[tuple[Item, Callable]],
+        batch_renderer: VItemBatchRenderer | None
+    ) -> None:
+        '''
+        渲染已按深度排序的 ``render_datas``，
+        若提供了 ``batch_renderer``，则其中连续的、使用默认 :class:`~.VItemRenderer` 的物件会合并为一次绘制调用，
+        参考 :class:`~.VItemBatchRenderer`
+
+        由 :class:`~.Transform` 等产生的额外渲染调用不参与合并，因此也会将前后的物件分为不同的组
+        '''
+        if batch_renderer is None:
+            for data, render in render_datas:
+                with profile_span('Renderer.render', 'render', renderer=data.renderer_cls, item=data):
+                    render(data)
+            return
+
+        def is_batchable(x: tuple[Item, Callable]) -> bool:
+            data, render = x
+            return data.renderer_cls is VItemRenderer \
+                and isinstance(getattr(render, '__self__', None), Timeline.ItemAppearance)
+
+        for batchable, group in it.groupby(render_datas, key=is_batchable):
+            group = list(group)
+            if batchable and len(group) > 1:
+                with profile_span('Renderer.render', 'render', renderer=batch_renderer, items=len(group)):
+                    batch_renderer.render([data for data, _ in group])
+            else:
+                for data, render in group:
+                    with profile_span('Renderer.render', 'render', renderer=data.renderer_cls, item=data):
+                        render(data)
+
+    def _render_with_static_layers(
+        self,
+        ctx: mgl.Context,
+        render_datas: list[tuple[Item, Callable]],
+        static_ids: set[int],
+        batch_renderer: VItemBatchRenderer | None,
+        camera_info: CameraInfo
+    ) -> None:
+        '''
+        与 :meth:`_render_datas` 相同，但是连续的静态物件（``static_ids`` 中的）会被缓存到图层中，参考 :class:`~.StaticLayerCache`
+
+        - 只有包含至少 :data:`~.MIN_STATIC_LAYER_ITEMS` 个物件的组才会被缓存，并且最多缓存 :data:`~.MAX_STATIC_LAYERS` 个，
+          优先缓存物件数量多的组
+        - 组中的物件（也就是其数据对象）以及摄像机都没有变化时，图层仍然有效，直接合成而不重新绘制
+        '''
+        runs = [
+            (is_static, list(group))
+            for is_static, group in it.groupby(render_datas, key=lambda x: id(x[0]) in static_ids)
+        ]
+        cached = sorted(
+            (i for i, (is_static, group) in enumerate(runs)
+             if is_static and len(group) >= MIN_STATIC_LAYER_ITEMS),
+            key=lambda i: len(runs[i][1]),
+            reverse=True
+        )[:MAX_STATIC_LAYERS]
+
+        layer_cache = self.static_layer_caches.get(ctx, None)
+        if layer_cache is None:
+            layer_cache = self.static_layer_caches[ctx] = StaticLayerCache(ctx)
+
+        layer_idx = 0
+        for i, (_, group) in enumerate(runs):
+            if i not in cached:
+                self._render_datas(group, batch_renderer)
+                continue
+            key = [camera_info, *(data for data, _ in group)]
+            with profile_span('StaticLayerCache.render', 'render', items=len(group)):
+                layer_cache.render(layer_idx, key, partial(self._render_datas, group, batch_renderer))
+            layer_idx += 1
+
     def capture(self, global_t: float, *, transparent: bool = True) -> Image.Image:
         if self.capture_ctx is None:
             try:
@@ -231,6 +231,9 @@ class MethodTransform(Transform):
         self.delayed_actions: list[tuple[MethodTransform.ActionType, str | tuple[tuple, dict]]] = []
 
     def __getattr__(self, name: str):
+        # 避免 pickle、copy 等在查找 __setstate__ 之类的方法时被当作延迟调用
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
         self.delayed_actions.append((MethodTransform.ActionType.GetAttr, name))
         return self
 
@@ -352,6 +352,9 @@ class MethodUpdater(Animation):
             return self.anim
 
     def __getattr__(self, name: str):
+        # 避免 pickle、copy 等在查找 __setstate__ 之类的方法时被当作对物件方法的调用
+        if name.startswith('__') and name.endswith('__'):
+            raise AttributeError(name)
         attr = getattr(self.item, name, None)
         if isinstance(attr, Component):
             return MethodUpdater._FakeCmpt(self, name, attr)
@@ -19,6 +19,9 @@ from janim.utils.simple_functions import clip
 
 
 class Cmpt_CameraPoints[ItemT](Cmpt_Points[ItemT]):
+    # orientation 等属性可能会被原地修改
+    tracks_changes = False
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.reset()
@@ -13,6 +13,7 @@ from janim.locale.i18n import get_local_strings
 from janim.logger import log
 from janim.utils.config import cli_config, default_config
 from janim.utils.file_ops import open_file
+from janim.utils.profiler import disable_profiling, enable_profiling, profile_span
 
 _ = get_local_strings('cli')
 
@@ -42,7 +43,7 @@ def run(args: Namespace) -> None:
     built_timelines: list[BuiltTimeline] = []
 
     for timeline in timelines:
-        built_timelines.append(timeline().build(hide_subtitles=args.hide_subtitles, show_debug_notice=True))
+        built_timelines.append(build_timeline(args, timeline, show_debug_notice=True))
 
     log.info('======')
     log.info(_('Constructing window'))
@@ -83,7 +84,9 @@ def write(args: Namespace) -> None:
 
     log.info('======')
 
-    builts = [timeline().build(hide_subtitles=args.hide_subtitles) for timeline in timelines]
+    profiler = enable_profiling() if args.profile else None
+
+    builts = [build_timeline(args, timeline) for timeline in timelines]
 
     # 当设定 video_with_audio 时，忽略 video 和 audio 选项
     if args.video_with_audio:
@@ -161,6 +164,8 @@ def write(args: Namespace) -> None:
                              f'{name}.{args.format}'),
                 use_pbo=not args.disable_pbo,
                 hwaccel=args.hwaccel,
+                workers=args.workers,
+                segment_duration=args.segment_duration,
                 _keep_temp=video_with_audio
             )
             if open_result and not video_with_audio:
@@ -192,6 +197,14 @@ def write(args: Namespace) -> None:
                 .format(file_path=file_path)
             )
 
+    if profiler is not None:
+        profiler.save(args.profile)
+        disable_profiling()
+        log.info(
+            _('Saved profiling result to "{file_path}"')
+            .format(file_path=args.profile)
+        )
+
     log.info('======')
 
 
@@ -232,6 +245,24 @@ def tool(args: Namespace) -> None:
     app.exec()
 
 
+def build_timeline(args: Namespace, timeline: type[Timeline], *, show_debug_notice=False) -> BuiltTimeline:
+    '''
+    构建 ``timeline``，指定了 ``--build_cache`` 时使用 :func:`~.build_with_cache`
+
+    指定了 ``--static_layers`` 时，会开启 :attr:`~.BuiltTimeline.use_static_layers`
+    '''
+    with profile_span('Timeline.build', 'build', timeline=timeline):
+        if args.build_cache:
+            from janim.anims.build_cache import build_with_cache
+            built = build_with_cache(timeline,
+                                     hide_subtitles=args.hide_subtitles,
+                                     show_debug_notice=show_debug_notice)
+        else:
+            built = timeline().build(hide_subtitles=args.hide_subtitles, show_debug_notice=show_debug_notice)
+    built.use_static_layers = args.static_layers
+    return built
+
+
 def modify_cli_config(args: Namespace) -> None:
     '''
     用于 CLI 的 ``-c`` 参数
@@ -8,7 +8,7 @@ import janim.utils.refresh as refresh
 from janim.anims.method_updater_meta import METHOD_UPDATER_KEY
 from janim.exception import CmptGroupLookupError
 from janim.locale.i18n import get_local_strings
-from janim.utils.data import AlignedData
+from janim.utils.data import AlignedData, Array
 from janim.utils.signal import SIGNAL_OBJ_SLOTS_NAME
 
 if TYPE_CHECKING:   # pragma: no cover
@@ -38,7 +38,7 @@ class _CmptMeta(type):
 
 
 class Component[ItemT](refresh.Refreshable, metaclass=_CmptMeta):
-    @dataclass
+    @dataclass(slots=True)
     class BindInfo:
         '''
         对组件定义信息的封装
@@ -75,10 +75,44 @@ class Component[ItemT](refresh.Refreshable, metaclass=_CmptMeta):
         at_item: Item
         key: str
 
+    # 是否可以通过 mark_dirty 得知该组件的所有变化，参考 Timeline.detect_changes_of_all
+    # 只有当 not_changed 所比较的数据都是通过属性赋值或者 Array.data 修改的，才可以设置为 True；
+    # 如果组件会对数据进行原地修改（例如修改列表中的元素），则需要保持为 False，使得每次都会对其进行比较
+    tracks_changes: bool = False
+
+    # 发生变化时需要标记的物件，参考 mark_dirty
+    _dirty_item: Item | None = None
+    # 上次 Item.store(readonly=True) 时复制得到的组件，在此之后没有变化时会被直接复用
+    _stored_copy: Component | None = None
+
     def __init__(self) -> None:
         super().__init__()
         self.bind: Component.BindInfo | None = None
 
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name, value)
+        if isinstance(value, Array):
+            value.owner = self
+        # 与 self.mark_dirty() 等价，这样写是为了尽可能优化性能
+        item = self._dirty_item
+        if item is not None:
+            object.__setattr__(self, '_stored_copy', None)
+            item.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        '''
+        标记所在的物件发生了变化，详见 :meth:`~.Item.mark_dirty`
+
+        只有物件当前所使用的组件会进行标记（由 ``Item`` 设置 ``_dirty_item``），
+        复制或者 ``astype`` 产生的组件、以及 :meth:`~.Item.store` 得到的物件的组件不会进行标记
+
+        同时会使得 ``_stored_copy`` 失效，参考 :meth:`~.Item.store`
+        '''
+        item = self._dirty_item
+        if item is not None:
+            object.__setattr__(self, '_stored_copy', None)
+            item.mark_dirty()
+
     def init_bind(self, bind: BindInfo) -> None:
         '''
         用于 ``Item._init_components``
@@ -100,6 +134,8 @@ class Component[ItemT](refresh.Refreshable, metaclass=_CmptMeta):
     def copy(self) -> Self:
         cmpt_copy = copy.copy(self)
         # cmpt_copy.bind = None
+        cmpt_copy._dirty_item = None
+        cmpt_copy._stored_copy = None
         cmpt_copy.reset_refresh()
         setattr(cmpt_copy, SIGNAL_OBJ_SLOTS_NAME, None)
         return cmpt_copy
@@ -194,6 +230,9 @@ class CmptInfo[T]:
 
 
 class _CmptGroup(Component):
+    # 其中的组件也都在物件的 components 中，会另外进行比较
+    tracks_changes = True
+
     def __init__(self, cmpt_info_list: list[CmptInfo], **kwargs):
         super().__init__(**kwargs)
         self.cmpt_info_list = cmpt_info_list
@@ -41,6 +41,8 @@ class Cmpt_Depth[ItemT](Component[ItemT]):
     '''
     _counter: defaultdict[float, int] = defaultdict(int)
 
+    tracks_changes = True
+
     def __init__(self, value: float, order: int | None = None):
         super().__init__()
 
@@ -19,6 +19,8 @@ class Cmpt_Glow[ItemT](Component[ItemT]):
     '''
     泛光组件
     '''
+    tracks_changes = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._rgba = DEFAULT_GLOW_ARRAY.copy()
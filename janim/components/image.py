@@ -11,6 +11,8 @@ class Cmpt_Image[ItemT](Component[ItemT]):
     '''
     图像组件，包含一个 PIL 图像以及 ``min_mag_filter``
     '''
+    tracks_changes = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.img = None
@@ -18,6 +18,8 @@ from janim.utils.signal import Signal
 class Cmpt_Mark[ItemT](Component[ItemT]):
     names: list[str] = []
 
+    tracks_changes = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
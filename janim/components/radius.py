@@ -24,6 +24,8 @@ class Cmpt_Radius[ItemT](Component[ItemT]):
     '''
     半径组件，被用于 :class:`DotCloud` 的点半径，以及 :class:`VItem` 的轮廓线粗细
     '''
+    tracks_changes = True
+
     def __init__(self, default_radius: float, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.default_radius = default_radius
@@ -21,6 +21,8 @@ class Cmpt_Rgbas[ItemT](Component[ItemT]):
     '''
     颜色组件
     '''
+    tracks_changes = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -11,6 +11,8 @@ class Cmpt_Float[ItemT](Component[ItemT]):
     '''
     对 float 的 Component 封装
     '''
+    tracks_changes = True
+
     def __init__(self, default_value, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._value = default_value
@@ -207,9 +207,7 @@ class Cmpt_VPoints[ItemT](Cmpt_Points[ItemT], impl=True):
     ) -> None:
         super().interpolate(cmpt1, cmpt2, alpha, path_func=path_func)
         if np.all(cmpt1.get_closepath_flags() == cmpt2.get_closepath_flags()):
-            data = self.refresh_data[self.get_closepath_flags.__name__]
-            data.is_required = False
-            data.stored = cmpt1.get_closepath_flags()
+            self.set_refresh_stored(self.get_closepath_flags, cmpt1.get_closepath_flags())
 
     @staticmethod
     def align_path(path1: np.ndarray, path2: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
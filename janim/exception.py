@@ -31,6 +31,10 @@ EXITCODE_FFMPEG_NOT_FOUND = 2001
 '''ffmpeg 未安装时的退出码'''
 EXITCODE_FFPROBE_ERROR = 2002
 '''ffprobe 执行失败时的退出码'''
+EXITCODE_PARALLEL_RENDER_ERROR = 2003
+'''并行渲染视频时，子进程出错的退出码'''
+EXITCODE_FFMPEG_ERROR = 2004
+'''ffmpeg 执行失败时的退出码'''
 
 
 class JAnimException(Exception): ...
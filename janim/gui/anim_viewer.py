@@ -26,6 +26,7 @@ from PySide6.QtWidgets import (QApplication, QCompleter, QLabel, QLineEdit,
                                QMainWindow, QMessageBox, QPushButton,
                                QSizePolicy, QSplitter, QStackedLayout, QWidget)
 
+from janim.anims.anim_stack import COMPUTE_CACHE_BYTES, compute_cache
 from janim.anims.timeline import BuiltTimeline, Timeline
 from janim.exception import ExitException
 from janim.gui.application import Application
@@ -72,6 +73,9 @@ class AnimViewer(QMainWindow):
     ):
         super().__init__(parent)
 
+        # 在预览窗口中来回拖动进度条时，复用先前计算的结果
+        compute_cache.max_bytes = COMPUTE_CACHE_BYTES
+
         self.setup_ui()
         self.setup_play_timer()
         if interact:
@@ -109,6 +113,10 @@ class AnimViewer(QMainWindow):
         app.exec()
 
     def set_built(self, built: BuiltTimeline) -> None:
+        if compute_cache.hits or compute_cache.misses:
+            log.debug(f'Compute cache: {compute_cache.format()}')
+        compute_cache.clear()
+
         self.built = built
 
         # data
@@ -117,9 +117,7 @@ class Selector(QObject):
 
         found: list[Selector.SelectedItem] = []
 
-        for item, appr in built.visible_item_segments.get(global_t):
-            if not appr.is_visible_at(global_t):
-                continue
+        for item, _ in built.visible_item_segments.get(global_t):
             box = item.current(as_time=global_t)(Points).points.box
 
             if item.is_fix_in_frame():
@@ -353,14 +353,10 @@ class TimelineView(QWidget):
                             else f'{anim.__class__.__name__} at 0x{id(anim):X} '
                             f'(from {anim._generate_by.__class__.__name__} at 0x{id(anim._generate_by):X})'
                         ),
-                        TimeRange(t1, t2),
+                        TimeRange(t1, min(t2, built.duration + 1)),
                         brush=get_color(anim)
                     )
-                    for (t1, t2), anims in zip(
-                        it.pairwise([*stack.times, built.duration + 1]),
-                        stack.stacks
-                    )
-                    for anim in anims
+                    for t1, t2, anim in stack.segments()
                 ],
                 collapse=False,
                 header=False,
@@ -2,8 +2,10 @@
 from __future__ import annotations
 
 import copy
+import hashlib
 import os
 import subprocess as sp
+from collections import OrderedDict
 from typing import Generator, Iterable, Self
 
 import numpy as np
@@ -14,13 +16,93 @@ from janim.logger import log
 from janim.utils.bezier import interpolate
 from janim.utils.config import Config
 from janim.utils.data import Array
-from janim.utils.file_ops import find_file
+from janim.utils.file_ops import atomic_write, find_file, guarantee_existence
 from janim.utils.iterables import resize_with_interpolation
 from janim.utils.simple_functions import clip
 from janim.locale.i18n import get_local_strings
 
 _ = get_local_strings('audio')
 
+# 内存中保留的解码后音频数据的总大小上限，超出时移除最久未使用的
+AUDIO_CACHE_BYTES = 512 * 1024 * 1024
+
+
+class AudioCache:
+    '''
+    解码后的音频数据的缓存，参考 :meth:`Audio.read`
+
+    - 以 ``.npy`` 文件保存在 ``temp_dir`` 的 ``audio_cache`` 文件夹中，使得之后的进程不需要再次调用 ffmpeg 解码；
+      读取时使用内存映射，因此较长的音频不会完全驻留在内存中
+    - 在内存中以 LRU 的方式保留，总大小超过 ``max_bytes`` 时移除最久未使用的
+
+    ``key`` 包括文件路径、修改时间、文件大小、采样率、声道数以及截取的范围，其中任意一项变化都会重新解码
+    '''
+    def __init__(self, max_bytes: int = AUDIO_CACHE_BYTES):
+        self.entries: OrderedDict[tuple, Array] = OrderedDict()
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+
+    def get(self, key: tuple) -> Array | None:
+        samples = self.entries.get(key, None)
+        if samples is not None:
+            self.entries.move_to_end(key)
+            return samples
+
+        try:
+            data = np.load(self.get_file_path(key), mmap_mode='r')
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning(
+                _('Unable to read audio cache: {err}')
+                .format(err=f'{e.__class__.__name__}: {e}')
+            )
+            return None
+
+        return self._insert(key, Array.from_readonly(data))
+
+    def put(self, key: tuple, data: np.ndarray) -> Array:
+        '''
+        记录 ``key`` 对应的数据，并返回之后应当使用的 :class:`~.Array`
+
+        写入磁盘成功时返回的是其内存映射，否则直接使用 ``data``
+        '''
+        file_path = self.get_file_path(key)
+        try:
+            with atomic_write(file_path) as temp_path:
+                # 传入文件对象，避免 np.save 自动添加 .npy 后缀
+                with open(temp_path, 'wb') as f:
+                    np.save(f, data)
+            data = np.load(file_path, mmap_mode='r')
+        except Exception as e:
+            log.warning(
+                _('Unable to write audio cache: {err}')
+                .format(err=f'{e.__class__.__name__}: {e}')
+            )
+            data = data.copy()
+            data.setflags(write=False)
+
+        return self._insert(key, Array.from_readonly(data))
+
+    def _insert(self, key: tuple, samples: Array) -> Array:
+        self.entries[key] = samples
+        self.nbytes += samples.data.nbytes
+
+        while self.nbytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted.data.nbytes
+
+        return samples
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.nbytes = 0
+
+    @staticmethod
+    def get_file_path(key: tuple) -> str:
+        name = hashlib.md5(repr(key).encode()).hexdigest()
+        return os.path.join(guarantee_existence(os.path.join(Config.get.temp_dir, 'audio_cache')), f'{name}.npy')
+
 
 class Audio:
     '''
@@ -31,7 +113,7 @@ class Audio:
     另见：:class:`~.Config`
     '''
 
-    audio_cache_map: dict[tuple, tuple[np.ndarray, int, str, str]] = {}
+    audio_cache_map = AudioCache()
 
     def __init__(self, file_path: str = '', begin: float = -1, end: float = -1, **kwargs):
         super().__init__(**kwargs)
@@ -79,15 +161,26 @@ class Audio:
             self.filename = os.path.basename(file_path)
             return
 
-        mtime = os.path.getmtime(file_path)
-        name = os.path.splitext(os.path.basename(file_path))[0]
-        key = (name, mtime, begin, end)
+        framerate = Config.get.audio_framerate
+        stat = os.stat(file_path)
+        key = (os.path.abspath(file_path), stat.st_mtime, stat.st_size, framerate, channels, begin, end)
 
-        cached = self.audio_cache_map.get(key, None)
-        if cached is not None:
-            self._samples.data, self.framerate, self.file_path, self.filename = cached
-            return
+        samples = self.audio_cache_map.get(key)
+        if samples is None:
+            samples = self.audio_cache_map.put(key, self._decode(file_path, begin, end, framerate, channels))
+
+        self._samples.data = samples
+        self.framerate = framerate
+        self.file_path = file_path
+        self.filename = os.path.basename(file_path)
 
+        return self
+
+    @staticmethod
+    def _decode(file_path: str, begin: float, end: float, framerate: int, channels: int) -> np.ndarray:
+        '''
+        调用 ffmpeg 解码得到音频数据
+        '''
         command = [
             Config.get.ffmpeg_bin,
             '-vn',
@@ -101,7 +194,7 @@ class Audio:
         command += [
             '-f', 's16le',
             '-acodec', 'pcm_s16le',
-            '-ar', str(Config.get.audio_framerate),     # framerate & samplerate
+            '-ar', str(framerate),     # framerate & samplerate
             '-ac', str(channels),
             '-loglevel', 'error',
             '-',    # output to a pipe
@@ -117,15 +210,7 @@ class Audio:
             log.error(_('Unable to read audio, please install ffmpeg and add it to the environment variables'))
             raise ExitException(EXITCODE_FFMPEG_NOT_FOUND)
 
-        data = data.reshape((-1, channels))
-
-        self._samples.data = data
-        self.framerate = Config.get.audio_framerate
-        self.file_path = file_path
-        self.filename = os.path.basename(file_path)
-        self.audio_cache_map[key] = (data, self.framerate, self.file_path, self.filename)
-
-        return self
+        return data.reshape((-1, channels))
 
     def sample_count(self) -> int:
         '''
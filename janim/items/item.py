@@ -112,6 +112,9 @@ class Item(Relation['Item'], metaclass=_ItemMeta):
 
     depth = CmptInfo(Cmpt_Depth[Self], 0)
 
+    # 大部分物件都不会进行 astype，所以在第一次需要时才创建，在此之前使用共享的只读空映射
+    _astype_mock_cmpt: dict[str, Component] = types.MappingProxyType({})
+
     def __init__(
         self,
         *args,
@@ -126,9 +129,10 @@ class Item(Relation['Item'], metaclass=_ItemMeta):
 
         from janim.anims.timeline import Timeline
         self.timeline = Timeline.get_context(raise_exc=False)
+        # 参考 mark_dirty
+        self._dirty = False
 
         self._astype: type[Item] | None = None
-        self._astype_mock_cmpt: dict[str, Component] = {}
 
         self._fix_in_frame = False
 
@@ -160,10 +164,14 @@ class Item(Relation['Item'], metaclass=_ItemMeta):
             obj.init_bind(Component.BindInfo(data.decl_cls, self, key))
 
             self.__dict__[key] = self.components[key] = obj
+            obj._dirty_item = self
 
     def set_component(self, key: str, cmpt: Component) -> None:
         setattr(self, key, cmpt)
         self.components[key] = cmpt
+        if not self.stored:
+            cmpt._dirty_item = self
+        self.mark_dirty()
 
     def broadcast_refresh_of_component(
         self,
@@ -427,6 +435,8 @@ class Item(Relation['Item'], metaclass=_ItemMeta):
         cmpt = cmpt_info.create()
         cmpt.init_bind(Component.BindInfo(decl_cls, self, name))
 
+        if self._astype_mock_cmpt is Item._astype_mock_cmpt:
+            self._astype_mock_cmpt = {}
         self._astype_mock_cmpt[name] = cmpt
         return cmpt
 
@@ -440,6 +450,28 @@ class Item(Relation['Item'], metaclass=_ItemMeta):
     def get_children(self):
         return self.stored_children if self.stored else self.children
 
+    def mark_dirty(self) -> None:
+        '''
+        标记物件发生了变化，使得 :meth:`~.Timeline.detect_changes_of_all` 会对其进行检查
+
+        在子物件列表改变、组件的属性被赋值或者组件中的 :class:`~.Array` 被修改时会被自动调用，一般不需要手动调用
+        '''
+        if self._dirty or self.stored:
+            return
+        self._dirty = True
+        if self.timeline is not None and self.timeline.dirty_items is not None:
+            self.timeline.dirty_items.append(self)
+
+    @Relation.children_changed.self_slot
+    def _mark_dirty_on_children_changed(self) -> None:
+        self.mark_dirty()
+
+    def tracks_changes(self) -> bool:
+        '''
+        是否所有的组件都可以通过 :meth:`mark_dirty` 得知变化，参考 :attr:`~.Component.tracks_changes`
+        '''
+        return all(cmpt.tracks_changes for cmpt in self.components.values())
+
     def not_changed(self, other: Self) -> bool:
         if self.get_children() != other.get_children():
             return False
@@ -455,9 +487,22 @@ class Item(Relation['Item'], metaclass=_ItemMeta):
         return self.timeline.item_current(self, as_time=as_time, root_only=root_only)
 
     @staticmethod
-    def _copy_cmpts(src: Item, copy_item: Item) -> None:
+    def _copy_cmpts(src: Item, copy_item: Item, *, reuse: bool = False) -> None:
         new_cmpts = {}
         for key, cmpt in src.components.items():
+            # 只有物件当前所使用的组件才能在发生变化时使 _stored_copy 失效，参考 Component.mark_dirty
+            reusable = reuse and cmpt.tracks_changes and cmpt._dirty_item is src
+            if reusable:
+                stored = cmpt._stored_copy
+                # _CmptGroup 只有在其包含的组件都被复用时才能复用
+                if stored is not None and (
+                    not isinstance(stored, _CmptGroup)
+                    or all(new_cmpts[k] is obj for k, obj in stored.objects.items())
+                ):
+                    new_cmpts[key] = stored
+                    setattr(copy_item, key, stored)
+                    continue
+
             if isinstance(cmpt, _CmptGroup):
                 # 因为现在的 Python 版本中，dict 取键值保留原序
                 # 所以 new_cmpts 肯定有 _CmptGroup 所需要的
@@ -473,14 +518,22 @@ class Item(Relation['Item'], metaclass=_ItemMeta):
             new_cmpts[key] = cmpt_copy
             setattr(copy_item, key, cmpt_copy)
 
+            if not copy_item.stored:
+                cmpt_copy._dirty_item = copy_item
+            if reusable:
+                # 不使用 cmpt._stored_copy = ...，因为这会被当作 cmpt 发生了变化
+                object.__setattr__(cmpt, '_stored_copy', cmpt_copy)
+
         copy_item.components = new_cmpts
-        copy_item._astype_mock_cmpt = {}
+        # 恢复为使用类中共享的空映射（不直接赋值，因为 MappingProxyType 不能被 pickle）
+        copy_item.__dict__.pop('_astype_mock_cmpt', None)
 
     def copy(self, *, root_only: bool = False):
         '''
         复制物件
         '''
         copy_item = copy.copy(self)
+        copy_item._dirty = False
         copy_item.reset_refresh()
         setattr(copy_item, SIGNAL_OBJ_SLOTS_NAME, None)
 
@@ -524,7 +577,19 @@ class Item(Relation['Item'], metaclass=_ItemMeta):
 
         return self
 
-    def store(self):
+    def store(self, *, readonly: bool = False):
+        '''
+        得到物件当前数据的拷贝（不包括子物件，子物件记录在 ``stored_children`` 中）
+
+        ``readonly=True`` 表示得到的物件只会被读取，例如 :class:`~.Display` 所记录的数据：
+
+        - 此时对于 ``tracks_changes=True`` 的组件，若自上次 ``readonly=True`` 的 ``store`` 以来没有发生变化，
+          则直接复用上次复制得到的组件对象，使得连续记录的数据之间共用没有变化的组件
+        - 因此不能对得到的物件进行修改，需要修改时应对其再调用 ``store()`` 得到独立的拷贝
+        - 被复用的组件的 ``bind.at_item`` 仍然是最初复制得到它的那个物件，而不是本次得到的物件；
+          所以对于 ``readonly=True`` 得到的物件，不应通过其组件的 ``bind.at_item`` （或者 ``.r``）访问所在的物件，
+          而再调用 ``store()`` 得到的拷贝中，组件的 ``bind.at_item`` 总是该拷贝本身
+        '''
         copy_item = copy.copy(self)
         copy_item.reset_refresh()
         setattr(copy_item, SIGNAL_OBJ_SLOTS_NAME, None)
@@ -536,7 +601,7 @@ class Item(Relation['Item'], metaclass=_ItemMeta):
         copy_item.stored_parents = self.get_parents().copy()
         copy_item.stored_children = self.get_children().copy()
 
-        self._copy_cmpts(self, copy_item)
+        self._copy_cmpts(self, copy_item, reuse=readonly)
         copy_item.init_connect()
         return copy_item
 
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import os
 from collections import defaultdict
+from dataclasses import dataclass
 from functools import partial
 from typing import Any, Callable, Self
 
@@ -18,9 +20,12 @@ from janim.items.text import BasepointVItem, Text, TextLine
 from janim.items.vitem import VItem
 from janim.locale.i18n import get_local_strings
 from janim.logger import log
-from janim.utils.bezier import PathBuilder, quadratic_bezier_points_for_arc
+from janim.utils.bezier import (SEGMENT_CUBIC, SEGMENT_LINE, SEGMENT_MOVE,
+                                SEGMENT_POINTS, SEGMENT_QUAD,
+                                quadratic_bezier_points_for_arc,
+                                quadratic_paths_from_segments)
 from janim.utils.config import Config
-from janim.utils.file_ops import find_file
+from janim.utils.file_ops import atomic_write, find_file, guarantee_existence
 from janim.utils.space_ops import rotation_about_z
 
 _ = get_local_strings('svg_item')
@@ -47,9 +52,258 @@ def _parse_color(hex, opacity) -> tuple[str, float]:
     return hex, _convert_opacity(opacity)
 
 
+@dataclass(slots=True)
+class PathItemBuilder:
+    '''
+    由 :meth:`SVGItem.convert_path` 得到的 :data:`ItemBuilder`
+
+    因为只包含数组与样式，所以可以被 :class:`SVGCache` 保存到磁盘中
+    '''
+    points: np.ndarray
+    styles: dict
+    marks: np.ndarray | None = None     # 仅当 mark_basepoint=True 时存在
+
+    def __call__(self) -> VItem | BasepointVItem:
+        if self.marks is None:
+            vitem = VItem(**self.styles)
+            vitem.points.set(self.points)
+        else:
+            vitem = BasepointVItem(**self.styles)
+            vitem.points.set(self.points)
+            vitem.mark.set_points(self.marks)
+        return vitem
+
+
+class PathConverter:
+    '''
+    将多个 ``se.Path`` 批量转换为 :class:`PathItemBuilder`
+
+    通过 :meth:`add` 逐个记录路径中各个片段的类型与坐标，最后在 :meth:`convert` 中
+    通过 :func:`~.quadratic_paths_from_segments` 一次性地计算所有路径的点，
+    避免了逐个片段调用 :class:`~.PathBuilder` 的方法时大量细小的 numpy 运算
+    '''
+    def __init__(self, offset: np.ndarray, mark_basepoint: bool = False):
+        self.offset = offset
+        self.mark_basepoint = mark_basepoint
+
+        self.kinds: list[int] = []
+        self.coords: list[float] = []   # 每个片段 3 个点，每个点 2 个坐标
+        self.arcs: list[np.ndarray] = []
+        self.path_lengths: list[int] = []
+        self.styles: list[dict] = []
+        self.marks: list[np.ndarray | None] = []
+
+    def add(self, path: se.Path) -> None:
+        transform_cache: tuple[se.Matrix, np.ndarray, np.ndarray] | None = None
+
+        def get_transform() -> tuple[se.Matrix, np.ndarray, np.ndarray]:
+            nonlocal transform_cache
+            if transform_cache is not None:
+                return transform_cache
+
+            # 通过这种方式得到的 transform 是考虑了 svg 中所有父级 group 的 transform 共同作用的
+            # 所以可以通过这个 transform 对 arc 作逆变换，正确计算 arc 路径，再变换回来
+            transform = se.Matrix(path.values.get('transform', ''))
+            rot, shift = SVGItem.get_rot_and_shift_from_matrix(transform)
+            transform.inverse()
+            transform_cache = (transform, rot, shift)
+            return transform_cache
+
+        def convert_arc(arc: se.Arc) -> np.ndarray:
+            transform, rot, shift = get_transform()
+
+            # 对 arc 作逆变换，使得 arc 的路径可以被正确计算
+            arc *= transform
+
+            n_components = int(np.ceil(8 * abs(arc.sweep) / TAU))
+
+            # 得到单位圆上所需角度的片段
+            arc_points = quadratic_bezier_points_for_arc(arc.sweep, arc.get_start_t(), n_components)
+
+            # 变换至椭圆，并考虑旋转参数，以及平移椭圆中心
+            arc_points[:, 0] *= arc.rx
+            arc_points[:, 1] *= arc.ry
+            arc_points @= np.array(rotation_about_z(arc.get_rotation().as_radians)).T
+            arc_points += [*arc.center, 0]
+
+            # 变换回来
+            arc_points[:, :2] @= rot.T
+            arc_points += shift
+
+            return arc_points[1:]
+
+        kinds = self.kinds
+        coords = self.coords
+        length = len(kinds)
+        subpath_start = (0., 0.)
+
+        for segment in path:
+            segment_class = segment.__class__
+            if segment_class is se.Move:
+                end = segment.end
+                subpath_start = (end.x, end.y)
+                kinds.append(SEGMENT_MOVE)
+                coords += (end.x, end.y, 0., 0., 0., 0.)
+            elif segment_class is se.Line:
+                end = segment.end
+                kinds.append(SEGMENT_LINE)
+                coords += (end.x, end.y, 0., 0., 0., 0.)
+            elif segment_class is se.Close:
+                # 相当于 PathBuilder.close_path
+                kinds.append(SEGMENT_LINE)
+                coords += (*subpath_start, 0., 0., 0., 0.)
+            elif segment_class is se.QuadraticBezier:
+                control, end = segment.control, segment.end
+                kinds.append(SEGMENT_QUAD)
+                coords += (control.x, control.y, end.x, end.y, 0., 0.)
+            elif segment_class is se.CubicBezier:
+                control1, control2, end = segment.control1, segment.control2, segment.end
+                kinds.append(SEGMENT_CUBIC)
+                coords += (control1.x, control1.y, control2.x, control2.y, end.x, end.y)
+            elif segment_class is se.Arc:
+                arc_points = convert_arc(segment)
+                self.arcs.append(arc_points)
+                kinds.append(SEGMENT_POINTS)
+                coords += (arc_points[-1, 0], arc_points[-1, 1], 0., 0., 0., 0.)
+            else:
+                raise KeyError(segment_class)
+
+        self.path_lengths.append(len(kinds) - length)
+        self.styles.append(SVGItem.get_styles_from_shape(path))
+
+        if self.mark_basepoint:
+            # 对于 Typst 生成的 SVG，SVG 对象在没有 transform 作用的情况下
+            # 原点就在其基线上，所以将原点作用 transform 即可得到 SVG 对象（一般而言是文字）的基线
+            transform = se.Matrix(path.values.get('transform', ''))
+            rot, shift = SVGItem.get_rot_and_shift_from_matrix(transform)
+            marks = np.array([ORIGIN, RIGHT, UP])
+            marks[:, :2] @= rot.T
+            marks[:, :2] += shift[:2] + self.offset
+            self.marks.append(marks)
+        else:
+            self.marks.append(None)
+
+    def convert(self) -> list[PathItemBuilder]:
+        '''
+        得到所有已添加的路径对应的 :class:`PathItemBuilder`，顺序与添加的顺序相同
+        '''
+        points = np.zeros((len(self.kinds), 3, 3))
+        points[:, :, :2] = np.reshape(self.coords, (-1, 3, 2))
+
+        paths_points = quadratic_paths_from_segments(self.kinds, points, self.arcs, self.path_lengths)
+
+        builders = []
+        for vitem_points, styles, marks in zip(paths_points, self.styles, self.marks):
+            vitem_points[:, :2] += self.offset
+            builders.append(PathItemBuilder(vitem_points, styles, marks))
+        return builders
+
+
+# 解析结果的磁盘缓存的格式版本，缓存的格式或者解析的结果发生变化时需要增加
+SVG_CACHE_VERSION = 1
+
+
+class SVGCache:
+    '''
+    解析 SVG 得到的 :class:`PathItemBuilder` 的磁盘缓存，参考 :meth:`SVGItem.get_items_from_file`
+
+    - 以 ``.npz`` 文件保存在 ``temp_dir`` 的 ``svg_cache`` 文件夹中，使得之后的进程不需要再次解析 SVG；
+      所有路径的点被拼接在同一个数组中，样式、基线标记以及分组也都以数组的形式保存
+    - 只缓存全部由路径组成的 SVG（例如 Typst 生成的 SVG），含有其它元素的则每次都会解析
+
+    ``key`` 包括文件内容的 md5、``mark_basepoint``、``group_key`` 以及 :data:`SVG_CACHE_VERSION`
+    '''
+    @staticmethod
+    def get(key: tuple) -> tuple[list[PathItemBuilder], GroupIndexer] | None:
+        try:
+            with np.load(SVGCache.get_file_path(key), allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log.warning(
+                _('Unable to read SVG cache: {err}')
+                .format(err=f'{e.__class__.__name__}: {e}')
+            )
+            return None
+
+        points = arrays['points']
+        splits = arrays['splits']
+        marks = arrays.get('marks', None)
+
+        builders = [
+            PathItemBuilder(
+                points[begin: end],
+                dict(
+                    stroke_radius=float(stroke_radius),
+                    stroke_color=str(stroke_color) or None,
+                    stroke_alpha=float(stroke_alpha),
+                    fill_color=str(fill_color) or None,
+                    fill_alpha=float(fill_alpha)
+                ),
+                None if marks is None else marks[i]
+            )
+            for i, (begin, end, stroke_radius, stroke_color, stroke_alpha, fill_color, fill_alpha) in enumerate(zip(
+                splits[:-1],
+                splits[1:],
+                arrays['stroke_radius'],
+                arrays['stroke_color'],
+                arrays['stroke_alpha'],
+                arrays['fill_color'],
+                arrays['fill_alpha']
+            ))
+        ]
+
+        indexers: GroupIndexer = defaultdict(list)
+        group_splits = arrays['group_splits']
+        for name, begin, end in zip(arrays['group_names'], group_splits[:-1], group_splits[1:]):
+            indexers[str(name)] = arrays['group_indices'][begin: end].tolist()
+
+        return builders, indexers
+
+    @staticmethod
+    def put(key: tuple, builders: list[ItemBuilder], indexers: GroupIndexer) -> None:
+        if not all(isinstance(builder, PathItemBuilder) for builder in builders):
+            return
+
+        builders: list[PathItemBuilder]
+        arrays = dict(
+            points=np.concatenate([builder.points for builder in builders]) if builders else np.zeros((0, 3)),
+            splits=np.cumsum([0] + [len(builder.points) for builder in builders]),
+            stroke_radius=np.array([builder.styles['stroke_radius'] for builder in builders], dtype=float),
+            stroke_color=np.array([builder.styles['stroke_color'] or '' for builder in builders], dtype=str),
+            stroke_alpha=np.array([builder.styles['stroke_alpha'] for builder in builders], dtype=float),
+            fill_color=np.array([builder.styles['fill_color'] or '' for builder in builders], dtype=str),
+            fill_alpha=np.array([builder.styles['fill_alpha'] for builder in builders], dtype=float),
+            group_names=np.array(list(indexers.keys()), dtype=str),
+            group_splits=np.cumsum([0] + [len(indices) for indices in indexers.values()]),
+            group_indices=np.array([idx for indices in indexers.values() for idx in indices], dtype=int),
+        )
+        if builders and builders[0].marks is not None:
+            arrays['marks'] = np.array([builder.marks for builder in builders])
+
+        try:
+            with atomic_write(SVGCache.get_file_path(key)) as temp_path:
+                # 传入文件对象，避免 np.savez 自动添加 .npz 后缀
+                with open(temp_path, 'wb') as f:
+                    np.savez(f, **arrays)
+        except Exception as e:
+            log.warning(
+                _('Unable to write SVG cache: {err}')
+                .format(err=f'{e.__class__.__name__}: {e}')
+            )
+
+    @staticmethod
+    def get_file_path(key: tuple) -> str:
+        name = hashlib.md5(repr(key).encode()).hexdigest()
+        return os.path.join(guarantee_existence(os.path.join(Config.get.temp_dir, 'svg_cache')), f'{name}.npz')
+
+
 class SVGItem(Group[SVGElemItem]):
     '''
     传入 SVG 文件路径，解析为物件
+
+    解析的结果除了在内存中缓存外，全部由路径组成的 SVG 还会通过 :class:`SVGCache` 缓存到磁盘中
     '''
     vitem_builders_map: dict[tuple, tuple[list[ItemBuilder], GroupIndexer]] = {}
     group_key: str | None = None
@@ -68,6 +322,12 @@ class SVGItem(Group[SVGElemItem]):
 
         super().__init__(*items, **kwargs)
 
+        self.init_size_and_position(scale, width, height)
+
+    def init_size_and_position(self, scale: float, width: float | None, height: float | None) -> None:
+        '''
+        用于 ``__init__``，在添加子物件后设置大小与位置
+        '''
         box = self.points.box
 
         if width is None and height is None:
@@ -140,18 +400,38 @@ class SVGItem(Group[SVGElemItem]):
         file_path = find_file(file_path)
         mtime = os.path.getmtime(file_path)
         name = os.path.splitext(os.path.basename(file_path))[0]
-        key = (name, mtime)
+        key = (name, mtime, mark_basepoint, cls.group_key)
 
         cached = SVGItem.vitem_builders_map.get(key, None)
         if cached is not None:
             return cls.build_items(*cached)
 
+        with open(file_path, 'rb') as f:
+            content_md5 = hashlib.md5(f.read()).hexdigest()
+        cache_key = (content_md5, mark_basepoint, cls.group_key, SVG_CACHE_VERSION)
+
+        cached = SVGCache.get(cache_key)
+        if cached is None:
+            cached = cls.parse_file(file_path, mark_basepoint)
+            SVGCache.put(cache_key, *cached)
+
+        SVGItem.vitem_builders_map[key] = cached
+        return cls.build_items(*cached)
+
+    @classmethod
+    def parse_file(cls, file_path: str, mark_basepoint: bool = False) -> tuple[list[ItemBuilder], GroupIndexer]:
+        '''
+        使用 svgelements 解析文件，得到用于创建物件的 :data:`ItemBuilder` 列表以及分组
+        '''
         svg: se.SVG = se.SVG.parse(file_path)   # PPI=96
 
         offset = np.array([svg.width / -2, svg.height / -2])
 
         builders: list[ItemBuilder] = []
         indexers: GroupIndexer = defaultdict(list)
+        # 路径在遍历完成后再批量转换，在此之前 builders 中对应的位置为 None
+        path_converter = PathConverter(offset, mark_basepoint)
+        path_positions: list[int] = []
         group_finder: defaultdict[Any, list[str]] = defaultdict(list)
         for shape in svg.elements():
             if isinstance(shape, se.Use):
@@ -170,7 +450,9 @@ class SVGItem(Group[SVGElemItem]):
                 continue
 
             elif isinstance(shape, se.Path):
-                builder = SVGItem.convert_path(shape, offset, mark_basepoint)
+                path_converter.add(shape)
+                path_positions.append(len(builders))
+                builder = None
             elif isinstance(shape, se.SimpleLine):
                 builder = SVGItem.convert_line(shape, offset)
             elif isinstance(shape, se.Rect):
@@ -204,8 +486,10 @@ class SVGItem(Group[SVGElemItem]):
             for name in names:
                 indexers[name].append(len(builders) - 1)
 
-        SVGItem.vitem_builders_map[key] = (builders, indexers)
-        return cls.build_items(builders, indexers)
+        for position, builder in zip(path_positions, path_converter.convert()):
+            builders[position] = builder
+
+        return builders, indexers
 
     @staticmethod
     def build_items(
@@ -244,92 +528,13 @@ class SVGItem(Group[SVGElemItem]):
         return rot, shift
 
     @staticmethod
-    def convert_path(path: se.Path, offset: np.ndarray, mark_basepoint: bool = False) -> ItemBuilder:
-        builder = PathBuilder()
-
-        transform_cache: tuple[se.Matrix, np.ndarray, np.ndarray] | None = None
-
-        def get_transform() -> tuple[se.Matrix, np.ndarray, np.ndarray]:
-            nonlocal transform_cache
-            if transform_cache is not None:
-                return transform_cache
-
-            # 通过这种方式得到的 transform 是考虑了 svg 中所有父级 group 的 transform 共同作用的
-            # 所以可以通过这个 transform 对 arc 作逆变换，正确计算 arc 路径，再变换回来
-            transform = se.Matrix(path.values.get('transform', ''))
-            rot, shift = SVGItem.get_rot_and_shift_from_matrix(transform)
-            transform.inverse()
-            transform_cache = (transform, rot, shift)
-            return transform_cache
-
-        def convert_arc(arc: se.Arc):
-            transform, rot, shift = get_transform()
-
-            # 对 arc 作逆变换，使得 arc 的路径可以被正确计算
-            arc *= transform
-
-            n_components = int(np.ceil(8 * abs(arc.sweep) / TAU))
-
-            # 得到单位圆上所需角度的片段
-            arc_points = quadratic_bezier_points_for_arc(arc.sweep, arc.get_start_t(), n_components)
-
-            # 变换至椭圆，并考虑旋转参数，以及平移椭圆中心
-            arc_points[:, 0] *= arc.rx
-            arc_points[:, 1] *= arc.ry
-            arc_points @= np.array(rotation_about_z(arc.get_rotation().as_radians)).T
-            arc_points += [*arc.center, 0]
-
-            # 变换回来
-            arc_points[:, :2] @= rot.T
-            arc_points += shift
-
-            builder.append(arc_points[1:])
-
-        segment_class_to_func_map = {
-            se.Move: (builder.move_to, ('end',)),
-            se.Close: (builder.close_path, ()),
-            se.Line: (builder.line_to, ('end',)),
-            se.QuadraticBezier: (builder.conic_to, ('control', 'end')),
-            se.CubicBezier: (builder.cubic_to, ('control1', 'control2', 'end')),
-        }
-
-        for segment in path:
-            segment_class = segment.__class__
-            if segment_class is se.Arc:
-                convert_arc(segment)
-            else:
-                func, attr_names = segment_class_to_func_map[segment_class]
-                points = [
-                    _point_to_3d(*getattr(segment, attr_name))
-                    for attr_name in attr_names
-                ]
-                func(*points)
-
-        vitem_styles = SVGItem.get_styles_from_shape(path)
-        vitem_points = builder.get()
-        vitem_points[:, :2] += offset
-
-        if mark_basepoint:
-            # 对于 Typst 生成的 SVG，SVG 对象在没有 transform 作用的情况下
-            # 原点就在其基线上，所以将原点作用 transform 即可得到 SVG 对象（一般而言是文字）的基线
-            transform = se.Matrix(path.values.get('transform', ''))
-            rot, shift = SVGItem.get_rot_and_shift_from_matrix(transform)
-            marks = np.array([ORIGIN, RIGHT, UP])
-            marks[:, :2] @= rot.T
-            marks[:, :2] += shift[:2] + offset
-
-            def vitem_builder() -> BasepointVItem:
-                vitem = BasepointVItem(**vitem_styles)
-                vitem.points.set(vitem_points)
-                vitem.mark.set_points(marks)
-                return vitem
-        else:
-            def vitem_builder() -> VItem:
-                vitem = VItem(**vitem_styles)
-                vitem.points.set(vitem_points)
-                return vitem
-
-        return vitem_builder
+    def convert_path(path: se.Path, offset: np.ndarray, mark_basepoint: bool = False) -> PathItemBuilder:
+        '''
+        转换单个路径；需要转换多个路径时，使用 :class:`PathConverter` 批量转换更快
+        '''
+        converter = PathConverter(offset, mark_basepoint)
+        converter.add(path)
+        return converter.convert()[0]
 
     @staticmethod
     def convert_line(line: se.SimpleLine, offset: np.ndarray) -> ItemBuilder:
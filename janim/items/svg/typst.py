@@ -5,8 +5,11 @@ import itertools as it
 import numbers
 import os
 import subprocess as sp
+import threading
 import types
-from typing import Iterable, Literal, Self, overload
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, Literal, NamedTuple, Self, overload
 
 import numpy as np
 
@@ -23,6 +26,7 @@ from janim.logger import log
 from janim.utils.config import Config
 from janim.utils.file_ops import get_janim_dir, get_typst_temp_dir
 from janim.utils.iterables import flatten
+from janim.utils.signal import SIGNAL_OBJ_SLOTS_NAME
 from janim.utils.space_ops import rotation_between_vectors
 
 _ = get_local_strings('typst')
@@ -30,10 +34,37 @@ _ = get_local_strings('typst')
 type TypstPattern = TypstDoc | str
 type TypstVar = Points | dict[str, TypstVar] | Iterable[TypstVar]
 
+# 因为 Typst 默认字号=11，janim 默认字号=24，为了默认显示效果一致，将 Typst 内容缩放 24/11
+TYPST_DEFAULT_SCALE = 24 / 11
+
+
+class TypstSource(NamedTuple):
+    '''
+    编译 Typst 文档所需的内容，由 :meth:`TypstDoc.normalize_args` 得到
+    '''
+    text: str
+    shared_preamble: str
+    additional_preamble: str
+    vars: str
+    sys_inputs: dict[str, str]
+
 
 class TypstDoc(SVGItem):
     '''
     Typst 文档
+
+    传入 ``lazy=True`` 时，只提交编译而不等待，物件的创建被推迟到第一次使用该物件时（例如访问其 ``points``、子物件等），
+    在此之前的其它代码可以与编译同时进行，例如
+
+    .. code-block:: python
+
+        t1 = TypstMath('x^2', lazy=True)
+        t2 = TypstMath('y^2', lazy=True)
+        ...     # 其它不涉及 t1 和 t2 的代码
+        self.play(Write(t1))    # 在这里才等待 t1 编译完成并创建子物件
+
+    已经编译过的文档则会直接创建；在 :class:`~.Timeline` 中创建而一直没有被使用的，会在构建结束时完成创建，
+    因此编译错误至迟在构建结束时报告
     '''
 
     group_key = 'data-typst-label'
@@ -45,12 +76,67 @@ class TypstDoc(SVGItem):
         vars: dict[str, TypstVar] | None = None,
         vars_size_unit: Literal['pt', 'mm', 'cm', 'in', 'pt'] | None = None,
         sys_inputs: dict[str, str] = {},
-        scale: float = 24 / 11,     # 因为 Typst 默认字号=11，janim 默认字号=24，为了默认显示效果一致，将 Typst 内容缩放 24/11
+        scale: float = TYPST_DEFAULT_SCALE,
         shared_preamble: str | None = None,
         additional_preamble: str | None = None,
+        lazy: bool = False,
         **kwargs
     ):
-        self.text = text
+        source, vars_mapping, kwargs = self.normalize_args(
+            text,
+            vars=vars,
+            vars_size_unit=vars_size_unit,
+            sys_inputs=sys_inputs,
+            scale=scale,
+            shared_preamble=shared_preamble,
+            additional_preamble=additional_preamble,
+            **kwargs
+        )
+        self.text = source.text
+
+        svg_file_path, future = self.submit_typst(*source)
+
+        if lazy and future is not None:
+            # 先创建没有子物件的空物件，使得该物件在 Timeline 中的记录以及深度次序与直接创建时一致
+            Group.__init__(self)
+            self.groups = {}
+            self._typst_lazy_init = partial(self._init_lazy, svg_file_path, future, scale, vars_mapping, **kwargs)
+            object.__setattr__(self, '__class__', _get_lazy_typst_cls(type(self)))
+            # 在 Timeline 中创建时，至迟在 construct 结束时完成创建，使得编译错误总会被报告
+            if self.timeline is not None:
+                self.timeline.construct_finalizers.append(partial(_finish_lazy_typst, self))
+            return
+
+        super().__init__(
+            self.wait_typst(svg_file_path, future),
+            scale=scale,
+            **kwargs
+        )
+
+        self.replace_vars(vars_mapping)
+
+    @classmethod
+    def normalize_args(
+        cls,
+        text: str,
+        *,
+        vars: dict[str, TypstVar] | None = None,
+        vars_size_unit: Literal['pt', 'mm', 'cm', 'in', 'pt'] | None = None,
+        sys_inputs: dict[str, str] = {},
+        scale: float = TYPST_DEFAULT_SCALE,
+        shared_preamble: str | None = None,
+        additional_preamble: str | None = None,
+        **kwargs
+    ) -> tuple[TypstSource, dict[str, Points] | None, dict]:
+        '''
+        将创建物件时传入的参数整理为编译所需的 :class:`TypstSource`，用于 ``__init__`` 以及 :meth:`prefetch`
+
+        返回 ``(source, vars_mapping, kwargs)``，其中 ``vars_mapping`` 是占位元素对应的物件，
+        ``kwargs`` 是剩余的、与编译无关的参数
+
+        子类对文档内容的处理（例如 :class:`TypstText` 的 ``use_math_environment``）需要在这里进行，
+        使得 :meth:`prefetch` 与创建物件时得到的文档一致
+        '''
         if shared_preamble is None:
             shared_preamble = Config.get.typst_shared_preamble
         if additional_preamble is None:
@@ -59,34 +145,70 @@ class TypstDoc(SVGItem):
         if vars is not None:
             factor_pt = Config.get.default_pixel_to_frame_ratio * (FRAME_PPI / 96) * scale
             factor_px = factor_pt * 4 / 3
-            vars_str, vars_mapping = self.vars_str(vars, vars_size_unit or 1 / factor_px)
+            vars_str, vars_mapping = cls.vars_str(vars, vars_size_unit or 1 / factor_px)
         else:
-            vars_str = ''
+            vars_str, vars_mapping = '', None
 
-        super().__init__(
-            self.compile_typst(text, shared_preamble, additional_preamble, vars_str, sys_inputs),
-            scale=scale,
-            **kwargs
-        )
+        source = TypstSource(text, shared_preamble, additional_preamble, vars_str, sys_inputs)
+        return source, vars_mapping, kwargs
 
-        # 把占位元素替换为实际物件
-        if vars is not None:
-            new_children = self.children.copy()
-            for label, item in vars_mapping.items():
-                placeholders = self.get_label(label)
+    def _init_lazy(
+        self,
+        svg_file_path: str,
+        future: Future[int],
+        scale: float,
+        vars_mapping: dict[str, Points] | None,
+        *,
+        width: float | None = None,
+        height: float | None = None,
+        mark_basepoint: bool = False,
+        **kwargs
+    ) -> None:
+        '''
+        完成 ``lazy=True`` 时被推迟的创建，相当于 :class:`~.SVGItem` 的 ``__init__`` 中的剩余部分
+        '''
+        self.wait_typst(svg_file_path, future)
+        items, self.groups = self.get_items_from_file(svg_file_path, mark_basepoint)
+
+        # 直接创建时，子物件先于该物件创建，所以 _order 比该物件的大（越晚创建的 _order 越小）；
+        # 而这里的子物件是在该物件之后才创建的，为了使绘制的先后与直接创建时一致，
+        # 将子物件的 _order 按原有的先后重新设置在 (order, order + 1) 之间，
+        # 也就是在该物件的 _order 之后、在其之前创建的物件的 _order 之前
+        depth, order = self.depth.get_raw()
+        descendants = list(it.chain.from_iterable(item.walk_self_and_descendants() for item in items))
+        descendants.sort(key=lambda item: item.depth.get_raw()[1], reverse=True)
+        for i, item in enumerate(descendants):
+            item.depth.set(depth, order + (len(descendants) - i) / (len(descendants) + 1), root_only=True)
+
+        self.add(*items)
+        self.set(**kwargs)
+        self.init_size_and_position(scale, width, height)
+
+        self.replace_vars(vars_mapping)
+
+    def replace_vars(self, vars_mapping: dict[str, Points] | None) -> None:
+        '''
+        把占位元素替换为实际物件
+        '''
+        if vars_mapping is None:
+            return
 
-                for i, placeholder in enumerate(placeholders):
-                    phbox = placeholder.points.box
+        new_children = self.children.copy()
+        for label, item in vars_mapping.items():
+            placeholders = self.get_label(label)
 
-                    item_to_replace = item if i == 0 else item.copy()
-                    item_to_replace.points.set_size(width=phbox.width, height=phbox.height).move_to(phbox.center)
+            for i, placeholder in enumerate(placeholders):
+                phbox = placeholder.points.box
 
-                    idx = new_children.index(placeholder)
-                    new_children.pop(idx)
-                    new_children.insert(idx, item_to_replace)
+                item_to_replace = item if i == 0 else item.copy()
+                item_to_replace.points.set_size(width=phbox.width, height=phbox.height).move_to(phbox.center)
 
-            self.clear_children()
-            self.add(*new_children)
+                idx = new_children.index(placeholder)
+                new_children.pop(idx)
+                new_children.insert(idx, item_to_replace)
+
+        self.clear_children()
+        self.add(*new_children)
 
     def move_into_position(self) -> None:
         self.points.scale(0.9, about_point=ORIGIN).to_border(UP)
@@ -100,63 +222,70 @@ class TypstDoc(SVGItem):
         sys_inputs: dict[str, str]
     ) -> str:
         '''
-        编译 Typst 文档
-        '''
-        sys_inputs_pairs = [
-            f'{key}={value}'
-            for key, value in sys_inputs.items()
-        ]
+        编译 Typst 文档，返回得到的 SVG 文件路径
 
-        typst_temp_dir = get_typst_temp_dir()
-        md5 = hashlib.md5(text.encode())
-        md5.update(shared_preamble.encode())
-        md5.update(additional_preamble.encode())
-        md5.update(vars.encode())
-        md5.update('\n'.join(sys_inputs_pairs).encode())
-        hash_hex = md5.hexdigest()
-
-        svg_file_path = os.path.join(typst_temp_dir, hash_hex + '.svg')
-        if os.path.exists(svg_file_path):
-            return svg_file_path
-
-        typst_content = get_typst_template().format(
-            shared_preamble=shared_preamble,
-            additional_preamble=additional_preamble,
-            vars=vars,
-            typst_expression=text
+        实际的编译由 :class:`TypstCompiler` 进行，这里会等待其完成
+        '''
+        return TypstDoc.wait_typst(
+            *TypstDoc.submit_typst(text, shared_preamble, additional_preamble, vars, sys_inputs)
         )
 
-        commands = [
-            Config.get.typst_bin,
-            'compile',
-            '-',
-            svg_file_path,
-            '-f', 'svg'
-        ]
+    @staticmethod
+    def submit_typst(
+        text: str,
+        shared_preamble: str,
+        additional_preamble: str,
+        vars: str,
+        sys_inputs: dict[str, str]
+    ) -> tuple[str, Future[int] | None]:
+        '''
+        将 Typst 文档提交给 :class:`TypstCompiler`，返回 SVG 文件路径以及对应的 ``Future``，参考 :meth:`TypstCompiler.submit`
+        '''
+        return typst_compiler.submit(text, shared_preamble, additional_preamble, vars, sys_inputs)
 
-        for pair in sys_inputs_pairs:
-            commands += [
-                '--input', pair
-            ]
+    @staticmethod
+    def wait_typst(svg_file_path: str, future: Future[int] | None) -> str:
+        '''
+        等待 :meth:`submit_typst` 提交的编译完成，返回 SVG 文件路径，编译失败时报错
+        '''
+        if future is None:
+            return svg_file_path
 
         try:
-            process = sp.Popen(commands, stdin=sp.PIPE)
+            ret = future.result()
         except FileNotFoundError:
+            typst_compiler.discard(svg_file_path)
             log.error(_('Could not compile Typst file. '
                         'Please install Typst and add it to the environment variables.'))
             raise ExitException(EXITCODE_TYPST_NOT_FOUND)
 
-        process.stdin.write(typst_content.encode('utf-8'))
-        process.stdin.close()
-        ret = process.wait()
         if ret != 0:
+            typst_compiler.discard(svg_file_path)
             log.error(_('Typst compilation error. Please check the output for more information.'))
             raise ExitException(EXITCODE_TYPST_COMPILE_ERROR)
 
-        process.terminate()
-
         return svg_file_path
 
+    @classmethod
+    def prefetch(cls, texts: Iterable[str], **kwargs) -> None:
+        '''
+        提前将 ``texts`` 对应的文档提交给 :class:`TypstCompiler` 并发地编译，而不创建物件也不等待编译完成
+
+        之后使用相同的参数创建物件时，会直接使用编译结果（或者等待其编译完成），例如
+
+        .. code-block:: python
+
+            TypstMath.prefetch(formulas)
+            items = [TypstMath(formula) for formula in formulas]
+
+        如果不进行 ``prefetch``，每个物件都会在创建时依次等待各自的编译完成
+
+        编译出错时不会在这里报错，而是在之后创建对应的物件时报错
+        '''
+        for text in texts:
+            source, _, _ = cls.normalize_args(text, **kwargs)
+            typst_compiler.submit(*source)
+
     @classmethod
     def typstify(cls, obj: TypstPattern) -> TypstDoc:
         '''
@@ -460,15 +589,31 @@ class TypstText(TypstDoc):
         use_math_environment: bool = False,
         **kwargs
     ):
+        super().__init__(
+            text,
+            shared_preamble=shared_preamble,
+            preamble=preamble,
+            use_math_environment=use_math_environment,
+            **kwargs
+        )
+
+    @classmethod
+    def normalize_args(
+        cls,
+        text: str,
+        *,
+        preamble: str | None = None,
+        use_math_environment: bool = False,
+        **kwargs
+    ) -> tuple[TypstSource, dict[str, Points] | None, dict]:
         if preamble is None:
             if use_math_environment:
                 preamble = Config.get.typst_math_preamble
             else:
                 preamble = Config.get.typst_text_preamble
-        super().__init__(
+        kwargs['additional_preamble'] = preamble
+        return super().normalize_args(
             f'$ {text} $' if use_math_environment else text,
-            shared_preamble=shared_preamble,
-            additional_preamble=preamble,
             **kwargs
         )
 
@@ -499,6 +644,16 @@ class TypstMath(TypstText):
             **kwargs
         )
 
+    @classmethod
+    def normalize_args(
+        cls,
+        text: str,
+        *,
+        use_math_environment: bool = True,
+        **kwargs
+    ) -> tuple[TypstSource, dict[str, Points] | None, dict]:
+        return super().normalize_args(text, use_math_environment=use_math_environment, **kwargs)
+
 
 class Typst(TypstMath):
     def __init__(self, text: str, **kwargs):
@@ -511,6 +666,195 @@ class Typst(TypstMath):
         super().__init__(text, **kwargs)
 
 
+# 同时运行的 typst 进程数量上限；typst 进程的耗时有相当一部分在于启动以及加载字体，所以至少为 2
+TYPST_MAX_WORKERS = max(2, min(8, os.cpu_count() or 1))
+
+
+class TypstCompiler:
+    '''
+    使用有限数量的并发 typst 进程编译 Typst 文档，一般通过 :meth:`TypstDoc.compile_typst` 使用
+
+    - 以文档内容的 md5 作为文件名，将结果保存在 ``temp_dir`` 的 ``Typst`` 文件夹中，已存在时直接使用
+    - :meth:`submit` 立即返回，由线程池中的线程启动 typst 进程并等待其结束，因此多个文档可以同时编译
+    - 相同的文档在编译完成前被再次提交时，不会重复编译
+    '''
+    def __init__(self, max_workers: int = TYPST_MAX_WORKERS):
+        self.max_workers = max_workers
+        self.executor: ThreadPoolExecutor | None = None
+        # svg 文件路径 -> 编译中（或者编译失败但尚未报错）的 Future，其结果为 typst 进程的返回值
+        self.pending: dict[str, Future[int]] = {}
+        self.lock = threading.RLock()
+
+    def submit(
+        self,
+        text: str,
+        shared_preamble: str,
+        additional_preamble: str,
+        vars: str,
+        sys_inputs: dict[str, str]
+    ) -> tuple[str, Future[int] | None]:
+        '''
+        提交编译，返回 svg 文件路径以及对应的 ``Future``；已经编译过的则 ``Future`` 为 ``None``
+
+        ``Config`` 以及模板在这里读取，因为线程池中的线程无法得到当前的 ``Config``
+        '''
+        sys_inputs_pairs = [
+            f'{key}={value}'
+            for key, value in sys_inputs.items()
+        ]
+
+        typst_temp_dir = get_typst_temp_dir()
+        md5 = hashlib.md5(text.encode())
+        md5.update(shared_preamble.encode())
+        md5.update(additional_preamble.encode())
+        md5.update(vars.encode())
+        md5.update('\n'.join(sys_inputs_pairs).encode())
+        hash_hex = md5.hexdigest()
+
+        svg_file_path = os.path.join(typst_temp_dir, hash_hex + '.svg')
+
+        with self.lock:
+            future = self.pending.get(svg_file_path, None)
+            if future is not None:
+                return svg_file_path, future
+
+            if os.path.exists(svg_file_path):
+                return svg_file_path, None
+
+            typst_content = get_typst_template().format(
+                shared_preamble=shared_preamble,
+                additional_preamble=additional_preamble,
+                vars=vars,
+                typst_expression=text
+            )
+
+            commands = [
+                Config.get.typst_bin,
+                'compile',
+                '-',
+                svg_file_path,
+                '-f', 'svg'
+            ]
+
+            for pair in sys_inputs_pairs:
+                commands += [
+                    '--input', pair
+                ]
+
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='typst')
+
+            future = self.pending[svg_file_path] = self.executor.submit(self._run, commands, typst_content)
+            future.add_done_callback(lambda f: self._on_done(svg_file_path, f))
+
+        return svg_file_path, future
+
+    def discard(self, svg_file_path: str) -> None:
+        '''
+        移除编译失败的记录，使得之后可以重新编译
+        '''
+        with self.lock:
+            self.pending.pop(svg_file_path, None)
+
+    def _on_done(self, svg_file_path: str, future: Future[int]) -> None:
+        # 编译成功的可以直接通过文件得到，编译失败的则保留到报错时，参考 TypstDoc.wait_typst
+        if future.exception() is None and future.result() == 0:
+            self.discard(svg_file_path)
+
+    @staticmethod
+    def _run(commands: list[str], typst_content: str) -> int:
+        process = sp.Popen(commands, stdin=sp.PIPE)
+        process.stdin.write(typst_content.encode('utf-8'))
+        process.stdin.close()
+        ret = process.wait()
+        process.terminate()
+        return ret
+
+
+typst_compiler = TypstCompiler()
+
+
+# 以下属性被访问时，延迟创建的 TypstDoc 不需要完成创建；
+# 它们被用于 Timeline 检查物件的变化以及 Signal 在垃圾回收时的清理，这些都不应等待编译
+_LAZY_TYPST_PASSTHROUGH = frozenset({
+    '__class__', '__dict__', SIGNAL_OBJ_SLOTS_NAME,
+    'timeline', 'stored', '_dirty', 'mark_dirty', 'tracks_changes', 'components',
+})
+# 不需要在延迟创建的 TypstDoc 中重载的特殊方法
+_LAZY_TYPST_EXCLUDED_DUNDERS = frozenset({
+    '__new__', '__init__', '__init_subclass__', '__class_getitem__',
+    '__getattribute__', '__getattr__', '__setattr__', '__delattr__',
+    '__hash__', '__eq__', '__ne__',
+})
+
+lazy_typst_cls_map: dict[type[TypstDoc], type[TypstDoc]] = {}
+
+
+def _get_lazy_typst_cls(cls: type[TypstDoc]) -> type[TypstDoc]:
+    '''
+    得到 ``cls`` 对应的、用于 ``lazy=True`` 的子类
+
+    这个子类的对象在被使用时（也就是访问除了 :data:`_LAZY_TYPST_PASSTHROUGH` 以外的属性，或者调用 ``len(item)`` 等特殊方法时）
+    会先完成被推迟的创建，然后将自身的类还原为 ``cls``；创建失败（例如编译出错）时保持不变，之后每次使用都会再次报错
+    '''
+    lazy_cls = lazy_typst_cls_map.get(cls, None)
+    if lazy_cls is not None:
+        return lazy_cls
+
+    def materialize(self: TypstDoc) -> None:
+        # 先完成被推迟的创建，成功后才还原类；编译失败时保持原状，使得之后的每次访问都会再次报错
+        # （创建过程中 _typst_lazy_init 已被移除，此时对自身的访问不会再次进入这里）
+        init = self.__dict__.pop('_typst_lazy_init')
+        try:
+            init()
+        except BaseException:
+            self.__dict__['_typst_lazy_init'] = init
+            raise
+        object.__setattr__(self, '__class__', cls)
+
+    def is_pending(self: TypstDoc) -> bool:
+        return '_typst_lazy_init' in object.__getattribute__(self, '__dict__')
+
+    def __getattribute__(self, name: str):
+        if name not in _LAZY_TYPST_PASSTHROUGH and is_pending(self):
+            materialize(self)
+        return object.__getattribute__(self, name)
+
+    def make_dunder(name: str):
+        # 特殊方法是从类而不是从对象上查找的，不会经过 __getattribute__，所以需要单独重载
+        def dunder(self: TypstDoc, *args, **kwargs):
+            if is_pending(self):
+                materialize(self)
+            return getattr(cls, name)(self, *args, **kwargs)
+        dunder.__name__ = name
+        return dunder
+
+    attrdict = {'__getattribute__': __getattribute__}
+    for base in cls.__mro__[:-1]:
+        for name, value in base.__dict__.items():
+            if not name.startswith('__') \
+                    or not name.endswith('__') \
+                    or name in attrdict \
+                    or name in _LAZY_TYPST_EXCLUDED_DUNDERS \
+                    or not isinstance(value, types.FunctionType):
+                continue
+            attrdict[name] = make_dunder(name)
+
+    attrdict['_typst_materialize'] = staticmethod(materialize)
+
+    lazy_cls = lazy_typst_cls_map[cls] = type(cls)(f'Lazy{cls.__name__}', (cls,), attrdict)
+    lazy_cls.__module__ = cls.__module__
+    return lazy_cls
+
+
+def _finish_lazy_typst(item: TypstDoc) -> None:
+    '''
+    如果 ``lazy=True`` 的 ``item`` 还没有完成创建，则完成其创建
+    '''
+    if '_typst_lazy_init' in item.__dict__:
+        type(item)._typst_materialize(item)
+
+
 cached_typst_template: str | None = None
 
 
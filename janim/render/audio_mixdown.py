@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import math
+import tempfile
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from janim.anims.timeline import BuiltTimeline, Timeline
+
+# 混音结果超过该大小时，存放在临时文件的内存映射中，而不是完全驻留在内存里
+MIXDOWN_MEMMAP_BYTES = 128 * 1024 * 1024
+# 混合时每次处理的采样点数量，用于限制临时数组的大小
+MIXDOWN_BLOCK_SAMPLES = 1 << 20
+
+INT16_MIN = np.iinfo(np.int16).min
+INT16_MAX = np.iinfo(np.int16).max
+
+
+class AudioMixdown:
+    '''
+    将整个 :class:`~.BuiltTimeline` 的音频（包括所有子 Timeline 的）一次性混合到同一个 int16 缓冲区中，
+    之后输出音频以及预览播放时都只需要从中切片，而不需要每帧重新对各个音频进行截取、补零与重采样
+
+    - ``data`` 的形状为 ``(采样点数量, 声道数)``，第 ``i`` 个采样点对应 ``i / framerate`` 时刻
+    - 超过 :data:`MIXDOWN_MEMMAP_BYTES` 时，``data`` 是临时文件的内存映射
+    - 叠加时超出 int16 范围的部分会被截断，而不是溢出
+
+    一般通过 :meth:`~.BuiltTimeline.get_audio_mixdown` 得到
+    '''
+    def __init__(self, built: BuiltTimeline, framerate: int):
+        self.framerate = framerate
+        self.channels = built.cfg.audio_channels
+
+        timeline = built.timeline
+
+        # 音频可能超出 Timeline 的结尾，所以长度取二者中较大的
+        count = math.floor(built.duration * framerate) + 1
+        for info in timeline.audio_infos:
+            count = max(count, math.ceil(info.range.end * framerate))
+
+        children = [
+            (round(item.at * framerate), AudioMixdown(item._built, framerate))
+            for item in timeline.subtimeline_items
+            if item._built.timeline.has_audio_for_all()
+        ]
+        for offset, child in children:
+            count = max(count, offset + len(child))
+
+        self.data = self._allocate(count)
+
+        for info in timeline.audio_infos:
+            self._mix_audio(info)
+
+        for offset, child in children:
+            self._mix(offset, child.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _allocate(self, count: int) -> np.ndarray:
+        shape = (count, self.channels)
+        if count * self.channels * 2 <= MIXDOWN_MEMMAP_BYTES:
+            return np.zeros(shape, dtype=np.int16)
+
+        # 映射建立后即使关闭文件对象，临时文件也会在映射被释放后才删除
+        with tempfile.TemporaryFile(prefix='janim_mixdown_') as f:
+            return np.memmap(f, dtype=np.int16, mode='w+', shape=shape)
+
+    def _mix_audio(self, info: Timeline.PlayAudioInfo) -> None:
+        audio = info.audio
+        samples = audio._samples.data
+
+        # 音频中被播放的区段
+        clip_begin = max(0, int(audio.framerate * info.clip_range.at))
+        clip_end = min(len(samples), int(audio.framerate * info.clip_range.end))
+        if clip_begin >= clip_end:
+            return
+
+        # 输出中的第 out_begin 个采样点对应音频中的第 src_begin 个，
+        # 之后的位置使用整数计算，避免浮点误差使得相邻的采样点被重复或者跳过
+        out_begin = round(info.range.at * self.framerate)
+        src_begin = round(info.clip_range.at * audio.framerate)
+
+        if audio.framerate == self.framerate:
+            # 采样率相同时，输出中的第 i 个采样点对应音频中的第 i + offset 个
+            offset = src_begin - out_begin
+            begin = max(0, clip_begin - offset)
+            end = min(len(self.data), clip_end - offset)
+            if begin < end:
+                self._mix(begin, samples[begin + offset: end + offset])
+            return
+
+        # 采样率不同时，对每个输出的采样点计算其在音频中对应的位置
+        begin = max(0, out_begin)
+        end = min(len(self.data), math.ceil(info.range.end * self.framerate))
+        for block_begin in range(begin, end, MIXDOWN_BLOCK_SAMPLES):
+            block_end = min(end, block_begin + MIXDOWN_BLOCK_SAMPLES)
+            indices = src_begin + (np.arange(block_begin, block_end) - out_begin) * audio.framerate // self.framerate
+            valid = (indices >= clip_begin) & (indices < clip_end)
+            data = np.zeros((block_end - block_begin, samples.shape[1]), dtype=np.int16)
+            data[valid] = samples[indices[valid]]
+            self._mix(block_begin, data)
+
+    def _mix(self, begin: int, data: np.ndarray) -> None:
+        '''
+        将 ``data`` 叠加到从第 ``begin`` 个采样点开始的位置
+        '''
+        if begin < 0:
+            data = data[-begin:]
+            begin = 0
+        data = data[:len(self.data) - begin]
+        for offset in range(0, len(data), MIXDOWN_BLOCK_SAMPLES):
+            block = data[offset: offset + MIXDOWN_BLOCK_SAMPLES]
+            target = self.data[begin + offset: begin + offset + len(block)]
+            mixed = target.astype(np.int32)
+            mixed += block
+            np.clip(mixed, INT16_MIN, INT16_MAX, out=mixed)
+            target[:] = mixed
+
+    def samples(self, begin: int, end: int) -> np.ndarray:
+        '''
+        得到第 ``begin`` 到第 ``end`` 个采样点，超出范围的部分为静音
+        '''
+        if 0 <= begin and end <= len(self.data):
+            return self.data[begin: end]
+
+        result = np.zeros((end - begin, self.channels), dtype=np.int16)
+        src_begin = max(0, begin)
+        src_end = min(len(self.data), end)
+        if src_begin < src_end:
+            result[src_begin - begin: src_end - begin] = self.data[src_begin: src_end]
+        return result
+
+    def samples_of_frame(self, fps: float, frame: int, *, count: int = 1) -> np.ndarray:
+        '''
+        得到第 ``frame`` 帧开始的 ``count`` 帧所对应的采样点
+        '''
+        begin = math.floor(frame / fps * self.framerate)
+        end = math.floor((frame + count) / fps * self.framerate)
+        return self.samples(begin, end)
@@ -9,6 +9,7 @@ import moderngl as mgl
 
 from janim.camera.camera_info import CameraInfo
 from janim.locale.i18n import get_local_strings
+from janim.render.buffer_pool import BufferPool
 
 if TYPE_CHECKING:
     from janim.items.item import Item
@@ -22,6 +23,7 @@ FIX_IN_FRAME_KEY = 'JA_FIX_IN_FRAME'
 class Programs:
     cache: dict[Any, mgl.Program | mgl.ComputeShader] = field(default_factory=lambda: {})
     additional: list[mgl.Program] = field(default_factory=lambda: [])
+    buffer_pool: BufferPool = field(default_factory=BufferPool)
 
 
 programs_map: defaultdict[mgl.Context, Programs] = defaultdict(Programs)
@@ -40,6 +42,10 @@ class Renderer:
     '''
     data_ctx: ContextVar[RenderData] = ContextVar('Renderer.data_ctx')
 
+    # 渲染结果是否只由物件数据决定（例如不随时间变化），为 True 时物件可以被缓存到静态图层中，
+    # 参考 :class:`~.StaticLayerCache`
+    static_cacheable: bool = False
+
     def render(self, item) -> None: ...
 
     @staticmethod
@@ -62,12 +68,16 @@ class RenderData:
     anti_alias_radius: float
 
 
+DEFAULT_BLEND_FUNC = (
+    mgl.SRC_ALPHA, mgl.ONE_MINUS_SRC_ALPHA,
+    mgl.ONE, mgl.ONE
+)
+DEFAULT_BLEND_EQUATION = (mgl.FUNC_ADD, mgl.MAX)
+
+
 def create_context(**kwargs) -> mgl.Context:
     ctx = mgl.create_context(**kwargs)
     # 默认是 blend-off 的
-    ctx.blend_func = (
-        mgl.SRC_ALPHA, mgl.ONE_MINUS_SRC_ALPHA,
-        mgl.ONE, mgl.ONE
-    )
-    ctx.blend_equation = mgl.FUNC_ADD, mgl.MAX
+    ctx.blend_func = DEFAULT_BLEND_FUNC
+    ctx.blend_equation = DEFAULT_BLEND_EQUATION
     return ctx
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import weakref
+from collections import defaultdict
+
+import moderngl as mgl
+
+# 最小的缓冲区大小，更小的请求也会分配该大小
+MIN_BUFFER_SIZE = 256
+# 空闲缓冲区的总大小超过该值时，多出的缓冲区会被释放
+MAX_FREE_BYTES = 64 * 1024 * 1024
+# 连续这么多帧都没有被使用的 PooledBuffers 会将缓冲区归还到缓冲池
+IDLE_FRAMES = 60
+
+
+def size_class(size: int) -> int:
+    '''
+    得到 ``size`` 所属的大小等级，也就是不小于 ``size`` 的 2 的幂（至少为 :data:`MIN_BUFFER_SIZE`）
+    '''
+    if size <= MIN_BUFFER_SIZE:
+        return MIN_BUFFER_SIZE
+    return 1 << (size - 1).bit_length()
+
+
+class BufferPool:
+    '''
+    每个上下文中共用的缓冲区池，通过 ``programs_map[ctx].buffer_pool`` 得到
+
+    缓冲区按照 :func:`size_class` 分级存放，借出时优先复用已归还的同等级缓冲区，
+    这样在物件频繁出现与消失（例如 :class:`~.Transform` 每次都创建新的渲染器）时，不会反复地分配显存
+
+    一般不直接调用 :meth:`acquire` 和 :meth:`release`，而是通过 :class:`PooledBuffers` 使用
+    '''
+    def __init__(self):
+        self.free: defaultdict[int, list[mgl.Buffer]] = defaultdict(list)
+        self.leases: weakref.WeakSet[PooledBuffers] = weakref.WeakSet()
+
+        self.frame = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.resident_bytes = 0
+        self.free_bytes = 0
+
+    def acquire(self, ctx: mgl.Context, size: int) -> mgl.Buffer:
+        '''
+        借出一个大小不小于 ``size`` 的缓冲区
+        '''
+        cls = size_class(size)
+        free = self.free[cls]
+        if free:
+            self.hits += 1
+            self.free_bytes -= cls
+            return free.pop()
+
+        self.misses += 1
+        self.resident_bytes += cls
+        return ctx.buffer(reserve=cls)
+
+    def release(self, buffer: mgl.Buffer) -> None:
+        '''
+        归还缓冲区，空闲的缓冲区过多时会直接释放
+        '''
+        if self.free_bytes + buffer.size > MAX_FREE_BYTES:
+            self.resident_bytes -= buffer.size
+            buffer.release()
+            return
+
+        self.free[buffer.size].append(buffer)
+        self.free_bytes += buffer.size
+
+    def begin_frame(self) -> None:
+        '''
+        在每帧渲染前调用，用于将长时间未被使用的 :class:`PooledBuffers` 的缓冲区收回
+        '''
+        self.frame += 1
+        if self.frame % IDLE_FRAMES != 0:
+            return
+        for lease in list(self.leases):
+            if self.frame - lease.last_frame >= IDLE_FRAMES:
+                lease.release()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return 1.0 if total == 0 else self.hits / total
+
+    def format(self) -> str:
+        def fmt_bytes(size: int) -> str:
+            if size < 1024 * 1024:
+                return f'{size / 1024:.1f} KB'
+            return f'{size / 1024 / 1024:.2f} MB'
+
+        return (
+            f'hit rate {self.hit_rate:.1%} ({self.hits}/{self.hits + self.misses}), '
+            f'resident {fmt_bytes(self.resident_bytes)} (free {fmt_bytes(self.free_bytes)})'
+        )
+
+
+class PooledBuffers:
+    '''
+    从 :class:`BufferPool` 借用的一组缓冲区，按名称区分，供渲染器使用
+
+    - 缓冲区的实际大小按 :func:`size_class` 分级，大于所需的大小，
+      所以绑定时需要使用 :meth:`bind_to_storage_buffer` 指定有效的范围，使得着色器中 ``.length()`` 的结果正确
+    - 渲染时需要调用 :meth:`touch`；连续 :data:`IDLE_FRAMES` 帧未被使用时，缓冲区会被归还，
+      此时 :attr:`empty` 为 ``True``，需要重新写入所有数据
+    - 该对象被回收时，缓冲区也会被归还
+    '''
+    def __init__(self, ctx: mgl.Context, pool: BufferPool):
+        self.ctx = ctx
+        self.pool = pool
+        self.buffers: dict[str, mgl.Buffer] = {}
+        self.sizes: dict[str, int] = {}
+        self.last_frame = pool.frame
+
+        pool.leases.add(self)
+        finalizer = weakref.finalize(self, PooledBuffers._release_buffers, pool, self.buffers)
+        finalizer.atexit = False
+
+    @property
+    def empty(self) -> bool:
+        return not self.buffers
+
+    def touch(self) -> None:
+        self.last_frame = self.pool.frame
+
+    def size(self, name: str) -> int:
+        '''
+        名称为 ``name`` 的缓冲区中有效数据的大小
+        '''
+        return self.sizes.get(name, 0)
+
+    def reserve(self, name: str, size: int) -> mgl.Buffer:
+        '''
+        使名称为 ``name`` 的缓冲区的有效大小为 ``size``，在容量不符合时更换缓冲区（原有的数据不会保留）
+        '''
+        buffer = self.buffers.get(name, None)
+        if buffer is None or buffer.size != size_class(size):
+            if buffer is not None:
+                self.pool.release(buffer)
+            buffer = self.buffers[name] = self.pool.acquire(self.ctx, size)
+        self.sizes[name] = size
+        return buffer
+
+    def write(self, name: str, data: bytes) -> None:
+        self.reserve(name, len(data)).write(data)
+
+    def bind_to_storage_buffer(self, name: str, binding: int) -> None:
+        self.buffers[name].bind_to_storage_buffer(binding, size=self.sizes[name])
+
+    def release(self) -> None:
+        '''
+        将所有缓冲区归还到缓冲池
+        '''
+        PooledBuffers._release_buffers(self.pool, self.buffers)
+        self.sizes.clear()
+
+    @staticmethod
+    def _release_buffers(pool: BufferPool, buffers: dict[str, mgl.Buffer]) -> None:
+        for buffer in buffers.values():
+            pool.release(buffer)
+        buffers.clear()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import ctypes
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import IO, Generator
+
+from janim.utils.profiler import profile_span
+
+FRAME_QUEUE_SIZE = 4
+
+
+@dataclass
+class FrameStats:
+    '''
+    输出视频时各个阶段的耗时统计（单位为秒）
+
+    - ``render``: 渲染（包括 ``glReadPixels`` 的调用）
+    - ``readback``: 将像素数据从 GPU 读取到缓冲区
+    - ``wait``: 等待空闲缓冲区的时间，较大时说明写入线程（也就是 ffmpeg）是瓶颈
+    - ``write``: 写入线程向 ffmpeg 写入数据的时间
+    '''
+    frames: int = 0
+    render: float = 0
+    readback: float = 0
+    wait: float = 0
+    write: float = 0
+
+    # 写入线程只会累计 write，其余的都由调用方所在的线程累计，所以不需要加锁
+
+    @contextmanager
+    def timing(self, stage: str) -> Generator[None, None, None]:
+        '''
+        将 ``with`` 块中的耗时累计到 ``stage`` 中，开启性能分析时也会记录为一个区间
+        '''
+        t = time.perf_counter()
+        try:
+            with profile_span(f'VideoWriter.{stage}', 'writer'):
+                yield
+        finally:
+            setattr(self, stage, getattr(self, stage) + time.perf_counter() - t)
+
+    def merge(self, other: FrameStats) -> None:
+        '''
+        累计 ``other`` 的统计，用于合并多个进程的结果
+        '''
+        self.frames += other.frames
+        self.render += other.render
+        self.readback += other.readback
+        self.wait += other.wait
+        self.write += other.write
+
+    def format(self) -> str:
+        def fmt(name: str, value: float) -> str:
+            return f'{name} {value:.2f} s ({value / frames * 1000:.2f} ms/frame)'
+
+        frames = max(1, self.frames)
+        return ', '.join([
+            fmt('render', self.render),
+            fmt('readback', self.readback),
+            fmt('wait', self.wait),
+            fmt('write', self.write),
+        ])
+
+
+class FrameQueue:
+    '''
+    在单独的线程中将帧数据写入 ``stdin``，使得渲染、读取像素数据与 ffmpeg 编码可以同时进行
+
+    使用方式：
+
+    .. code-block:: python
+
+        with FrameQueue(stdin, byte_size) as frame_queue:
+            for ...:
+                buffer = frame_queue.acquire()
+                ...     # 将像素数据写入 buffer
+                frame_queue.submit(buffer)
+
+    - 缓冲区是预先分配并循环使用的 ``bytearray``，每帧不会产生新的 ``bytes`` 对象
+    - 队列是有界的，当所有缓冲区都在等待写入时，:meth:`acquire` 会阻塞，以免占用过多内存
+    - 写入线程出错时（例如 ffmpeg 异常退出导致 ``BrokenPipeError``），
+      会在下一次调用 :meth:`submit` 或者 :meth:`close` 时在调用方抛出
+    '''
+    def __init__(
+        self,
+        stdin: IO[bytes],
+        byte_size: int,
+        *,
+        size: int = FRAME_QUEUE_SIZE,
+        stats: FrameStats | None = None
+    ):
+        self.stdin = stdin
+        self.byte_size = byte_size
+        self.stats = FrameStats() if stats is None else stats
+
+        # 多出的一个缓冲区用于在队列已满时仍能进行下一帧的读取
+        self.free_buffers: queue.SimpleQueue[bytearray] = queue.SimpleQueue()
+        for _ in range(size + 1):
+            self.free_buffers.put(bytearray(byte_size))
+
+        self.pending: queue.Queue[bytearray | None] = queue.Queue(maxsize=size)
+        self.error: BaseException | None = None
+
+        self.thread = threading.Thread(target=self._write_loop, name='janim-frame-writer', daemon=True)
+        self.thread.start()
+
+    def __enter__(self) -> FrameQueue:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close(raise_error=exc_type is None)
+
+    def acquire(self) -> bytearray:
+        '''
+        得到一个空闲的缓冲区，用于写入下一帧的像素数据
+        '''
+        with self.stats.timing('wait'):
+            return self.free_buffers.get()
+
+    def submit(self, buffer: bytearray) -> None:
+        '''
+        将写入了像素数据的缓冲区加入写入队列
+        '''
+        self.raise_if_error()
+        with self.stats.timing('wait'):
+            self.pending.put(buffer)
+        self.stats.frames += 1
+
+    @staticmethod
+    def address_of(buffer: bytearray) -> int:
+        '''
+        得到缓冲区的内存地址，用于 ``ctypes.memmove`` 等直接的内存拷贝
+        '''
+        return ctypes.addressof(ctypes.c_char.from_buffer(buffer))
+
+    def close(self, *, raise_error: bool = True) -> None:
+        '''
+        等待队列中的帧全部写入后结束写入线程
+        '''
+        self.pending.put(None)
+        self.thread.join()
+        if raise_error:
+            self.raise_if_error()
+
+    def raise_if_error(self) -> None:
+        if self.error is not None:
+            raise self.error
+
+    def _write_loop(self) -> None:
+        while True:
+            buffer = self.pending.get()
+            if buffer is None:
+                break
+
+            # 出错后仍然继续取出缓冲区，避免调用方在 acquire 时一直阻塞
+            if self.error is None:
+                try:
+                    with self.stats.timing('write'):
+                        self.stdin.write(memoryview(buffer))
+                except BaseException as e:
+                    self.error = e
+
+            self.free_buffers.put(buffer)
@@ -14,6 +14,8 @@ if TYPE_CHECKING:
 
 
 class DotCloudRenderer(Renderer):
+    static_cacheable = True
+
     def __init__(self):
         self.initialized = False
 
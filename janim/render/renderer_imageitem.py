@@ -16,6 +16,8 @@ if TYPE_CHECKING:
 
 
 class ImageItemRenderer(Renderer):
+    static_cacheable = True
+
     def __init__(self):
         self.initialized: bool = False
 
@@ -6,7 +6,8 @@ import moderngl as mgl
 import numpy as np
 import OpenGL.GL as gl
 
-from janim.render.base import Renderer
+from janim.render.base import Renderer, programs_map
+from janim.render.buffer_pool import PooledBuffers
 from janim.render.program import get_janim_compute_shader, get_janim_program
 from janim.utils.iterables import resize_with_interpolation
 
@@ -15,6 +16,8 @@ if TYPE_CHECKING:
 
 
 class VItemRenderer(Renderer):
+    static_cacheable = True
+
     def __init__(self):
         self.initialized: bool = False
 
@@ -240,14 +243,17 @@ class VItemRenderer(Renderer):
         self.u_glow_size = self.prog['glow_size']
 
         self.vbo_coord = self.ctx.buffer(reserve=4 * 2 * 4)
-        self.vbo_points = self.ctx.buffer(reserve=1)
-        self.vbo_mapped_points = self.ctx.buffer(reserve=1)
-        self.vbo_radius = self.ctx.buffer(reserve=1)
-        self.vbo_stroke_color = self.ctx.buffer(reserve=1)
-        self.vbo_fill_color = self.ctx.buffer(reserve=1)
+        # 其余的缓冲区从所在上下文的缓冲池中借用，名称分别为
+        # points, mapped_points, radius, stroke_color, fill_color
+        self.buffers = PooledBuffers(self.ctx, programs_map[self.ctx].buffer_pool)
 
         self.vao = self.ctx.vertex_array(self.prog, self.vbo_coord, 'in_coord')
 
+        self.reset_prev()
+
+        self.points_vec4buffer = np.empty((0, 4), dtype=np.float32)
+
+    def reset_prev(self) -> None:
         self.prev_camera_info = None
 
         self.prev_fix_in_frame = None
@@ -259,8 +265,6 @@ class VItemRenderer(Renderer):
         self.prev_glow_size = -1
         self.prev_glow_visible = -1
 
-        self.points_vec4buffer = np.empty((0, 4), dtype=np.float32)
-
     def render_normal(self, item: VItem) -> None:
         if not self.initialized:
             self.init_normal()
@@ -272,6 +276,11 @@ class VItemRenderer(Renderer):
             return
         render_data = self.data_ctx.get()
 
+        # 长时间未渲染时，缓冲区会被归还到缓冲池，此时需要重新写入所有数据
+        if self.buffers.empty:
+            self.reset_prev()
+        self.buffers.touch()
+
         new_camera_info = render_data.camera_info
         new_fix_in_frame = item._fix_in_frame
         new_radius = item.radius._radii._data
@@ -318,23 +327,13 @@ class VItemRenderer(Renderer):
         if new_radius is not self.prev_radius or len(new_points) != len(self.prev_points):
             radius = resize_with_interpolation(new_radius, (len(new_points) + 1) // 2)
             assert radius.dtype == np.float32
-            bytes = radius.tobytes()
-
-            if len(bytes) != self.vbo_radius.size:
-                self.vbo_radius.orphan(len(bytes))
-
-            self.vbo_radius.write(bytes)
+            self.buffers.write('radius', radius.tobytes())
             self.prev_radius = new_radius
 
         if new_stroke is not self.prev_stroke or len(new_points) != len(self.prev_points):
             stroke = resize_with_interpolation(new_stroke, (len(new_points) + 1) // 2)
             assert stroke.dtype == np.float32
-            bytes = stroke.tobytes()
-
-            if len(bytes) != self.vbo_stroke_color.size:
-                self.vbo_stroke_color.orphan(len(bytes))
-
-            self.vbo_stroke_color.write(bytes)
+            self.buffers.write('stroke_color', stroke.tobytes())
             self.prev_stroke = new_stroke
 
         if new_fill is not self.prev_fill:
@@ -344,12 +343,7 @@ class VItemRenderer(Renderer):
         if new_fill is not self.prev_fill or len(new_points) != len(self.prev_points):
             fill = resize_with_interpolation(new_fill, (len(new_points) + 1) // 2)
             assert fill.dtype == np.float32
-            bytes = fill.tobytes()
-
-            if len(bytes) != self.vbo_fill_color.size:
-                self.vbo_fill_color.orphan(len(bytes))
-
-            self.vbo_fill_color.write(bytes)
+            self.buffers.write('fill_color', fill.tobytes())
             self.prev_fill = new_fill
 
         if new_points is not self.prev_points:
@@ -358,21 +352,15 @@ class VItemRenderer(Renderer):
 
             self.points_vec4buffer[:, :3] = new_points
             self.points_vec4buffer[:, 3] = item.points.get_closepath_flags().astype(np.float32)
-            bytes = self.points_vec4buffer.tobytes()
-
-            if len(bytes) != self.vbo_points.size:
-                self.vbo_points.orphan(len(bytes))
-
-            self.vbo_points.write(bytes)
+            self.buffers.write('points', self.points_vec4buffer.tobytes())
 
         if new_points is not self.prev_points \
                 or new_fix_in_frame != self.prev_fix_in_frame \
                 or is_camera_changed:
-            if self.vbo_points.size != self.vbo_mapped_points.size:
-                self.vbo_mapped_points.orphan(self.vbo_points.size)
+            self.buffers.reserve('mapped_points', self.buffers.size('points'))
 
-            self.vbo_points.bind_to_storage_buffer(0)
-            self.vbo_mapped_points.bind_to_storage_buffer(1)
+            self.buffers.bind_to_storage_buffer('points', 0)
+            self.buffers.bind_to_storage_buffer('mapped_points', 1)
             self.update_fix_in_frame(self.comp_u_fix, item)
             self.comp.run(group_x=(len(new_points) + 255) // 256)   # 相当于 len() / 256 向上取整
 
@@ -380,10 +368,10 @@ class VItemRenderer(Renderer):
             self.prev_camera_info = new_camera_info
             self.prev_points = new_points
 
-        self.vbo_mapped_points.bind_to_storage_buffer(0)
-        self.vbo_radius.bind_to_storage_buffer(1)
-        self.vbo_stroke_color.bind_to_storage_buffer(2)
-        self.vbo_fill_color.bind_to_storage_buffer(3)
+        self.buffers.bind_to_storage_buffer('mapped_points', 0)
+        self.buffers.bind_to_storage_buffer('radius', 1)
+        self.buffers.bind_to_storage_buffer('stroke_color', 2)
+        self.buffers.bind_to_storage_buffer('fill_color', 3)
 
         self.update_fix_in_frame(self.u_fix, item)
         self.u_stroke_background.value = item.stroke_background
@@ -394,3 +382,258 @@ class VItemRenderer(Renderer):
         self.vao.render(mgl.TRIANGLE_STRIP)
 
     # endregion
+
+
+# 8 个角在包围框 左下、右上 两个点中分别取哪一个的坐标，与 ``BoundingBox.get_corners`` 一致
+_CORNER_SELECTORS = np.array([
+    [(i >> 2) & 1, (i >> 1) & 1, i & 1]
+    for i in range(8)
+], dtype=bool)
+
+# 物件标志位，与 vitem_batch.frag.glsl 中的对应
+_FLAG_FIX_IN_FRAME = 1
+_FLAG_STROKE_BACKGROUND = 2
+_FLAG_FILL_TRANSPARENT = 4
+
+
+class VItemBatchRenderer:
+    '''
+    将深度相邻的多个 :class:`~.VItem` 合并为一次绘制调用
+
+    与 :class:`VItemRenderer` 逐个物件上传数据、执行 ``map_points.comp.glsl`` 并绘制不同，
+    这里会把一组物件的点、半径、描边颜色以及填充颜色分别拼接到共享的缓冲区中，
+    并以每个物件为一个实例，记录其在缓冲区中的偏移量，
+    从而只需要一次计算着色器的调用以及一次实例化绘制
+
+    - 每个上下文使用一个该对象，通过 :func:`get_vitem_batch_renderer` 得到
+    - 每帧开始时需要调用 :meth:`begin_frame`，因为一帧中可能有多组物件，每组使用各自的缓冲区，
+      这样在下一帧中同一组物件的数据没有变化时可以跳过上传
+    - 需要 OpenGL 4.3 及以上，并且只能在开启混合时使用
+      （关闭混合时每个物件需要读取之前绘制的结果）
+    '''
+    def __init__(self, ctx: mgl.Context):
+        self.ctx = ctx
+        self.slots: list[_VItemBatch] = []
+        self.slot_idx = 0
+
+    @staticmethod
+    def is_supported(ctx: mgl.Context) -> bool:
+        return ctx.version_code >= 430
+
+    def begin_frame(self) -> None:
+        self.slot_idx = 0
+
+    def render(self, items: list[VItem]) -> None:
+        if self.slot_idx == len(self.slots):
+            self.slots.append(_VItemBatch(self.ctx))
+        slot = self.slots[self.slot_idx]
+        self.slot_idx += 1
+        slot.render(items)
+
+
+batch_renderer_map: dict[mgl.Context, VItemBatchRenderer] = {}
+
+
+def get_vitem_batch_renderer(ctx: mgl.Context) -> VItemBatchRenderer:
+    renderer = batch_renderer_map.get(ctx, None)
+    if renderer is None:
+        renderer = batch_renderer_map[ctx] = VItemBatchRenderer(ctx)
+    return renderer
+
+
+class _VItemBatch:
+    '''
+    :class:`VItemBatchRenderer` 中一组物件所使用的缓冲区，以及用于判断数据是否变化的记录
+    '''
+    def __init__(self, ctx: mgl.Context):
+        self.ctx = ctx
+
+        self.comp = get_janim_compute_shader('render/shaders/map_points_batch.comp.glsl')
+        self.comp_u_count = self.comp['count']
+
+        self.prog = get_janim_program('render/shaders/vitem_batch')
+
+        # 与 VItemRenderer 一样，着色器存储缓冲区从缓冲池中借用
+        self.buffers = PooledBuffers(ctx, programs_map[ctx].buffer_pool)
+        self.vbo_instance_f = ctx.buffer(reserve=16)
+        self.vbo_instance_i = ctx.buffer(reserve=16)
+
+        self.vao = ctx.vertex_array(self.prog, [
+            (self.vbo_instance_f, '4f 4f 1f /i', 'in_clip', 'in_glow_color', 'in_glow_size'),
+            (self.vbo_instance_i, '4i /i', 'in_info'),
+        ])
+
+        self.reset_prev()
+
+    def reset_prev(self) -> None:
+        self.prev_camera_info = None
+
+        self.prev_points: list[np.ndarray] = []
+        self.prev_radius: list[np.ndarray] = []
+        self.prev_stroke: list[np.ndarray] = []
+        self.prev_fill: list[np.ndarray] = []
+        self.prev_scalars: list[tuple] = []
+
+        self.point_offsets = np.empty(0, dtype=np.int32)
+        self.anchor_offsets = np.empty(0, dtype=np.int32)
+        self.boxes = np.empty((0, 2, 3))
+
+    @staticmethod
+    def write(vbo: mgl.Buffer, data: np.ndarray) -> None:
+        # 实例数据不依赖缓冲区的长度，所以只在容量不足时扩大，避免频繁地重新分配
+        bytes = data.tobytes()
+        if len(bytes) > vbo.size:
+            vbo.orphan(max(len(bytes), vbo.size * 2))
+        vbo.write(bytes)
+
+    def render(self, items: list[VItem]) -> None:
+        # 与 VItemRenderer 一致，跳过点数量不足以构成曲线的物件
+        items = [item for item in items if len(item.points._points.data) >= 3]
+        if not items:
+            return
+
+        render_data = Renderer.data_ctx.get()
+        camera_info = render_data.camera_info
+
+        # 长时间未渲染时，缓冲区会被归还到缓冲池，此时需要重新写入所有数据
+        if self.buffers.empty:
+            self.reset_prev()
+        self.buffers.touch()
+
+        points = [item.points._points.data for item in items]
+        radius = [item.radius._radii._data for item in items]
+        stroke = [item.stroke._rgbas._data for item in items]
+        fill = [item.fill._rgbas._data for item in items]
+        scalars = [
+            (item._fix_in_frame, item.stroke_background, item.glow._size, item.glow._rgba._data)
+            for item in items
+        ]
+
+        def changed(new: list, prev: list) -> bool:
+            return len(new) != len(prev) or any(a is not b for a, b in zip(new, prev))
+
+        points_changed = changed(points, self.prev_points)
+        radius_changed = changed(radius, self.prev_radius)
+        stroke_changed = changed(stroke, self.prev_stroke)
+        fill_changed = changed(fill, self.prev_fill)
+        scalars_changed = len(scalars) != len(self.prev_scalars) or any(
+            a[:3] != b[:3] or a[3] is not b[3]
+            for a, b in zip(scalars, self.prev_scalars)
+        )
+        camera_changed = camera_info is not self.prev_camera_info
+
+        lengths = np.array([len(p) for p in points], dtype=np.int32)
+        anchor_counts = (lengths + 1) // 2
+
+        if points_changed:
+            self.point_offsets = np.concatenate([[0], np.cumsum(lengths[:-1])]).astype(np.int32)
+            self.anchor_offsets = np.concatenate([[0], np.cumsum(anchor_counts[:-1])]).astype(np.int32)
+            # 每个物件的包围框（左下、右上），相当于对每个物件分别调用 self_box，
+            # 使用 fmin/fmax 是为了与 nanmin/nanmax 一样忽略子路径之间的 NaN
+            all_points = np.concatenate(points)
+            self.boxes = np.stack([
+                np.fmin.reduceat(all_points, self.point_offsets),
+                np.fmax.reduceat(all_points, self.point_offsets)
+            ], axis=1)
+
+        if points_changed or scalars_changed:
+            points_vec4 = np.empty((lengths.sum(), 4), dtype=np.float32)
+            for item, p, offset, (fix_in_frame, *_) in zip(items, points, self.point_offsets, scalars):
+                part = points_vec4[offset: offset + len(p)]
+                part[:, :3] = p
+                part[:, 3] = item.points.get_closepath_flags()
+                if fix_in_frame:
+                    part[:, 3] += 2
+            self.buffers.write('points', points_vec4.tobytes())
+
+        if points_changed or scalars_changed or camera_changed:
+            self.buffers.reserve('mapped_points', self.buffers.size('points'))
+            self.buffers.bind_to_storage_buffer('points', 0)
+            self.buffers.bind_to_storage_buffer('mapped_points', 1)
+            count = int(lengths.sum())
+            self.comp_u_count.value = count
+            self.comp.run(group_x=(count + 255) // 256)     # 相当于 count / 256 向上取整
+
+        def write_anchor_data(name: str, arrays: list[np.ndarray], pad_to: int = 1) -> None:
+            total = int(anchor_counts.sum())
+            data = np.concatenate([
+                resize_with_interpolation(array, count)
+                for array, count in zip(arrays, anchor_counts)
+            ])
+            assert data.dtype == np.float32
+            # 半径在着色器中以 vec4 数组读取，所以需要补齐长度
+            if total % pad_to != 0:
+                data = np.concatenate([data, np.zeros(pad_to - total % pad_to, dtype=np.float32)])
+            self.buffers.write(name, data.tobytes())
+
+        if points_changed or radius_changed:
+            write_anchor_data('radius', radius, 4)
+        if points_changed or stroke_changed:
+            write_anchor_data('stroke_color', stroke)
+        if points_changed or fill_changed:
+            write_anchor_data('fill_color', fill)
+
+        if points_changed or radius_changed or scalars_changed or fill_changed or camera_changed:
+            self.write(self.vbo_instance_f, self.compute_instance_f(radius, scalars))
+            info = np.empty((len(items), 4), dtype=np.int32)
+            info[:, 0] = self.point_offsets
+            info[:, 1] = lengths
+            info[:, 2] = self.anchor_offsets
+            info[:, 3] = [
+                (_FLAG_FIX_IN_FRAME if fix_in_frame else 0)
+                | (_FLAG_STROKE_BACKGROUND if stroke_background else 0)
+                | (_FLAG_FILL_TRANSPARENT if item.fill.is_transparent() else 0)
+                for item, (fix_in_frame, stroke_background, *_) in zip(items, scalars)
+            ]
+            self.write(self.vbo_instance_i, info)
+
+        self.prev_camera_info = camera_info
+        self.prev_points = points
+        self.prev_radius = radius
+        self.prev_stroke = stroke
+        self.prev_fill = fill
+        self.prev_scalars = scalars
+
+        self.buffers.bind_to_storage_buffer('mapped_points', 0)
+        self.buffers.bind_to_storage_buffer('radius', 1)
+        self.buffers.bind_to_storage_buffer('stroke_color', 2)
+        self.buffers.bind_to_storage_buffer('fill_color', 3)
+
+        self.vao.render(mgl.TRIANGLE_STRIP, vertices=4, instances=len(items))
+
+    def compute_instance_f(self, radius: list[np.ndarray], scalars: list[tuple]) -> np.ndarray:
+        '''
+        计算每个实例的 裁剪框、辉光颜色、辉光大小
+
+        裁剪框的计算与 :meth:`VItemRenderer.render_normal` 中的相同，只是对所有物件一起进行
+        '''
+        render_data = Renderer.data_ctx.get()
+        camera_info = render_data.camera_info
+
+        n = len(scalars)
+        boxes = self.boxes  # (n, 2, 3)
+        corners = np.where(_CORNER_SELECTORS, boxes[:, 1:2], boxes[:, 0:1]).reshape(-1, 3)   # (n * 8, 3)
+
+        fix_in_frame = np.array([s[0] for s in scalars], dtype=bool)
+        fix_mask = np.repeat(fix_in_frame, 8)
+        clip = np.empty((n * 8, 2))
+        if fix_mask.any():
+            clip[fix_mask] = camera_info.map_fixed_in_frame_points(corners[fix_mask])
+        if not fix_mask.all():
+            clip[~fix_mask] = camera_info.map_points(corners[~fix_mask])
+        clip = clip.reshape(n, 8, 2) * camera_info.frame_radius
+
+        glow_size = np.array([s[2] for s in scalars], dtype=np.float32)
+        glow_color = np.array([s[3] for s in scalars], dtype=np.float32)
+
+        buff = np.array([r.max() for r in radius]) + render_data.anti_alias_radius
+        buff = np.where(glow_color[:, 3] != 0.0, np.maximum(buff, glow_size), buff)[:, np.newaxis]
+        clip_min = (clip.min(axis=1) - buff) / camera_info.frame_radius
+        clip_max = (clip.max(axis=1) + buff) / camera_info.frame_radius
+
+        result = np.empty((n, 9), dtype=np.float32)
+        result[:, 0:2] = np.clip(clip_min, -1, 1)
+        result[:, 2:4] = np.clip(clip_max, -1, 1)
+        result[:, 4:8] = glow_color
+        result[:, 8] = glow_size
+        return result
@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import enum
+import functools
+import hashlib
+import json
+import math
+import os
+import re
+import types
+from typing import Collection
+
+import attrs
+import moderngl as mgl
+import numpy as np
+from PIL import Image
+
+from janim import __version__
+from janim.anims.anim_stack import AnimStack
+from janim.anims.animation import Animation, ApplyAligner, ItemAnimation
+from janim.anims.display import Display
+from janim.anims.timeline import BuiltTimeline, Timeline
+from janim.components.depth import Cmpt_Depth
+from janim.constants import FOREVER
+from janim.items.item import Item
+from janim.render.base import Renderer
+from janim.utils.config import Config
+from janim.utils.data import Array
+from janim.utils.file_ops import atomic_write
+
+MANIFEST_FILENAME = 'manifest.json'
+
+
+def compute_segments_key(built: BuiltTimeline, output_args: list[str]) -> str:
+    '''
+    计算分段输出所使用的键，由以下内容共同决定：
+
+    - 生效的配置
+    - 编码输出的参数
+    - JAnim 的版本
+
+    其中任意一项改变都会使已输出的片段全部失效；
+    而动画内容的改变只会使相关的片段失效，参考 :class:`SegmentFingerprinter`
+    '''
+    md5 = hashlib.md5(__version__.encode())
+
+    cfg = built.cfg
+    for field in attrs.fields(Config):
+        md5.update(f'{field.name}={getattr(cfg, field.name)!r}\n'.encode())
+
+    md5.update(' '.join(output_args).encode())
+
+    return md5.hexdigest()
+
+
+class _UnknownFingerprint(Exception):
+    '''
+    计算摘要时超出了最大深度，无法确定指纹
+    '''
+
+
+class SegmentFingerprinter:
+    '''
+    计算各个片段的指纹，用于在重新输出时判断片段的内容是否发生变化
+
+    一个片段的指纹由在该片段时间范围内起作用的内容决定：
+
+    - 在该范围内可见的物件，以及它们的 :class:`~.AnimStack` 中与该范围重叠的区段（即 :meth:`~.AnimStack.segments` 中的区段，
+      通过区间树 ``anims`` 查找）里的 :class:`~.ItemAnimation`，包括动画的类型、时间区段、参数，以及 :class:`~.Display` 所记录的物件数据
+    - 在该范围内的额外渲染调用（例如 :class:`~.Transform` 产生的）
+
+    动画的参数会被递归地计算摘要，其中函数（例如 ``rate_func`` 或者 updater 的函数）以其字节码、常量、闭包中的值
+    以及所引用的全局变量计算（全局的函数会被递归地计算，模块只考虑其类型，其余的值按照一般的对象计算）；
+    因此只改动某一处 ``self.play(...)`` 时，只有受其影响的片段的指纹会改变
+
+    如果递归的深度超出了 :attr:`MAX_DEPTH`，则认为该片段的指纹未知（:meth:`fingerprint` 返回 ``None``），
+    这样的片段总是会被重新输出
+    '''
+
+    # 递归计算摘要时的最大深度，超出时认为指纹未知
+    MAX_DEPTH = 6
+
+    # 不参与计算的属性，它们描述的是对象之间的关系或者是缓存，而不是数据本身
+    SKIPPED_ATTRS = {
+        'timeline', 'stack', 'parent', '_generate_by',
+        'parents', 'children', 'stored_parents', 'stored_children',
+        'refresh_data', 'components', 'bind', '_astype', '_astype_mock_cmpt',
+    }
+
+    # 只考虑类型的对象
+    OPAQUE_TYPES = (Timeline, AnimStack, Renderer, mgl.Context, types.ModuleType)
+
+    def __init__(self, built: BuiltTimeline):
+        self.built = built
+        # 以 id 记录已经计算过的摘要；计算过程中所涉及的对象都被 built 所引用，所以 id 不会被复用
+        self.memo: dict[int, bytes | None] = {}
+        self.visiting: set[int] = set()
+
+    def fingerprint(self, begin: int, end: int) -> str | None:
+        '''
+        计算帧区间 ``[begin, end)`` 的指纹，若无法确定则返回 ``None``
+        '''
+        fps = self.built.cfg.fps
+        aligner = self.built.timeline.time_aligner
+        t0 = aligner.align_t_for_render(begin / fps)
+        t1 = aligner.align_t_for_render((end - 1) / fps)
+
+        md5 = hashlib.md5(f'{begin},{end}'.encode())
+        try:
+            self.update_by_timeline(md5, self.built, t0, t1)
+        except _UnknownFingerprint:
+            return None
+        return md5.hexdigest()
+
+    def update_by_timeline(self, md5, built: BuiltTimeline, t0: float, t1: float) -> None:
+        '''
+        将 ``built`` 在时间范围 ``[t0, t1]`` 内起作用的内容计入 ``md5``
+        '''
+        timeline = built.timeline
+
+        # 会影响渲染结果的 AnimStack：可见物件的，摄像机的，以及 ApplyAligner 所依赖的
+        stacks: list[AnimStack] = []
+        visited_stacks: set[int] = set()
+
+        def add_stack(stack: AnimStack) -> None:
+            if id(stack) not in visited_stacks:
+                visited_stacks.add(id(stack))
+                stacks.append(stack)
+
+        visible_items: list[Item] = []
+
+        for item, appr in timeline.item_appearances.items():
+            if item is timeline.camera:
+                add_stack(appr.stack)
+                continue
+            ranges = self._clip_visibility(appr.visibility, t0, t1)
+            if ranges is None:
+                continue
+            md5.update(f'{item.__class__.__qualname__}:{ranges}'.encode())
+            add_stack(appr.stack)
+            visible_items.append(item)
+
+        # Cmpt_Depth 的 _order 来自全局的计数，在前面增删物件都会使其改变，所以不直接参与计算，
+        # 而是只记录可见物件之间的先后关系
+        orders = [item.depth._order for item in visible_items]
+        md5.update(repr(sorted(range(len(orders)), key=orders.__getitem__)).encode())
+
+        # 遍历过程中 stacks 可能会因 ApplyAligner 而增长
+        for stack in stacks:
+            # 按添加的次序计入与 [t0, t1] 重叠的区段，只有落在范围内的部分才会影响结果
+            nodes = stack.anims.overlap(t0, math.nextafter(t1, math.inf))
+            nodes.sort(key=lambda node: node.seq)
+            for node in nodes:
+                md5.update(f'{max(node.begin, t0)},{min(node.end, t1)}'.encode())
+                anim = node.value
+                md5.update(self.digest_anim(anim))
+                if isinstance(anim, ApplyAligner):
+                    for other in anim.stacks:
+                        add_stack(other)
+
+        for rcc in timeline.additional_render_calls_callbacks:
+            at, end = rcc.t_range.at, rcc.t_range.end
+            if at > t1 or (end is not FOREVER and end <= t0):
+                continue
+            md5.update(f'{at},{end}'.encode())
+            md5.update(self.digest(rcc.func, 0))
+
+    @staticmethod
+    def _clip_visibility(visibility: list[float], t0: float, t1: float) -> list | None:
+        '''
+        得到 ``visibility`` 在 ``[t0, t1]`` 内的部分，范围之外的时间点以 ``None`` 表示；
+        若在该范围内不可见则返回 ``None``
+        '''
+        ranges = []
+        for i in range(0, len(visibility), 2):
+            at = visibility[i]
+            end = visibility[i + 1] if i + 1 < len(visibility) else math.inf
+            if at > t1 or end <= t0:
+                continue
+            ranges.append((at if at > t0 else None, end if end <= t1 else None))
+        return ranges or None
+
+    def digest_anim(self, anim: ItemAnimation) -> bytes:
+        '''
+        计算动画的摘要，不包括其所作用的物件本身（物件的数据由 :class:`~.Display` 记录）
+        '''
+        key = id(anim)
+        if key not in self.memo:
+            md5 = hashlib.md5(anim.__class__.__qualname__.encode())
+            for name, value in vars(anim).items():
+                # Display.data 只是用于计算的临时对象，其数据由 data_orig 决定
+                if name == 'data' and isinstance(anim, Display):
+                    continue
+                if name == 'item' or name in self.SKIPPED_ATTRS:
+                    continue
+                md5.update(name.encode())
+                md5.update(self.digest(value, 0))
+            self.memo[key] = md5.digest()
+        return self.memo[key]
+
+    def digest(self, obj, depth: int) -> bytes:
+        '''
+        递归地计算 ``obj`` 的摘要
+        '''
+        if obj is None or isinstance(obj, (bool, int, float, complex, str, enum.Enum)) or obj is FOREVER:
+            return repr(obj).encode()
+        if isinstance(obj, bytes):
+            return obj
+        if isinstance(obj, type):
+            return f'{obj.__module__}.{obj.__qualname__}'.encode()
+        if isinstance(obj, self.OPAQUE_TYPES):
+            return obj.__class__.__qualname__.encode()
+
+        key = id(obj)
+        if key in self.memo:
+            ret = self.memo[key]
+            if ret is None:
+                raise _UnknownFingerprint()
+            return ret
+        if key in self.visiting:
+            return b'<cycle>'
+        if depth > self.MAX_DEPTH:
+            raise _UnknownFingerprint()
+
+        self.visiting.add(key)
+        try:
+            md5 = hashlib.md5(obj.__class__.__qualname__.encode())
+            self._update_by_obj(md5, obj, depth)
+        except _UnknownFingerprint:
+            # 记录下来，使得之后遇到该对象时不必再次递归
+            self.memo[key] = None
+            raise
+        finally:
+            self.visiting.remove(key)
+
+        self.memo[key] = ret = md5.digest()
+        return ret
+
+    def _update_by_obj(self, md5, obj, depth: int) -> None:
+        match obj:
+            case np.ndarray():
+                md5.update(f'{obj.dtype.str}{obj.shape}'.encode())
+                md5.update(np.ascontiguousarray(obj).tobytes())
+            case Cmpt_Depth():
+                md5.update(repr(obj._depth).encode())
+            case Array():
+                md5.update(self.digest(obj.data, depth))
+            case Image.Image():
+                md5.update(f'{obj.mode}{obj.size}'.encode())
+                md5.update(obj.tobytes())
+            case BuiltTimeline():
+                self.update_by_timeline(md5, obj, -math.inf, math.inf)
+            case types.FunctionType():
+                md5.update(obj.__qualname__.encode())
+                md5.update(self.digest(obj.__code__, depth))
+                md5.update(self.digest(obj.__defaults__, depth + 1))
+                md5.update(self.digest(obj.__kwdefaults__, depth + 1))
+                for cell in obj.__closure__ or ():
+                    try:
+                        value = cell.cell_contents
+                    except ValueError:  # 尚未赋值的闭包变量
+                        value = None
+                    md5.update(self.digest(value, depth + 1))
+                for name in sorted(self._get_code_names(obj.__code__)):
+                    if name in obj.__globals__:
+                        md5.update(name.encode())
+                        md5.update(self.digest(obj.__globals__[name], depth + 1))
+            case functools.partial():
+                md5.update(self.digest(obj.func, depth))
+                md5.update(self.digest(obj.args, depth + 1))
+                md5.update(self.digest(obj.keywords, depth + 1))
+            case types.MethodType():
+                md5.update(self.digest(obj.__func__, depth))
+                md5.update(self.digest(obj.__self__, depth + 1))
+            case types.CodeType():
+                md5.update(obj.co_code)
+                md5.update(repr(obj.co_names).encode())
+                for const in obj.co_consts:
+                    md5.update(self.digest(const, depth))
+            case list() | tuple():
+                for value in obj:
+                    md5.update(self.digest(value, depth + 1))
+            case set() | frozenset():
+                for digest in sorted(self.digest(value, depth + 1) for value in obj):
+                    md5.update(digest)
+            case dict():
+                for name, value in obj.items():
+                    md5.update(self.digest(name, depth + 1))
+                    md5.update(self.digest(value, depth + 1))
+            case _:
+                self._update_by_attrs(md5, obj, depth)
+
+    @staticmethod
+    def _get_code_names(code: types.CodeType) -> set[str]:
+        '''
+        得到 ``code`` 以及其中嵌套的代码（例如 ``lambda`` 和推导式）所引用的名称
+        '''
+        names = set(code.co_names)
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                names |= SegmentFingerprinter._get_code_names(const)
+        return names
+
+    def _update_by_attrs(self, md5, obj, depth: int) -> None:
+        if hasattr(obj, '__dict__'):
+            items = vars(obj).items()
+        else:
+            items = [
+                (name, getattr(obj, name))
+                for cls in type(obj).__mro__
+                for name in getattr(cls, '__slots__', ())
+                if hasattr(obj, name)
+            ]
+
+        for name, value in items:
+            if name in self.SKIPPED_ATTRS or name.endswith('signal_obj_slots'):
+                continue
+            # 动画所作用的物件在动画开始前的数据已由其 AnimStack 中的 Display 记录，
+            # 而这里引用的是物件在构建结束时的状态，不应当参与计算
+            if name == 'item' and isinstance(obj, Animation):
+                continue
+            md5.update(name.encode())
+            md5.update(self.digest(value, depth + 1))
+
+        # 物件之间的关系只记录数量，子物件自身的数据由它们各自的 AnimStack 记录
+        stored_children = getattr(obj, 'stored_children', None)
+        if isinstance(stored_children, list):
+            md5.update(f'children={len(stored_children)}'.encode())
+
+
+class SegmentManifest:
+    '''
+    记录分段输出时已经完成的片段以及它们的指纹，用于中断后继续输出以及增量输出
+
+    存储于片段所在的文件夹中，``key`` 不一致时（参考 :func:`compute_segments_key`）认为先前的记录全部失效
+    '''
+    def __init__(self, directory: str, key: str):
+        self.directory = directory
+        self.key = key
+        self.segments: dict[str, tuple[int, int, str | None]] = {}
+
+    @property
+    def file_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST_FILENAME)
+
+    @staticmethod
+    def load(directory: str, key: str) -> SegmentManifest:
+        '''
+        读取 ``directory`` 中的记录，如果不存在或者 ``key`` 不一致，则返回空的记录
+        '''
+        manifest = SegmentManifest(directory, key)
+
+        try:
+            with open(manifest.file_path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('key') != key:
+                return manifest
+            manifest.segments = {
+                filename: (begin, end, fingerprint)
+                for filename, (begin, end, fingerprint) in data['segments'].items()
+            }
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+
+        return manifest
+
+    def save(self) -> None:
+        with atomic_write(self.file_path) as temp_path:
+            with open(temp_path, 'wt', encoding='utf-8') as f:
+                json.dump(dict(key=self.key, segments=self.segments), f, indent=4)
+
+    def is_valid(self, filename: str, begin: int, end: int, fingerprint: str | None) -> bool:
+        '''
+        文件名为 ``filename`` 的片段是否已经完成输出，并且帧区间为 ``[begin, end)``、指纹为 ``fingerprint``
+
+        指纹未知（``None``）时总是返回 ``False``
+        '''
+        return fingerprint is not None \
+            and self.segments.get(filename) == (begin, end, fingerprint) \
+            and os.path.exists(os.path.join(self.directory, filename))
+
+    def add(self, filename: str, begin: int, end: int, fingerprint: str | None) -> None:
+        '''
+        记录已经完成输出的片段，并立即保存
+        '''
+        self.segments[filename] = (begin, end, fingerprint)
+        self.save()
+
+    def remove_unused(self, used: Collection[str], ext: str) -> None:
+        '''
+        删除文件夹中不在 ``used`` 中的片段文件（包括记录失效的以及未完成的）以及遗留的临时文件，并更新记录
+
+        只会删除文件名形如 ``00000000{ext}`` 的片段文件、``00000000_temp{ext}`` 的未完成片段
+        （参考 :meth:`~.VideoWriter.write_segment`）以及 ``.tmp`` 结尾的临时文件，其它文件和文件夹不受影响
+        '''
+        segment_pattern = re.compile(r'\d{8}(_temp)?' + re.escape(ext))
+        for filename in os.listdir(self.directory):
+            if filename in used:
+                continue
+            if not segment_pattern.fullmatch(filename) and not filename.endswith('.tmp'):
+                continue
+            path = os.path.join(self.directory, filename)
+            if os.path.isfile(path) and not os.path.islink(path):
+                os.remove(path)
+
+        self.segments = {
+            filename: info
+            for filename, info in self.segments.items()
+            if filename in used
+        }
+        self.save()
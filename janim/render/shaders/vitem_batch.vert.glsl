@@ -0,0 +1,28 @@
+#version 430 core
+
+in vec4 in_clip;        // (min_x, min_y, max_x, max_y)
+in vec4 in_glow_color;
+in float in_glow_size;
+in ivec4 in_info;       // (point_offset, point_count, anchor_offset, flags)
+
+out vec2 v_coord;
+flat out ivec4 v_info;
+flat out vec4 v_glow_color;
+flat out float v_glow_size;
+
+uniform vec2 JA_FRAME_RADIUS;
+
+void main()
+{
+    // 依次为 左下、左上、右下、右上，与 TRIANGLE_STRIP 的顶点顺序对应
+    vec2 coord = vec2(
+        (gl_VertexID & 2) == 0 ? in_clip.x : in_clip.z,
+        (gl_VertexID & 1) == 0 ? in_clip.y : in_clip.w
+    );
+    gl_Position = vec4(coord, 0.0, 1.0);
+
+    v_coord = coord * JA_FRAME_RADIUS;
+    v_info = in_info;
+    v_glow_color = in_glow_color;
+    v_glow_size = in_glow_size;
+}
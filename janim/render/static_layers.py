@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from typing import Callable
+
+import moderngl as mgl
+
+from janim.render.base import DEFAULT_BLEND_EQUATION, DEFAULT_BLEND_FUNC
+from janim.render.framebuffer import framebuffer_context
+from janim.render.program import get_program_from_string
+from janim.utils.config import Config
+
+# 一组连续的静态物件至少要有这么多个，才会缓存为图层
+MIN_STATIC_LAYER_ITEMS = 2
+# 每个上下文最多缓存的图层数量，每个图层会占用一个与画面大小相同的纹理
+MAX_STATIC_LAYERS = 4
+
+# 绘制到图层时使用的混合方式
+# 颜色分量与默认的相同；透明度分量则累计为 1 - Π(1 - a)
+# 使得图层中记录的是“预乘透明度的颜色”以及“背景被遮挡的比例”
+LAYER_BLEND_FUNC = (
+    mgl.SRC_ALPHA, mgl.ONE_MINUS_SRC_ALPHA,
+    mgl.ONE, mgl.ONE_MINUS_SRC_ALPHA
+)
+LAYER_BLEND_EQUATION = (mgl.FUNC_ADD, mgl.FUNC_ADD)
+
+# 将图层合成到画面时使用的混合方式，也就是 C = P + D * (1 - A)
+COMPOSITE_BLEND_FUNC = (
+    mgl.ONE, mgl.ONE_MINUS_SRC_ALPHA,
+    mgl.ONE, mgl.ONE
+)
+
+vertex_shader = '''
+#version 330 core
+
+out vec2 v_texcoord;
+
+void main()
+{
+    // 依次为 左下、左上、右下、右上，使用 TRIANGLE_STRIP 覆盖整个画面
+    v_texcoord = vec2((gl_VertexID & 2) >> 1, gl_VertexID & 1);
+    gl_Position = vec4(v_texcoord * 2.0 - 1.0, 0.0, 1.0);
+}
+'''
+
+fragment_shader = '''
+#version 330 core
+
+in vec2 v_texcoord;
+
+out vec4 f_color;
+
+uniform sampler2D layer;
+
+void main()
+{
+    f_color = texture(layer, v_texcoord);
+}
+'''
+
+
+class StaticLayer:
+    '''
+    缓存的一个图层，以及用于判断其是否仍然有效的 ``key``
+    '''
+    def __init__(self, ctx: mgl.Context, pw: int, ph: int):
+        # 使用半精度浮点数，避免多次混合后合成时的误差
+        self.fbo = ctx.framebuffer(color_attachments=ctx.texture((pw, ph), components=4, dtype='f2'))
+        self.key: list | None = None
+
+    def is_valid(self, key: list) -> bool:
+        return self.key is not None \
+            and len(self.key) == len(key) \
+            and all(a is b for a, b in zip(self.key, key))
+
+    def release(self) -> None:
+        self.fbo.color_attachments[0].release()
+        self.fbo.release()
+
+
+class StaticLayerCache:
+    '''
+    将不随时间变化的连续物件绘制到缓存的图层中，之后的帧中若这些物件没有变化，则直接合成该图层，而不重新绘制这些物件
+
+    图层中记录的是预乘透明度的颜色 P 以及背景被遮挡的比例 A，合成时得到 ``P + D * (1 - A)``，
+    这与直接将这些物件依次绘制在画面 D 上的结果相同（画面的透明度分量除外，所以只在开启混合时使用）
+
+    由于直接绘制时每次混合的结果都会被舍入到 8 位，两者的颜色可能会有 1~2 的差异
+
+    参考 :meth:`~.BuiltTimeline.render_all`
+    '''
+    def __init__(self, ctx: mgl.Context):
+        self.ctx = ctx
+        self.layers: list[StaticLayer] = []
+
+        self.prog = get_program_from_string(vertex_shader, fragment_shader, cache_key='static_layer')
+        self.prog['layer'] = 0
+        self.vao = ctx.vertex_array(self.prog, [])
+
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, index: int, key: list, draw: Callable[[], None]) -> None:
+        '''
+        使用第 ``index`` 个图层：若 ``key`` 与图层记录的不同，则调用 ``draw`` 重新绘制该图层；
+        然后将图层合成到当前的画面上
+
+        ``key`` 中的元素逐个使用 ``is`` 进行比较
+        '''
+        pw, ph = Config.get.pixel_width, Config.get.pixel_height
+
+        while len(self.layers) <= index:
+            self.layers.append(StaticLayer(self.ctx, pw, ph))
+        layer = self.layers[index]
+
+        if layer.fbo.size != (pw, ph):
+            layer.release()
+            layer = self.layers[index] = StaticLayer(self.ctx, pw, ph)
+
+        if layer.is_valid(key):
+            self.hits += 1
+        else:
+            self.misses += 1
+            with framebuffer_context(layer.fbo):
+                layer.fbo.clear(0, 0, 0, 0)
+                self.ctx.blend_func = LAYER_BLEND_FUNC
+                self.ctx.blend_equation = LAYER_BLEND_EQUATION
+                try:
+                    draw()
+                finally:
+                    self.ctx.blend_func = DEFAULT_BLEND_FUNC
+                    self.ctx.blend_equation = DEFAULT_BLEND_EQUATION
+            layer.key = key
+
+        layer.fbo.color_attachments[0].use(0)
+        self.ctx.blend_func = COMPOSITE_BLEND_FUNC
+        try:
+            self.vao.render(mgl.TRIANGLE_STRIP, vertices=4)
+        finally:
+            self.ctx.blend_func = DEFAULT_BLEND_FUNC
+
+    def release(self) -> None:
+        for layer in self.layers:
+            layer.release()
+        self.layers.clear()
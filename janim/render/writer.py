@@ -1,24 +1,43 @@
+from __future__ import annotations
+
+import ctypes
+import importlib.util
+import inspect
+import math
+import multiprocessing as mp
 import os
 import shutil
 import subprocess as sp
+import tempfile
 import time
+import traceback
 from contextlib import contextmanager
-from functools import partial
-from typing import Generator
+from dataclasses import dataclass
+from queue import Empty
+from typing import IO, Any, Callable, Generator
 
+import attrs
 import OpenGL.GL as gl
+from colour import Color
 from tqdm import tqdm as ProgressDisplay
 
 from janim.anims.timeline import BuiltTimeline, Timeline, TimeRange
-from janim.exception import EXITCODE_FFMPEG_NOT_FOUND, ExitException
+from janim.exception import (EXITCODE_FFMPEG_ERROR, EXITCODE_FFMPEG_NOT_FOUND,
+                             EXITCODE_PARALLEL_RENDER_ERROR, ExitException)
 from janim.locale.i18n import get_local_strings
 from janim.logger import log
-from janim.render.base import create_context
+from janim.render.base import create_context, programs_map
+from janim.render.frame_queue import FrameQueue, FrameStats
 from janim.render.framebuffer import create_framebuffer, framebuffer_context
+from janim.utils.config import Config, cli_config
+from janim.utils.file_ops import guarantee_existence
+from janim.utils.profiler import enable_profiling, get_profiler
 
 _ = get_local_strings('writer')
 
 PBO_COUNT = 3
+# AudioWriter 每次向 ffmpeg 写入的采样点数量
+AUDIO_WRITE_BLOCK_SAMPLES = 1 << 16
 
 
 class VideoWriter:
@@ -33,6 +52,10 @@ class VideoWriter:
     - 然后遍历动画的每一帧，进行渲染，并将像素数据传递给 ffmpeg
     - 最后结束 ffmpeg 的调用，完成 _temp 文件的输出
     - 将 _temp 文件改名，删去 "_temp" 后缀，完成视频输出
+
+    当 ``workers > 1`` 时，会将帧区间划分为连续的若干段交由多个进程分别渲染，详见 :meth:`write_all_parallel`
+
+    指定 ``segment_duration`` 时，会按固定时长分段输出，中断后可以继续，详见 :meth:`write_all_segmented`
     '''
     def __init__(self, built: BuiltTimeline):
         self.built = built
@@ -48,6 +71,9 @@ class VideoWriter:
         # PBO 相关初始化
         self.byte_size = pw * ph * 4  # 每帧的字节大小 (RGBA)
 
+        # 各个阶段的耗时统计，参考 write_frames
+        self.stats = FrameStats()
+
     def _init_pbos(self) -> None:
         '''初始化PBO缓冲区'''
         self.pbos = gl.glGenBuffers(PBO_COUNT)
@@ -59,10 +85,11 @@ class VideoWriter:
 
         gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)  # 解绑PBO
 
-    def _read_idx_iter(self) -> Generator[int | None, None, None]:
+    @staticmethod
+    def _read_idx_iter(frame_count: int) -> Generator[int | None, None, None]:
         for _ in range(PBO_COUNT - 1):
             yield None
-        for frame_idx in range(self.frame_count):
+        for frame_idx in range(frame_count):
             yield frame_idx % PBO_COUNT
 
     def _cleanup_pbos(self) -> None:
@@ -71,91 +98,69 @@ class VideoWriter:
         gl.glDeleteBuffers(len(self.pbos), self.pbos)
 
     @staticmethod
-    def writes(built: BuiltTimeline, file_path: str, *, quiet=False, use_pbo=True, hwaccel=False) -> None:
-        VideoWriter(built).write_all(file_path, quiet=quiet, use_pbo=use_pbo, hwaccel=hwaccel)
-
-    def write_all(self, file_path: str, *, quiet=False, use_pbo=True, hwaccel=False, _keep_temp=False) -> None:
+    def writes(
+        built: BuiltTimeline,
+        file_path: str,
+        *,
+        quiet=False,
+        use_pbo=True,
+        hwaccel=False,
+        workers: int = 1,
+        segment_duration: float | None = None
+    ) -> None:
+        VideoWriter(built).write_all(file_path,
+                                     quiet=quiet,
+                                     use_pbo=use_pbo,
+                                     hwaccel=hwaccel,
+                                     workers=workers,
+                                     segment_duration=segment_duration)
+
+    def write_all(
+        self,
+        file_path: str,
+        *,
+        quiet=False,
+        use_pbo=True,
+        hwaccel=False,
+        workers: int = 1,
+        segment_duration: float | None = None,
+        _keep_temp=False
+    ) -> None:
         '''将时间轴动画输出到文件中
 
         - 指定 ``quiet=True``，则不会输出前后的提示信息，但仍有进度条
+        - 指定 ``workers`` 大于 1 时，使用多个进程并行渲染，详见 :meth:`write_all_parallel`
+        - 指定 ``segment_duration`` 时，按该时长分段输出，中断后可以继续，详见 :meth:`write_all_segmented`
         '''
         name = self.built.timeline.__class__.__name__
         if not quiet:
             log.info(_('Writing video "{name}"').format(name=name))
             t = time.time()
 
-        fps = self.built.cfg.fps
-
-        self.open_video_pipe(file_path, hwaccel)
-
-        progress_display = ProgressDisplay(
-            range(self.frame_count),
-            leave=False,
-            dynamic_ncols=True
-        )
-
-        rgb = self.built.cfg.background_color.rgb
-
-        transparent = self.ext == '.mov'
-
-        if use_pbo:
-            self._init_pbos()
-
-            # 使用PBO优化的渲染循环
-            with framebuffer_context(self.fbo):
-                read_idx_iter = self._read_idx_iter()
-                for frame_idx, read_idx in zip(progress_display, read_idx_iter):
-                    # 渲染当前帧
-                    self.fbo.clear(*rgb, not transparent)
-                    if transparent:
-                        gl.glFlush()
-                    self.built.render_all(self.ctx, frame_idx / fps, blend_on=not transparent)
-
-                    # 绑定当前PBO来存储新帧
-                    gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.pbos[frame_idx % PBO_COUNT])
-                    # 注意: 当PBO绑定时，最后一个参数是偏移量而不是指针
-                    gl.glReadPixels(0, 0, self.built.cfg.pixel_width, self.built.cfg.pixel_height,
-                                    gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, 0)
-
-                    # 如果不是第一批，处理上一批的数据
-                    if read_idx is not None:
-                        # 绑定对应的PBO，用于读取数据
-                        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.pbos[read_idx])
+        if segment_duration is not None and os.path.splitext(file_path)[1] == '.gif':
+            log.warning(_('Segmented output does not support GIF, the whole video will be written at once'))
+            segment_duration = None
 
-                        # 使用numpy从映射的内存中读取数据
-                        ptr = gl.glMapBuffer(gl.GL_PIXEL_PACK_BUFFER, gl.GL_READ_ONLY)
-                        assert ptr
-                        data = gl.ctypes.string_at(ptr, self.byte_size)
-                        # 写入数据到ffmpeg
-                        self.writing_process.stdin.write(data)
-                        gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+        workers = min(workers, self.frame_count)
 
-                # 处理最后一批
-                for read_idx in read_idx_iter:
-                    # 在大多数情况下 read_idx 并不是 None
-                    # 只有在 Timeline 时长特别短的时候会出现 None
-                    if read_idx is None:
-                        continue
-                    gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.pbos[read_idx])
-                    data = gl.glGetBufferSubData(gl.GL_PIXEL_PACK_BUFFER, 0, self.byte_size)
-                    self.writing_process.stdin.write(data)
-
-            self._cleanup_pbos()
+        if segment_duration is not None:
+            self.write_all_segmented(file_path, segment_duration, workers=workers, use_pbo=use_pbo, hwaccel=hwaccel)
+        elif workers > 1:
+            self.write_all_parallel(file_path, workers, use_pbo=use_pbo, hwaccel=hwaccel)
         else:
-            # 原始渲染循环（不使用PBO）
-            with framebuffer_context(self.fbo):
-                for frame in progress_display:
-                    self.fbo.clear(*rgb, not transparent)
-                    # 在输出 mov 时，framebuffer 是透明的
-                    # 为了颜色能被正确渲染到透明 framebuffer 上
-                    # 这里需要禁用自带 blending 的并使用 shader 里自定义的 blending（参考 program.py 的 injection_ja_finish_up）
-                    # 但是 shader 里的 blending 依赖 framebuffer 信息
-                    # 所以这里需要使用 glFlush 更新 framebuffer 信息使得正确渲染
-                    if transparent:
-                        gl.glFlush()
-                    self.built.render_all(self.ctx, frame / fps, blend_on=not transparent)
-                    bytes = self.fbo.read(components=4)
-                    self.writing_process.stdin.write(bytes)
+            self.open_video_pipe(file_path, hwaccel)
+
+            progress_display = ProgressDisplay(
+                total=self.frame_count,
+                leave=False,
+                dynamic_ncols=True
+            )
+            self.write_frames(range(self.frame_count),
+                              self.writing_process.stdin,
+                              use_pbo=use_pbo,
+                              transparent=self.ext == '.mov',
+                              on_progress=progress_display.update)
+            progress_display.close()
 
         self.close_video_pipe(_keep_temp)
 
@@ -164,6 +169,11 @@ class VideoWriter:
                 _('Finished writing video "{name}" in {elapsed:.2f} s')
                 .format(name=name, elapsed=time.time() - t)
             )
+            if self.stats.frames != 0:
+                log.debug(_('Time spent on each stage: {stats}').format(stats=self.stats.format()))
+            buffer_pool = programs_map[self.ctx].buffer_pool
+            if buffer_pool.hits + buffer_pool.misses != 0:
+                log.debug(_('GPU buffer pool: {stats}').format(stats=buffer_pool.format()))
 
             if not _keep_temp:
                 log.info(
@@ -171,41 +181,444 @@ class VideoWriter:
                     .format(file_path=file_path)
                 )
 
-    def open_video_pipe(self, file_path: str, hwaccel: bool) -> None:
-        stem, self.ext = os.path.splitext(file_path)
-        self.final_file_path = file_path
-        self.temp_file_path = stem + '_temp' + self.ext
+    def write_frames(
+        self,
+        frames: range,
+        stdin: IO[bytes],
+        *,
+        use_pbo: bool,
+        transparent: bool,
+        on_progress: Callable[[int], Any] | None = None
+    ) -> None:
+        '''
+        渲染 ``frames`` 中的每一帧，并将 RGBA 像素数据依次写入 ``stdin``
+
+        写入是由 :class:`~.FrameQueue` 在单独的线程中进行的，因此渲染与 ffmpeg 的编码可以同时进行；
+        各个阶段的耗时会累计到 ``self.stats`` 中
+
+        每提交一帧调用一次 ``on_progress(1)``
+        '''
+        fps = self.built.cfg.fps
+        rgb = self.built.cfg.background_color.rgb
+        stats = self.stats
+
+        def render(frame: int) -> None:
+            self.fbo.clear(*rgb, not transparent)
+            # 在输出 mov 时，framebuffer 是透明的
+            # 为了颜色能被正确渲染到透明 framebuffer 上
+            # 这里需要禁用自带 blending 的并使用 shader 里自定义的 blending（参考 program.py 的 injection_ja_finish_up）
+            # 但是 shader 里的 blending 依赖 framebuffer 信息
+            # 所以这里需要使用 glFlush 更新 framebuffer 信息使得正确渲染
+            if transparent:
+                gl.glFlush()
+            self.built.render_all(self.ctx, frame / fps, blend_on=not transparent)
+
+        def submit(frame_queue: FrameQueue, buffer: bytearray) -> None:
+            frame_queue.submit(buffer)
+            if on_progress is not None:
+                on_progress(1)
+
+        with FrameQueue(stdin, self.byte_size, stats=stats) as frame_queue:
+            if use_pbo:
+                self._init_pbos()
+
+                def read_pbo(read_idx: int) -> None:
+                    buffer = frame_queue.acquire()
+                    with stats.timing('readback'):
+                        # 绑定对应的PBO，用于读取数据
+                        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.pbos[read_idx])
+                        # 将映射的内存直接拷贝到缓冲区中，不产生中间的 bytes 对象
+                        ptr = gl.glMapBuffer(gl.GL_PIXEL_PACK_BUFFER, gl.GL_READ_ONLY)
+                        assert ptr
+                        ctypes.memmove(frame_queue.address_of(buffer), ptr, self.byte_size)
+                        gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+                    submit(frame_queue, buffer)
+
+                # 使用PBO优化的渲染循环
+                with framebuffer_context(self.fbo):
+                    read_idx_iter = self._read_idx_iter(len(frames))
+                    for i, (frame, read_idx) in enumerate(zip(frames, read_idx_iter)):
+                        with stats.timing('render'):
+                            # 渲染当前帧
+                            render(frame)
+
+                            # 绑定当前PBO来存储新帧
+                            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.pbos[i % PBO_COUNT])
+                            # 注意: 当PBO绑定时，最后一个参数是偏移量而不是指针
+                            gl.glReadPixels(0, 0, self.built.cfg.pixel_width, self.built.cfg.pixel_height,
+                                            gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, 0)
+
+                        # 如果不是第一批，处理上一批的数据
+                        if read_idx is not None:
+                            read_pbo(read_idx)
+
+                    # 处理最后一批
+                    for read_idx in read_idx_iter:
+                        # 在大多数情况下 read_idx 并不是 None
+                        # 只有在 Timeline 时长特别短的时候会出现 None
+                        if read_idx is None:
+                            continue
+                        read_pbo(read_idx)
+
+                self._cleanup_pbos()
+            else:
+                # 原始渲染循环（不使用PBO）
+                with framebuffer_context(self.fbo):
+                    for frame in frames:
+                        with stats.timing('render'):
+                            render(frame)
+                        buffer = frame_queue.acquire()
+                        with stats.timing('readback'):
+                            self.fbo.read_into(buffer, components=4)
+                        submit(frame_queue, buffer)
+
+    # region segments
+
+    def write_segment(
+        self,
+        frames: range,
+        segment_path: str,
+        output_args: list[str],
+        *,
+        use_pbo: bool,
+        transparent: bool,
+        on_progress: Callable[[int], Any] | None = None
+    ) -> None:
+        '''
+        渲染 ``frames`` 中的帧，并以 ``output_args`` 作为 ffmpeg 的输出参数编码到 ``segment_path``
+
+        会先输出到临时文件，完成后才改名为 ``segment_path``，因此中途被打断时不会留下不完整的片段
+        '''
+        stem, ext = os.path.splitext(segment_path)
+        temp_path = stem + '_temp' + ext
 
         command = [
             self.built.cfg.ffmpeg_bin,
-            '-y',   # overwrite output file if it exists
+            '-y',
+            *self.rawvideo_input_args(),
+            *output_args,
+            '-loglevel', 'error',
+            temp_path
+        ]
+        with self.handle_ffmpeg_not_found():
+            process = sp.Popen(command, stdin=sp.PIPE)
+
+        self.write_frames(frames, process.stdin, use_pbo=use_pbo, transparent=transparent, on_progress=on_progress)
+
+        process.stdin.close()
+        if process.wait() != 0:
+            log.error(_('ffmpeg exited with code {code}').format(code=process.returncode))
+            raise ExitException(EXITCODE_FFMPEG_ERROR)
+
+        os.replace(temp_path, segment_path)
+
+    def write_segments_by_workers(
+        self,
+        jobs: list[tuple[int, int, str]],
+        workers: int,
+        output_args: list[str],
+        *,
+        use_pbo: bool,
+        transparent: bool,
+        on_segment_finished: Callable[[int, int, str], Any] | None = None
+    ) -> None:
+        '''
+        使用 ``workers`` 个进程输出 ``jobs`` 中的各个片段，``jobs`` 的每个元素为 ``(begin, end, segment_path)``
+
+        片段按顺序轮流分配给各个进程；每完成一个片段，会在主进程中调用 ``on_segment_finished(begin, end, segment_path)``
+
+        .. note::
+
+            子进程是通过重新执行 :meth:`~.Timeline.construct` 得到动画的，
+            因此 :meth:`~.Timeline.construct` 需要是确定性的（例如使用随机数时需要固定种子），
+            并且该 :class:`~.Timeline` 需要定义在能够通过文件重新导入的模块中
+        '''
+        workers = min(workers, len(jobs))
+        spec = _TimelineSpec.from_built(self.built)
+
+        mp_ctx = mp.get_context('spawn')
+        queue = mp_ctx.Queue()
+
+        processes = [
+            mp_ctx.Process(target=_write_segments_worker,
+                           args=(spec, jobs[i::workers], output_args, use_pbo, transparent, queue),
+                           daemon=True)
+            for i in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        progress_display = ProgressDisplay(
+            total=sum(end - begin for begin, end, _ in jobs),
+            leave=False,
+            dynamic_ncols=True
+        )
+
+        remaining = workers
+        error: str | None = None
+        try:
+            while remaining:
+                try:
+                    kind, value = queue.get(timeout=1)
+                except Empty:
+                    # 子进程被强制结束（例如内存不足、段错误、SIGKILL）时不会发送 'error' 或 'done'，
+                    # 因此需要检查子进程的退出码，以免一直等待下去
+                    crashed = [
+                        (i, process.exitcode)
+                        for i, process in enumerate(processes)
+                        if process.exitcode not in (None, 0)
+                    ]
+                    if crashed:
+                        error = '\n'.join(
+                            _('Worker process {index} exited unexpectedly with code {code}')
+                            .format(index=i, code=code)
+                            for i, code in crashed
+                        )
+                        break
+                    continue
+
+                if kind == 'progress':
+                    progress_display.update(value)
+                elif kind == 'segment':
+                    if on_segment_finished is not None:
+                        on_segment_finished(*value)
+                elif kind == 'stats':
+                    self.stats.merge(value)
+                elif kind == 'profile':
+                    get_profiler().merge(value)
+                elif kind == 'done':
+                    remaining -= 1
+                else:   # kind == 'error'
+                    error = value
+                    break
+        finally:
+            progress_display.close()
+            if remaining:
+                for process in processes:
+                    process.terminate()
+            for process in processes:
+                process.join()
+
+        if error is not None:
+            log.error(_('Failed to render video in parallel:\n{error}').format(error=error))
+            raise ExitException(EXITCODE_PARALLEL_RENDER_ERROR)
+
+    def write_all_parallel(self, file_path: str, workers: int, *, use_pbo=True, hwaccel=False) -> None:
+        '''
+        使用 ``workers`` 个进程并行渲染，流程如下：
+
+        - 将帧区间划分为 ``workers`` 个连续的区段
+        - 每个子进程重新导入定义了该 :class:`~.Timeline` 的模块并重新构建，使用各自独立的 OpenGL 上下文渲染所分配的区段，
+          并以无损的 FFV1 编码输出为中间片段
+        - 所有片段完成后，使用 ffmpeg 的 concat 将其依次拼接，并以与串行输出完全相同的参数进行最终编码
+
+        因为最终编码器接收到的像素数据与串行输出时逐位一致，所以输出的文件与串行输出的结果相同
+
+        另见 :meth:`write_segments_by_workers`
+        '''
+        cfg = self.built.cfg
+
+        # 将帧区间划分为连续的若干段，前面的区段会比后面的多分配至多一帧
+        size, rest = divmod(self.frame_count, workers)
+        bounds = [0]
+        for i in range(workers):
+            bounds.append(bounds[-1] + size + (1 if i < rest else 0))
+
+        with tempfile.TemporaryDirectory(dir=guarantee_existence(os.path.join(cfg.temp_dir, 'segments'))) as tempdir:
+            jobs = [
+                (bounds[i], bounds[i + 1], os.path.join(tempdir, f'{i:04d}.nut'))
+                for i in range(workers)
+            ]
+            self.write_segments_by_workers(jobs,
+                                           workers,
+                                           ['-an', '-vcodec', 'ffv1'],
+                                           use_pbo=use_pbo,
+                                           transparent=os.path.splitext(file_path)[1] == '.mov')
+
+            list_path = self.write_concat_list(tempdir, [path for _, _, path in jobs])
+            self.open_video_pipe(file_path,
+                                 hwaccel,
+                                 input_args=['-r', str(cfg.fps), '-f', 'concat', '-safe', '0', '-i', list_path])
+            # 等待最终编码完成后才能删除临时目录中的片段
+            self.writing_process.wait()
+
+    def write_all_segmented(
+        self,
+        file_path: str,
+        segment_duration: float,
+        *,
+        workers: int = 1,
+        use_pbo=True,
+        hwaccel=False
+    ) -> None:
+        '''
+        按 ``segment_duration`` 秒的时长分段输出，流程如下：
+
+        - 将帧区间划分为固定长度的片段，每个片段单独编码，都以关键帧开始，
+          存储在输出文件旁的 ``<文件名>_segments`` 文件夹中
+        - 每完成一个片段，就记录到该文件夹的 ``manifest.json`` 中（参考 :class:`~.SegmentManifest`）
+        - 每个片段都会计算指纹（参考 :class:`~.SegmentFingerprinter`），与片段一同记录到该文件夹的 ``manifest.json`` 中
+          （参考 :class:`~.SegmentManifest`）
+        - 重新输出时，只渲染缺失的以及指纹发生变化的片段，其余的片段直接复用；
+          这使得输出在中途被打断（例如 ffmpeg 崩溃、内存不足、``Ctrl+C``）后可以继续进行，
+          并且在只修改了一小部分动画时，只需要重新渲染受影响的片段
+        - 所有片段完成后，使用 ffmpeg 的 concat 直接拼接（不重新编码）得到最终的文件
+
+        与 ``workers`` 一同使用时，需要渲染的片段会由多个进程并行渲染，另见 :meth:`write_segments_by_workers`
+        '''
+        from janim.render.segments import (SegmentFingerprinter,
+                                           SegmentManifest,
+                                           compute_segments_key)
+
+        cfg = self.built.cfg
+        stem, ext = os.path.splitext(file_path)
+        transparent = ext == '.mov'
+        output_args = self.video_output_args(ext, hwaccel)
+
+        segment_dir = guarantee_existence(stem + '_segments')
+        manifest = SegmentManifest.load(segment_dir, compute_segments_key(self.built, output_args))
+
+        segment_frames = max(1, round(segment_duration * cfg.fps))
+        fingerprinter = SegmentFingerprinter(self.built)
+        segments = [
+            (begin, end, f'{begin:08d}{ext}', fingerprinter.fingerprint(begin, end))
+            for begin in range(0, self.frame_count, segment_frames)
+            for end in [min(begin + segment_frames, self.frame_count)]
+        ]
+        fingerprints = {filename: fingerprint for _, _, filename, fingerprint in segments}
+        jobs = [
+            (begin, end, os.path.join(segment_dir, filename))
+            for begin, end, filename, fingerprint in segments
+            if not manifest.is_valid(filename, begin, end, fingerprint)
+        ]
+
+        log.info(
+            _('{reused}/{total} segments are reused')
+            .format(reused=len(segments) - len(jobs), total=len(segments))
+        )
+
+        def on_segment_finished(begin: int, end: int, segment_path: str) -> None:
+            filename = os.path.basename(segment_path)
+            manifest.add(filename, begin, end, fingerprints[filename])
+
+        if workers > 1 and len(jobs) > 1:
+            self.write_segments_by_workers(jobs,
+                                           workers,
+                                           output_args,
+                                           use_pbo=use_pbo,
+                                           transparent=transparent,
+                                           on_segment_finished=on_segment_finished)
+        elif jobs:
+            progress_display = ProgressDisplay(
+                total=sum(end - begin for begin, end, _ in jobs),
+                leave=False,
+                dynamic_ncols=True
+            )
+            for begin, end, segment_path in jobs:
+                self.write_segment(range(begin, end),
+                                   segment_path,
+                                   output_args,
+                                   use_pbo=use_pbo,
+                                   transparent=transparent,
+                                   on_progress=progress_display.update)
+                on_segment_finished(begin, end, segment_path)
+            progress_display.close()
+
+        manifest.remove_unused(fingerprints.keys(), ext)
+
+        list_path = self.write_concat_list(cfg.temp_dir, [os.path.join(segment_dir, filename)
+                                                          for filename in fingerprints])
+        self.open_video_pipe(file_path,
+                             hwaccel,
+                             input_args=['-f', 'concat', '-safe', '0', '-i', list_path],
+                             output_args=['-c', 'copy'])
+        self.writing_process.wait()
+        os.remove(list_path)
+
+    @staticmethod
+    def write_concat_list(directory: str, paths: list[str]) -> str:
+        '''
+        生成 ffmpeg 的 concat 所使用的文件列表，返回该列表文件的路径
+        '''
+        fd, list_path = tempfile.mkstemp(suffix='.txt', dir=directory)
+        with open(fd, 'wt', encoding='utf-8') as f:
+            for path in paths:
+                path = os.path.abspath(path).replace('\\', '/').replace("'", "'\\''")
+                f.write(f"file '{path}'\n")
+        return list_path
+
+    # endregion
+
+    def rawvideo_input_args(self) -> list[str]:
+        '''
+        从管道读取 RGBA 像素数据时，ffmpeg 的输入参数
+        '''
+        return [
             '-f', 'rawvideo',
             '-s', f'{self.built.cfg.pixel_width}x{self.built.cfg.pixel_height}',  # size of one frame
             '-pix_fmt', 'rgba',
             '-r', str(self.built.cfg.fps),  # frames per second
             '-i', '-',  # The input comes from a pipe
+        ]
+
+    def video_output_args(self, ext: str, hwaccel: bool) -> list[str]:
+        '''
+        根据输出格式 ``ext`` 得到 ffmpeg 的输出参数
+        '''
+        args = [
             '-vf', 'vflip',
             '-an',  # Tells FFMPEG not to expect any audio
-            '-loglevel', 'error',
         ]
 
-        if self.ext == '.mp4':
-            command += [
+        if ext == '.mp4':
+            args += [
                 '-pix_fmt', 'yuv420p',
                 '-vcodec', self.find_encoder(self.built.cfg.ffmpeg_bin, hwaccel),
             ]
-        elif self.ext == '.mov':
+        elif ext == '.mov':
             # This is if the background of the exported
             # video should be transparent.
-            command += [
+            args += [
                 '-vcodec', 'qtrle',
             ]
-        elif self.ext == '.gif':
+        elif ext == '.gif':
             pass
         else:
             assert False
 
-        command += [self.temp_file_path]
+        return args
+
+    def open_video_pipe(
+        self,
+        file_path: str,
+        hwaccel: bool,
+        *,
+        input_args: list[str] | None = None,
+        output_args: list[str] | None = None
+    ) -> None:
+        '''
+        调用 ffmpeg 进行视频输出
+
+        默认从管道读取 RGBA 像素数据，也可以通过 ``input_args`` 以及 ``output_args`` 指定其它的输入输出方式
+        '''
+        stem, self.ext = os.path.splitext(file_path)
+        self.final_file_path = file_path
+        self.temp_file_path = stem + '_temp' + self.ext
+
+        if input_args is None:
+            input_args = self.rawvideo_input_args()
+        if output_args is None:
+            output_args = self.video_output_args(self.ext, hwaccel)
+
+        command = [
+            self.built.cfg.ffmpeg_bin,
+            '-y',   # overwrite output file if it exists
+            *input_args,
+            *output_args,
+            '-loglevel', 'error',
+            self.temp_file_path
+        ]
+
         with self.handle_ffmpeg_not_found():
             self.writing_process = sp.Popen(command, stdin=sp.PIPE)
 
@@ -259,6 +672,114 @@ class VideoWriter:
             raise ExitException(EXITCODE_FFMPEG_NOT_FOUND)
 
 
+def _config_to_dict(config: Config) -> dict[str, Any]:
+    # Color 对象无法被 pickle，所以转换为字符串传递给子进程
+    return {
+        key: ('color', value.hex_l) if isinstance(value, Color) else ('value', value)
+        for key, value in attrs.asdict(config, recurse=False).items()
+        if value is not None
+    }
+
+
+def _config_from_dict(dct: dict[str, Any]) -> Config:
+    return Config(**{
+        key: Color(value) if kind == 'color' else value
+        for key, (kind, value) in dct.items()
+    })
+
+
+@dataclass
+class _TimelineSpec:
+    '''
+    在子进程中重新构建 :class:`~.Timeline` 所需的信息
+    '''
+    module_name: str
+    file_path: str
+    qualname: str
+    configs: list[dict[str, Any]]
+    cli_config: dict[str, Any]
+    hide_subtitles: bool
+    use_static_layers: bool
+    profile: bool
+
+    @staticmethod
+    def from_built(built: BuiltTimeline) -> _TimelineSpec:
+        timeline = built.timeline
+        cls = timeline.__class__
+        return _TimelineSpec(
+            cls.__module__,
+            os.path.abspath(inspect.getfile(cls)),
+            cls.__qualname__,
+            [_config_to_dict(config) for config in timeline._frozen_config],
+            _config_to_dict(cli_config),
+            timeline.hide_subtitles,
+            built.use_static_layers,
+            get_profiler() is not None
+        )
+
+    def import_module(self):
+        try:
+            spec = importlib.util.find_spec(self.module_name)
+        except (ImportError, ValueError):
+            spec = None
+
+        # 能够正常导入的模块（例如 janim.examples）直接导入，否则与 janim write 相同，从文件载入
+        if spec is not None and spec.origin is not None \
+                and os.path.exists(spec.origin) and os.path.samefile(spec.origin, self.file_path):
+            return importlib.import_module(self.module_name)
+
+        from janim.cli import get_module
+        return get_module(self.file_path)
+
+    def build(self) -> BuiltTimeline:
+        config = _config_from_dict(self.cli_config)
+        for field in attrs.fields(Config):
+            value = getattr(config, field.name)
+            if value is not None:
+                setattr(cli_config, field.name, value)
+
+        obj = self.import_module()
+        for name in self.qualname.split('.'):
+            obj = getattr(obj, name)
+
+        timeline: Timeline = obj()
+        timeline._frozen_config = [_config_from_dict(dct) for dct in self.configs]
+        built = timeline.build(quiet=True, hide_subtitles=self.hide_subtitles)
+        built.use_static_layers = self.use_static_layers
+        return built
+
+
+def _write_segments_worker(
+    spec: _TimelineSpec,
+    jobs: list[tuple[int, int, str]],
+    output_args: list[str],
+    use_pbo: bool,
+    transparent: bool,
+    queue: mp.Queue
+) -> None:
+    '''
+    :meth:`VideoWriter.write_segments_by_workers` 的子进程，依次输出 ``jobs`` 中的各个片段
+    '''
+    try:
+        profiler = enable_profiling() if spec.profile else None
+        writer = VideoWriter(spec.build())
+        for begin, end, segment_path in jobs:
+            writer.write_segment(range(begin, end),
+                                 segment_path,
+                                 output_args,
+                                 use_pbo=use_pbo,
+                                 transparent=transparent,
+                                 on_progress=lambda n: queue.put(('progress', n)))
+            queue.put(('segment', (begin, end, segment_path)))
+        queue.put(('stats', writer.stats))
+        if profiler is not None:
+            queue.put(('profile', profiler))
+    except BaseException:
+        queue.put(('error', traceback.format_exc()))
+    else:
+        queue.put(('done', None))
+
+
 class AudioWriter:
     def __init__(self, built: BuiltTimeline):
         self.built = built
@@ -278,19 +799,21 @@ class AudioWriter:
 
         self.open_audio_pipe(file_path)
 
+        mixdown = self.built.get_audio_mixdown(framerate)
+
+        # 与视频的帧数对应，也就是 round(duration * fps) + 1 帧所覆盖的采样点
+        frame_count = round(self.built.duration * fps) + 1
+        sample_count = math.floor(frame_count / fps * framerate)
+
         progress_display = ProgressDisplay(
-            range(round(self.built.duration * fps) + 1),
+            range(0, sample_count, AUDIO_WRITE_BLOCK_SAMPLES),
             leave=False,
             dynamic_ncols=True
         )
 
-        get_audio_samples = partial(self.built.get_audio_samples_of_frame,
-                                    fps,
-                                    framerate)
-
-        for frame in progress_display:
-            samples = get_audio_samples(frame)
-            self.writing_process.stdin.write(samples.tobytes())
+        for begin in progress_display:
+            end = min(sample_count, begin + AUDIO_WRITE_BLOCK_SAMPLES)
+            self.writing_process.stdin.write(mixdown.samples(begin, end).tobytes())
 
         self.close_audio_pipe(_keep_temp)
 
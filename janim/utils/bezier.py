@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import inspect
+import itertools as it
 from typing import (Callable, Iterable, NoReturn, Self, Sequence, TypeVar,
                     overload)
 
@@ -151,6 +152,121 @@ class PathBuilder:
             )
 
 
+# 用于 quadratic_paths_from_segments 的片段类型
+SEGMENT_MOVE = 0
+SEGMENT_LINE = 1
+SEGMENT_QUAD = 2
+SEGMENT_CUBIC = 3
+SEGMENT_POINTS = 4
+
+
+def quadratic_paths_from_segments(
+    kinds: Sequence[int],
+    points: VectArray,
+    extra_points: Sequence[np.ndarray],
+    path_lengths: Sequence[int]
+) -> list[np.ndarray]:
+    '''
+    一次性地将多个路径的片段转换为二次贝塞尔曲线的点，对于每个路径，结果与依次调用 :class:`PathBuilder` 的对应方法相同，
+    但是所有路径的所有片段都使用数组批量处理，而不是逐个片段地计算
+
+    - 所有路径的片段依次拼接在一起，``path_lengths`` 是每个路径的片段数量
+    - ``kinds`` 是每个片段的类型，也就是 ``SEGMENT_`` 开头的常量
+    - ``points`` 的形状为 ``(片段数量, 3, 3)``，是每个片段的至多 3 个点：
+
+      - ``SEGMENT_MOVE``、``SEGMENT_LINE``：``[end, _, _]``，分别相当于 :meth:`~.PathBuilder.move_to` 和
+        :meth:`~.PathBuilder.line_to`（闭合路径也可以表示为到起点的 ``SEGMENT_LINE``）
+      - ``SEGMENT_QUAD``：``[handle, end, _]``，相当于 :meth:`~.PathBuilder.conic_to`
+      - ``SEGMENT_CUBIC``：``[handle1, handle2, end]``，相当于 :meth:`~.PathBuilder.cubic_to`
+      - ``SEGMENT_POINTS``：``[end, _, _]``，相当于 :meth:`~.PathBuilder.append`，
+        依次对应 ``extra_points`` 中的各个数组，``end`` 需要与所对应数组的最后一个点相同
+
+    每个路径都需要以 ``SEGMENT_MOVE`` 开始，返回每个路径的点
+    '''
+    n = len(kinds)
+    if n == 0:
+        return [np.empty((0, 3)) for _ in path_lengths]
+
+    kinds = np.asarray(kinds)
+    points = np.asarray(points, dtype=float)
+    p1, p2, p3 = points[:, 0], points[:, 1], points[:, 2]
+
+    is_quad = kinds == SEGMENT_QUAD
+    cubic_idx = np.flatnonzero(kinds == SEGMENT_CUBIC)
+    h1, h2, anchor = p1[cubic_idx], p2[cubic_idx], p3[cubic_idx]
+    same_handles = np.isclose(h1, h2).all(axis=1)
+    h2_at_anchor = np.isclose(h2, anchor).all(axis=1)
+
+    # 每个片段的终点，也就是下一个片段的起点（对于每个路径的第一个片段，得到的起点没有意义，但是也用不到）
+    ends = p1.copy()
+    ends[is_quad] = p2[is_quad]
+    ends[cubic_idx] = anchor
+
+    # cubic_to 在 handle2 与 anchor 接近时以 handle2 作为终点，而这又会影响下一个片段是否满足这些条件，
+    # 所以重复计算直到终点不再变化（除非有连续的此类片段，否则只需要一次）
+    while True:
+        starts = np.roll(ends, 1, axis=0)
+        start_at_h1 = np.isclose(starts[cubic_idx], h1).all(axis=1)
+        as_conic1 = start_at_h1
+        as_conic2 = ~start_at_h1 & same_handles
+        as_conic3 = ~start_at_h1 & ~same_handles & h2_at_anchor
+        cubic_ends = np.where(as_conic3[:, None], h2, anchor)
+        if np.array_equal(cubic_ends, ends[cubic_idx]):
+            break
+        ends[cubic_idx] = cubic_ends
+
+    general = ~(as_conic1 | as_conic2 | as_conic3)
+    general_idx = cubic_idx[general]
+
+    # 除了不能简化为 conic_to 的 cubic_to、SEGMENT_POINTS 以及每个路径的第一个 move_to，每个片段都产生两个点
+    first = np.empty_like(p1)
+    second = p1.copy()
+
+    is_move = kinds == SEGMENT_MOVE
+    first[is_move] = NAN_POINT
+
+    is_line = kinds == SEGMENT_LINE
+    first[is_line] = (starts[is_line] + p1[is_line]) / 2
+
+    first[is_quad] = p1[is_quad]
+    second[is_quad] = p2[is_quad]
+
+    first[cubic_idx] = np.where(as_conic1[:, None], h2, h1)
+    second[cubic_idx] = np.where(as_conic3[:, None], h2, anchor)
+
+    # 每个路径的第一个 move_to 不会产生 NAN_POINT
+    path_bounds = np.concatenate([[0], np.cumsum(path_lengths)])
+    path_begins = path_bounds[:-1][np.asarray(path_lengths) != 0]
+
+    counts = np.full(n, 2)
+    counts[general_idx] = 4
+    points_idx = np.flatnonzero(kinds == SEGMENT_POINTS)
+    counts[points_idx] = [len(arr) for arr in extra_points]
+    counts[path_begins] = 1
+    row_bounds = np.concatenate([[0], np.cumsum(counts)])
+    offsets = row_bounds[:-1]
+
+    result = np.empty((row_bounds[-1], 3))
+
+    two_idx = np.flatnonzero(counts == 2)
+    two_idx = two_idx[kinds[two_idx] != SEGMENT_POINTS]
+    result[offsets[two_idx]] = first[two_idx]
+    result[offsets[two_idx] + 1] = second[two_idx]
+    result[offsets[path_begins]] = second[path_begins]
+
+    if len(general_idx) != 0:
+        approx = get_quadratic_approximation_of_cubic(starts[general_idx], h1[general], h2[general], anchor[general])
+        result[offsets[general_idx, None] + np.arange(4)] = approx.reshape((-1, 5, 3))[:, 1:]
+
+    for offset, arr in zip(offsets[points_idx], extra_points):
+        result[offset: offset + len(arr)] = arr
+
+    return [
+        result[begin: end]
+        for begin, end in it.pairwise(row_bounds[path_bounds])
+    ]
+
+
 def quadratic_bezier_points_for_arc(
     angle: float,
     start_angle: float = 0,
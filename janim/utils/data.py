@@ -3,13 +3,16 @@ from __future__ import annotations
 from contextvars import ContextVar
 from dataclasses import dataclass
 from enum import IntFlag
-from typing import Iterable, Self, overload
+from typing import TYPE_CHECKING, Iterable, Self, overload
 
 import numpy as np
 import numpy.typing as npt
 
 from janim.locale.i18n import get_local_strings
 
+if TYPE_CHECKING:
+    from janim.components.component import Component
+
 _ = get_local_strings('data')
 
 
@@ -30,9 +33,15 @@ class Array:
     使得在使用 ``.data = xxx`` 修改（赋值）后必定是不同的 id
 
     并且通过 ``.data`` 得到的 numpy 数组必定是只读的
+
+    ``owner`` 是持有该数组的组件，在作为组件的属性时被自动设置，
+    使用 ``.data = xxx`` 修改后会通过 :meth:`~.Component.mark_dirty` 标记物件发生了变化
     '''
+    __slots__ = ('_data', 'owner')
+
     def __init__(self, *, dtype=np.float32):
         self._data = np.empty(0, dtype=dtype)
+        self.owner: Component | None = None
 
     def len(self) -> int:
         return len(self._data)
@@ -46,17 +55,32 @@ class Array:
         # 如果是设定的是 Array 对象，因为对方的内容肯定是 write=False，所以直接引用其内容
         if isinstance(data, Array):
             self._data = data._data
-            return
-        # 否则进行拷贝，这里的 np.array 对于 numpy 数组和其它 ArrayLike 数据
-        # 都会在原数据之外产生拷贝，不会产生共用内存的情况
-        self._data = np.array(data, dtype=self._data.dtype)
-        self._data.setflags(write=False)
+        else:
+            # 否则进行拷贝，这里的 np.array 对于 numpy 数组和其它 ArrayLike 数据
+            # 都会在原数据之外产生拷贝，不会产生共用内存的情况
+            self._data = np.array(data, dtype=self._data.dtype)
+            self._data.setflags(write=False)
+
+        if self.owner is not None:
+            self.owner.mark_dirty()
 
     def copy(self) -> Array:
         ret = Array(dtype=self._data.dtype)
         ret.data = self
         return ret
 
+    @staticmethod
+    def from_readonly(data: np.ndarray) -> Array:
+        '''
+        直接引用只读的 ``data`` 而不进行拷贝，例如以 ``mmap_mode='r'`` 读取的 ``.npy`` 文件
+
+        之后可以通过 ``xxx.data = array`` 使其它 :class:`Array` 共用这份数据
+        '''
+        assert not data.flags.writeable
+        ret = Array(dtype=data.dtype)
+        ret._data = data
+        return ret
+
     def is_share(self, other: Array) -> bool:
         return self.data is other.data
 
@@ -3,6 +3,9 @@ import inspect
 import os
 import platform
 import subprocess as sp
+import tempfile
+from contextlib import contextmanager
+from typing import Generator
 
 
 def guarantee_existence(path: str) -> str:
@@ -23,6 +26,34 @@ def get_typst_temp_dir() -> str:
     return guarantee_existence(os.path.join(Config.get.temp_dir, 'Typst'))
 
 
+@contextmanager
+def atomic_write(path: str) -> Generator[str, None, None]:
+    '''
+    先写入与 ``path`` 位于同一文件夹的临时文件，完成后再替换 ``path``，避免在写入过程中被中断导致文件损坏
+
+    ``with`` 得到的是临时文件的路径；临时文件名以 ``.tmp`` 结尾，如果写入时出现异常，会删除临时文件
+
+    .. code-block:: python
+
+        with atomic_write(file_path) as temp_path:
+            with open(temp_path, 'wt', encoding='utf-8') as f:
+                json.dump(data, f)
+    '''
+    fd, temp_path = tempfile.mkstemp(suffix='.tmp',
+                                     prefix=os.path.basename(path) + '.',
+                                     dir=os.path.dirname(path) or '.')
+    os.close(fd)
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
 def readall(filepath: str) -> str:
     '''
     从文件中读取所有字符
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import json
+import os
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
+from functools import cached_property
 from typing import TYPE_CHECKING, Callable
 
 import freetype as FT
@@ -13,16 +16,20 @@ from janim.exception import FontNotFoundError
 from janim.locale.i18n import get_local_strings
 from janim.logger import log
 from janim.utils.bezier import PathBuilder
+from janim.utils.config import Config
+from janim.utils.file_ops import atomic_write, guarantee_existence
 from janim.utils.font.exception import EXCEPTION_MAP
 from janim.utils.font.variant import (WEIGHT_MAP, Style, StyleName, Weight,
                                       WeightName)
 
 if TYPE_CHECKING:
     from fontTools.ttLib.tables._n_a_m_e import table__n_a_m_e
-    from fontTools.ttLib.tables.O_S_2f_2 import table_O_S_2f_2
 
 _ = get_local_strings('database')
 
+# 字体索引的格式版本，格式或者记录的内容发生变化时需要增加
+FONT_INDEX_VERSION = 1
+
 
 @dataclass
 class FontDatabase:
@@ -65,44 +72,78 @@ class FontFamily:
         return 2
 
 
-class FontInfo:
-    def __init__(self, filepath: str, font: TTFont, index: int):
-        self.filepath = filepath
-        self.index = index
+def open_fonts(filepath: str) -> list[TTFont]:
+    '''
+    打开字体文件，``.ttc`` 文件中可能有多个字体
+    '''
+    if filepath.endswith('ttc'):
+        return TTCollection(filepath, lazy=True).fonts
+    return [TTFont(filepath, lazy=True)]
 
-        self.name: table__n_a_m_e = font['name']
-        self.os2: table_O_S_2f_2 = font.get('OS/2', None)
 
+@dataclass
+class FontInfo:
+    '''
+    字体文件中的一个字体的信息
+
+    除了 :attr:`name` 以外都不需要打开字体文件，因此可以直接由 :class:`FontIndex` 中的记录得到
+    '''
+    filepath: str
+    index: int
+
+    family_name: str
+    full_name: str
+    postscript_name: str | None
+    legacy_full_name: str | None    # nameID 为 4 的名称，用于已弃用的查找方式
+    weight_class: int | None        # OS/2 表中的 usWeightClass，没有 OS/2 表时为 None
+    fs_selection: int | None        # OS/2 表中的 fsSelection，没有 OS/2 表时为 None
+
+    def __post_init__(self) -> None:
         self.exception = EXCEPTION_MAP.get(self.postscript_name, None)
 
-    @property
-    def family_name(self) -> str:
-        return self.name.getBestFamilyName()
-
-    @property
-    def full_name(self) -> str:
-        return self.name.getBestFullName()
+    @staticmethod
+    def from_font(filepath: str, font: TTFont, index: int) -> FontInfo:
+        name: table__n_a_m_e = font['name']
+        os2 = font.get('OS/2', None)
+        return FontInfo(
+            filepath,
+            index,
+            name.getBestFamilyName(),
+            name.getBestFullName(),
+            name.getDebugName(6),
+            name.getDebugName(4),
+            None if os2 is None else os2.usWeightClass,
+            None if os2 is None else os2.fsSelection
+        )
 
-    @property
-    def postscript_name(self) -> str:
-        return self.name.getDebugName(6)
+    @cached_property
+    def name(self) -> table__n_a_m_e:
+        '''
+        字体的 name 表，在第一次访问时读取字体文件得到
+        '''
+        fonts = open_fonts(self.filepath)
+        try:
+            return fonts[self.index]['name']
+        finally:
+            for font in fonts:
+                font.close()
 
     @property
     def weight(self) -> int:
         if self.exception is not None and self.exception.weight is not None:
             return self.exception.weight
-        if self.os2 is None:
+        if self.weight_class is None:
             return 400
-        return self.os2.usWeightClass
+        return self.weight_class
 
     @property
     def style(self) -> Style:
         if self.exception is not None and self.exception.style is not None:
             return self.exception.style
-        if self.os2 is None:
+        if self.fs_selection is None:
             return Style.Normal
 
-        fs_selection = self.os2.fsSelection
+        fs_selection = self.fs_selection
         if fs_selection & 0x01:
             return Style.Italic
         if fs_selection & 0x200:
@@ -111,6 +152,117 @@ class FontInfo:
         return Style.Normal
 
 
+class FontIndex:
+    '''
+    字体文件的索引，以 json 的形式保存在 ``temp_dir`` 的 ``font_index.json`` 中，
+    使得之后的进程不需要再逐个打开字体文件读取名称、字重等信息
+
+    - 以字体文件的路径为键，记录其修改时间、大小以及其中每个字体的 :class:`FontInfo`
+    - 修改时间或者大小发生变化的、新增的字体文件会被重新读取，不再存在的字体文件会被移除；
+      有变化时才会重新写入索引文件
+    - 无法读取的字体文件也会被记录，避免每次都尝试读取
+    '''
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        # 字体文件路径 -> (修改时间, 大小, 其中的各个字体，无法读取时为 None)
+        self.entries: dict[str, tuple[int, int, list[FontInfo] | None]] = {}
+        self.changed = False
+
+    def get_infos(self, filepaths: list[str]) -> list[FontInfo]:
+        '''
+        得到 ``filepaths`` 中所有字体的 :class:`FontInfo`，顺序与 ``filepaths`` 相同
+        '''
+        self.load()
+
+        entries = {}
+        infos = []
+        for filepath in filepaths:
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+
+            entry = self.entries.get(filepath, None)
+            if entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+                entry = (stat.st_mtime_ns, stat.st_size, self.read_font_file(filepath))
+                self.changed = True
+
+            entries[filepath] = entry
+            if entry[2] is not None:
+                infos.extend(entry[2])
+
+        if entries.keys() != self.entries.keys():
+            self.changed = True
+        self.entries = entries
+
+        if self.changed:
+            self.save()
+        return infos
+
+    @staticmethod
+    def read_font_file(filepath: str) -> list[FontInfo] | None:
+        try:
+            fonts = open_fonts(filepath)
+        except TTLibError:
+            log.debug(_('Skipped font "{filepath}"').format(filepath=filepath))
+            return None
+
+        try:
+            return [FontInfo.from_font(filepath, font, i) for i, font in enumerate(fonts)]
+        finally:
+            for font in fonts:
+                font.close()
+
+    def load(self) -> None:
+        try:
+            with open(self.file_path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data['version'] != FONT_INDEX_VERSION:
+                return
+            self.entries = {
+                filepath: (
+                    mtime,
+                    size,
+                    None if fonts is None else [FontInfo(filepath, *font) for font in fonts]
+                )
+                for filepath, (mtime, size, fonts) in data['files'].items()
+            }
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log.warning(
+                _('Unable to read font index: {err}')
+                .format(err=f'{e.__class__.__name__}: {e}')
+            )
+
+    def save(self) -> None:
+        data = {
+            'version': FONT_INDEX_VERSION,
+            'files': {
+                filepath: [
+                    mtime,
+                    size,
+                    None if infos is None else [astuple(info)[1:] for info in infos]
+                ]
+                for filepath, (mtime, size, infos) in self.entries.items()
+            }
+        }
+        try:
+            with atomic_write(self.file_path) as temp_path:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+            self.changed = False
+        except Exception as e:
+            log.warning(
+                _('Unable to write font index: {err}')
+                .format(err=f'{e.__class__.__name__}: {e}')
+            )
+
+    @staticmethod
+    def get_default_file_path() -> str:
+        return os.path.join(guarantee_existence(Config.get.temp_dir), 'font_index.json')
+
+
 _database: FontDatabase | None = None
 
 
@@ -125,19 +277,10 @@ def get_database() -> FontDatabase:
     family_by_name = defaultdict(FontFamily)
     font_by_full_name = {}
 
-    for filepath in findSystemFonts():
-        try:
-            fonts = TTCollection(filepath, lazy=True).fonts \
-                if filepath.endswith('ttc')                 \
-                else [TTFont(filepath, lazy=True)]
-        except TTLibError:
-            log.debug(_('Skipped font "{filepath}"').format(filepath=filepath))
-            continue
-
-        for i, font in enumerate(fonts):
-            info = FontInfo(filepath, font, i)
-            family_by_name[info.family_name].add(info)
-            font_by_full_name[info.full_name] = info
+    # 通过索引得到字体信息，只有新增或者发生变化的字体文件才需要被打开
+    for info in FontIndex(FontIndex.get_default_file_path()).get_infos(findSystemFonts()):
+        family_by_name[info.family_name].add(info)
+        font_by_full_name[info.full_name] = info
 
     _database = FontDatabase(family_by_name, font_by_full_name)
     return _database
@@ -164,7 +307,7 @@ def get_font_info_by_attrs(
 
     # deprecated
     for full_name, info in db.font_by_full_name.items():
-        if info.name.getDebugName(4) == name:
+        if info.legacy_full_name == name:
             log.warning(
                 _('font="{deprecated}" is deprecated and will no longer be available in JAnim 3.3, '
                   'use font="{full_name}" instead')
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import math
+import random
+from typing import Iterator
+
+# 用于生成节点的优先级；使用单独的实例，避免影响用户代码中 random 的随机序列
+_random = random.Random(0)
+
+
+class IntervalNode[T]:
+    '''
+    :class:`IntervalTree` 中的一个区间 ``[begin, end)``，``end`` 可以是 ``math.inf``
+
+    ``seq`` 用于区分 ``begin`` 相同的区间，一般是插入的次序
+    '''
+    __slots__ = ('begin', 'end', 'seq', 'value', 'priority', 'left', 'right', 'max_end')
+
+    def __init__(self, begin: float, end: float, seq: int, value: T):
+        self.begin = begin
+        self.end = end
+        self.seq = seq
+        self.value = value
+        self.priority = _random.random()
+        self.left: IntervalNode[T] | None = None
+        self.right: IntervalNode[T] | None = None
+        # 以该节点为根的子树中最大的 end
+        self.max_end = end
+
+    def update(self) -> None:
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+class IntervalTree[T]:
+    '''
+    区间树，以 ``(begin, seq)`` 为键的 treap，每个节点额外记录子树中最大的 ``end``
+
+    - 插入与删除的期望复杂度为 O(log n)
+    - 查询包含某个时间点的区间（:meth:`stab`）以及与某个范围重叠的区间（:meth:`overlap`）的期望复杂度为 O(log n + k)，
+      其中 k 为结果的数量
+
+    区间均为左闭右开的 ``[begin, end)``
+    '''
+    def __init__(self):
+        self.root: IntervalNode[T] | None = None
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[IntervalNode[T]]:
+        '''
+        按照 ``(begin, seq)`` 的顺序遍历所有区间
+        '''
+        stack: list[IntervalNode[T]] = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
+
+    def insert(self, begin: float, end: float, seq: int, value: T) -> IntervalNode[T]:
+        node = IntervalNode(begin, end, seq, value)
+        key = (begin, seq)
+
+        # 向下找到 node 应处的位置（其父节点的优先级更高），途中更新 max_end
+        parent: IntervalNode[T] | None = None
+        cur = self.root
+        while cur is not None and cur.priority > node.priority:
+            if end > cur.max_end:
+                cur.max_end = end
+            parent = cur
+            cur = cur.left if key < (cur.begin, cur.seq) else cur.right
+
+        # 原本在该位置的子树被分为 node 的左右子树
+        node.left, node.right = self._split(cur, key)
+        node.update()
+
+        if parent is None:
+            self.root = node
+        elif key < (parent.begin, parent.seq):
+            parent.left = node
+        else:
+            parent.right = node
+
+        self.count += 1
+        return node
+
+    def remove(self, node: IntervalNode[T]) -> None:
+        '''
+        删除 ``node``，``node`` 需要是该树中的节点
+        '''
+        self.root = self._remove(self.root, node)
+        self.count -= 1
+
+    def set_end(self, node: IntervalNode[T], end: float) -> None:
+        '''
+        修改 ``node`` 的 ``end``，因为键不变，所以不需要重新插入
+        '''
+        key = (node.begin, node.seq)
+        path: list[IntervalNode[T]] = []
+        cur = self.root
+        while cur is not node:
+            if cur is None:
+                raise ValueError('Node is not in the tree')
+            path.append(cur)
+            cur = cur.left if key < (cur.begin, cur.seq) else cur.right
+
+        node.end = end
+        node.update()
+        for cur in reversed(path):
+            cur.update()
+
+    def next_begin(self, t: float, *, inclusive: bool = False) -> float:
+        '''
+        得到大于 ``t`` 的最小的 ``begin``（``inclusive=True`` 时为不小于），不存在时返回 ``math.inf``
+        '''
+        result = math.inf
+        cur = self.root
+        while cur is not None:
+            if cur.begin > t or (inclusive and cur.begin == t):
+                result = cur.begin
+                cur = cur.left
+            else:
+                cur = cur.right
+        return result
+
+    def stab(self, t: float, *, at_left: bool = False) -> list[IntervalNode[T]]:
+        '''
+        得到包含 ``t`` 的所有区间，也就是满足 ``begin <= t < end`` 的区间
+
+        若 ``at_left=True``，则是在 ``t`` 左侧紧邻 ``t`` 的区间，也就是满足 ``begin < t <= end`` 的区间
+
+        结果按照 ``(begin, seq)`` 的顺序排列
+        '''
+        result: list[IntervalNode[T]] = []
+        stack: list[IntervalNode[T]] = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                # 子树中所有区间都在 t 之前结束，整个子树都可以跳过
+                if node.max_end < t or (node.max_end == t and not at_left):
+                    node = None
+                    break
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            # 此后的区间都在 t 之后开始
+            if node.begin > t or (node.begin == t and at_left):
+                break
+            if t < node.end or (t == node.end and at_left):
+                result.append(node)
+            node = node.right
+        return result
+
+    def stable_end(self, t: float, nodes: list[IntervalNode[T]], *, at_left: bool = False) -> float:
+        '''
+        对于 ``nodes = self.stab(t, at_left=at_left)``，得到其结果保持不变的范围的结束时刻 ``end``，
+        也就是在 ``[t, end)`` 中（``at_left=True`` 时为 ``[t, end]``）进行 :meth:`stab` 都会得到相同的结果
+
+        用于对按时间顺序的查询进行缓存
+        '''
+        end = self.next_begin(t, inclusive=at_left)
+        for node in nodes:
+            if node.end < end:
+                end = node.end
+        return end
+
+    def overlap(self, begin: float, end: float) -> list[IntervalNode[T]]:
+        '''
+        得到与 ``[begin, end)`` 重叠的所有区间，结果按照 ``(begin, seq)`` 的顺序排列
+        '''
+        result: list[IntervalNode[T]] = []
+        stack: list[IntervalNode[T]] = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                if node.max_end <= begin:
+                    node = None
+                    break
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            if node.begin >= end:
+                break
+            if node.end > begin:
+                result.append(node)
+            node = node.right
+        return result
+
+    @staticmethod
+    def _split(
+        node: IntervalNode[T] | None,
+        key: tuple[float, int]
+    ) -> tuple[IntervalNode[T] | None, IntervalNode[T] | None]:
+        '''
+        将子树分为键小于 ``key`` 的部分与不小于 ``key`` 的部分
+        '''
+        if node is None:
+            return None, None
+        if (node.begin, node.seq) < key:
+            node.right, right = IntervalTree._split(node.right, key)
+            node.update()
+            return node, right
+        else:
+            left, node.left = IntervalTree._split(node.left, key)
+            node.update()
+            return left, node
+
+    @staticmethod
+    def _merge(left: IntervalNode[T] | None, right: IntervalNode[T] | None) -> IntervalNode[T] | None:
+        '''
+        合并两个子树，``left`` 中的键需要都小于 ``right`` 中的键
+        '''
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = IntervalTree._merge(left.right, right)
+            left.update()
+            return left
+        else:
+            right.left = IntervalTree._merge(left, right.left)
+            right.update()
+            return right
+
+    @staticmethod
+    def _remove(node: IntervalNode[T] | None, target: IntervalNode[T]) -> IntervalNode[T] | None:
+        if node is None:
+            raise ValueError('Node is not in the tree')
+        if node is target:
+            return IntervalTree._merge(node.left, node.right)
+        if (target.begin, target.seq) < (node.begin, node.seq):
+            node.left = IntervalTree._remove(node.left, target)
+        else:
+            node.right = IntervalTree._remove(node.right, target)
+        node.update()
+        return node
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Generator
+
+# 未开启性能分析时 profile_span 返回的对象，可以重复使用
+_null_context = nullcontext()
+
+
+class Profiler:
+    '''
+    记录各个阶段的耗时，并导出为 Chrome trace event 格式的 JSON 文件，
+    可以使用 ``chrome://tracing`` 或者 `Perfetto <https://ui.perfetto.dev>`_ 查看
+
+    一般不直接使用该类，而是通过 :func:`enable_profiling` 开启，并在需要记录的位置使用 :func:`profile_span`
+
+    时间使用 :func:`time.perf_counter_ns` 记录，因此多个进程的记录可以通过 :meth:`merge` 合并到同一时间轴上
+    '''
+    def __init__(self):
+        self.events: list[dict[str, Any]] = []
+        # (pid, tid) -> 线程名称
+        self.thread_names: dict[tuple[int, int], str] = {}
+
+    @contextmanager
+    def span(self, name: str, cat: str, args: dict[str, Any]) -> Generator[None, None, None]:
+        '''
+        将 ``with`` 块记录为名称为 ``name``、分类为 ``cat`` 的区间，``args`` 会附加到区间的信息中
+        '''
+        t = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            dur = time.perf_counter_ns() - t
+            self.record(name, cat, t, dur, args)
+
+    def record(self, name: str, cat: str, begin_ns: int, dur_ns: int, args: dict[str, Any]) -> None:
+        pid = os.getpid()
+        tid = threading.get_ident()
+        if (pid, tid) not in self.thread_names:
+            self.thread_names[pid, tid] = threading.current_thread().name
+
+        # 在多个线程中同时调用 list.append 是安全的
+        self.events.append(dict(
+            name=name,
+            cat=cat,
+            ph='X',
+            ts=begin_ns / 1000,
+            dur=dur_ns / 1000,
+            pid=pid,
+            tid=tid,
+            args={
+                key: describe(value)
+                for key, value in args.items()
+                if value is not None
+            }
+        ))
+
+    def merge(self, other: Profiler) -> None:
+        '''
+        合并 ``other`` 的记录，用于合并多个进程的结果
+        '''
+        self.events.extend(other.events)
+        self.thread_names.update(other.thread_names)
+
+    def to_json(self) -> dict[str, Any]:
+        metadata = [
+            dict(name='thread_name', ph='M', pid=pid, tid=tid, args=dict(name=name))
+            for (pid, tid), name in self.thread_names.items()
+        ]
+        return dict(traceEvents=metadata + self.events, displayTimeUnit='ms')
+
+    def save(self, file_path: str) -> None:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_json(), f)
+
+
+def describe(value: Any) -> Any:
+    '''
+    将附加到区间上的信息转换为可以写入 JSON 的值，除了基本类型外，类会使用其名称，其它对象会使用其类名
+    '''
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, type):
+        return value.__name__
+    return value.__class__.__name__
+
+
+_profiler: Profiler | None = None
+
+
+def enable_profiling() -> Profiler:
+    '''
+    开启性能分析，之后 :func:`profile_span` 所标记的区间都会被记录到返回的 :class:`Profiler` 中
+    '''
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+
+def disable_profiling() -> None:
+    global _profiler
+    _profiler = None
+
+
+def get_profiler() -> Profiler | None:
+    '''
+    得到当前的 :class:`Profiler`，未开启性能分析时返回 ``None``
+    '''
+    return _profiler
+
+
+def profile_span(name: str, cat: str, /, **args: Any) -> ContextManager[None]:
+    '''
+    在开启性能分析时，将 ``with`` 块记录为一个区间；未开启时不做任何事
+
+    ``args`` 中的对象会在记录时才转换为其类名（参考 :func:`describe`），
+    因此可以直接传入物件或者动画，未开启时的开销很小；值为 ``None`` 的项会被忽略
+
+    .. code-block:: python
+
+        with profile_span('AnimStack.compute', 'anim', item=self.item):
+            ...
+    '''
+    if _profiler is None:
+        return _null_context
+    return _profiler.span(name, cat, args)
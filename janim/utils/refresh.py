@@ -1,7 +1,9 @@
-from collections import defaultdict
 from functools import wraps
 from typing import Any, Callable, Self
 
+# 用于区分“还没有记忆的值”与“记忆的值为 None”
+_MISSING = object()
+
 
 def register[T](func: T) -> T:
     '''
@@ -23,38 +25,51 @@ def register[T](func: T) -> T:
 
     @wraps(func)
     def wrapper(self: Refreshable, *args, **kwargs):
-        data = self.refresh_data[name]
+        data = self.refresh_data
+        if data is None:
+            data = {}
+            # 不使用 self.refresh_data = ...，因为对于组件而言这会被当作发生了变化
+            object.__setattr__(self, 'refresh_data', data)
 
-        if data.is_required:
-            data.stored = func(self, *args, **kwargs)
-            data.is_required = False
+        stored = data.get(name, _MISSING)
+        if stored is _MISSING:
+            stored = data[name] = func(self, *args, **kwargs)
 
-        return data.stored
+        return stored
 
     return wrapper
 
 
 class Refreshable:
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    '''
+    ``refresh_data`` 记录了各个方法被记忆的返回值，不在其中的表示需要重新计算
 
-        self.refresh_data: defaultdict[str, RefreshData] = defaultdict(RefreshData)
+    大部分对象的大部分方法都不会被调用，所以 ``refresh_data`` 在第一次需要记忆时才会被创建，在此之前是 ``None``
+    '''
+    refresh_data: dict[str, Any] | None = None
 
     def mark_refresh(self, func: Callable | str) -> Self:
         '''
         标记指定的 ``func`` 需要进行更新
         '''
-        name = func.__name__ if callable(func) else func
-        data: RefreshData = self.refresh_data[name]
-        data.is_required = True
+        data = self.refresh_data
+        if data is not None:
+            data.pop(func.__name__ if callable(func) else func, None)
 
         return self
 
-    def reset_refresh(self) -> Self:
-        self.refresh_data = defaultdict(RefreshData)
+    def set_refresh_stored(self, func: Callable | str, stored: Any) -> Self:
+        '''
+        直接设定 ``func`` 所记忆的返回值，在下次标记需要更新之前都会返回该值
+        '''
+        data = self.refresh_data
+        if data is None:
+            data = {}
+            object.__setattr__(self, 'refresh_data', data)
+        data[func.__name__ if callable(func) else func] = stored
 
+        return self
 
-class RefreshData:
-    def __init__(self):
-        self.is_required = True
-        self.stored: Any = None
+    def reset_refresh(self) -> Self:
+        object.__setattr__(self, 'refresh_data', None)
+        return self
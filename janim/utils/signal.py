@@ -17,6 +17,8 @@ SIGNAL_OBJ_SLOTS_NAME = '__signal_obj_slots'
 
 
 class _SelfSlots:
+    __slots__ = ('normal_slots', 'refresh_slots', 'refresh_slots_with_recurse')
+
     def __init__(self):
         self.normal_slots: list[Callable] = []
         self.refresh_slots: list[Callable] = []
@@ -24,19 +26,21 @@ class _SelfSlots:
 
 
 class _ObjSlots:
+    __slots__ = ('normal_slots', 'refresh_slots')
+
     def __init__(self):
         self.normal_slots: list[Callable] = []
         self.refresh_slots: list[_RefreshSlot] = []
 
 
-@dataclass
+@dataclass(slots=True)
 class _SelfSlotWithRecurse:
     func: Callable
     recurse_up: bool
     recurse_down: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class _RefreshSlot:
     obj: weakref.ReferenceType[refresh.Refreshable]
     func: Callable | str
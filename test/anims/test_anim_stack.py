@@ -0,0 +1,113 @@
+import unittest
+from types import SimpleNamespace
+
+from janim.anims.anim_stack import AnimStack, compute_cache, estimate_nbytes
+from janim.anims.animation import TimeRange
+from janim.anims.timeline import Timeline
+from janim.constants import FOREVER, RIGHT
+from janim.items.geometry.polygon import Square
+
+
+def make_anim(at: float, end: float, cover: bool = False) -> SimpleNamespace:
+    return SimpleNamespace(t_range=TimeRange(at, end), _cover_previous_anims=cover)
+
+
+class AnimStackTest(unittest.TestCase):
+    def test_get(self) -> None:
+        stack = AnimStack(None, None)
+        display1 = make_anim(0, FOREVER, True)
+        updater = make_anim(1, 5)
+        transform = make_anim(2, 3, True)
+        after = make_anim(2.5, 4)
+        display2 = make_anim(6, FOREVER, True)
+        for anim in (display1, updater, transform, after, display2):
+            stack.append(anim)
+
+        self.assertEqual(stack.get(0.5), [display1])
+        self.assertEqual(stack.get(1), [display1, updater])
+        self.assertEqual(stack.get(2), [transform])
+        self.assertEqual(stack.get(2.5), [transform, after])
+        self.assertEqual(stack.get(3), [display1, updater, after])
+        self.assertEqual(stack.get(5), [display1])
+        self.assertEqual(stack.get(100), [display2])
+
+        # get_at_left 得到的是在该时刻左侧紧邻的动画序列
+        self.assertEqual(stack.get_at_left(0), [display1])
+        self.assertEqual(stack.get_at_left(2), [display1, updater])
+        self.assertEqual(stack.get_at_left(3), [transform, after])
+        self.assertEqual(stack.get_at_left(6), [display1])
+
+        # 按时间倒序查询，不受缓存影响
+        self.assertEqual(stack.get(2.5), [transform, after])
+        self.assertEqual(stack.get(1.5), [display1, updater])
+
+        self.assertEqual(
+            [(at, anim) for at, _, anim in stack.segments()],
+            [(0, display1), (1, updater), (2, transform), (2.5, after), (3, display1), (3, updater), (6, display2)]
+        )
+
+
+class ComputeCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        compute_cache.clear()
+
+    def tearDown(self) -> None:
+        compute_cache.max_bytes = 0
+        compute_cache.clear()
+
+    def build(self) -> tuple[Square, AnimStack]:
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                self.square = Square()
+                self.play(self.square.anim.points.shift(RIGHT))
+                self.forward()
+
+        tl = MyTimeline()
+        tl.build(quiet=True)
+        return tl.square, tl.item_appearances[tl.square].stack
+
+    def test_disabled(self) -> None:
+        _, stack = self.build()
+        stack.compute(0.5, True)
+        stack.compute(0.7, True)
+        stack.compute(0.5, True)
+        self.assertEqual(len(compute_cache.entries), 0)
+        self.assertEqual((compute_cache.hits, compute_cache.misses), (0, 0))
+
+    def test_hit_and_miss(self) -> None:
+        compute_cache.max_bytes = 64 * 1024 * 1024
+        square, stack = self.build()
+
+        data1 = stack.compute(0.5, True)
+        stack.compute(0.7, True)
+        self.assertEqual((compute_cache.hits, compute_cache.misses), (0, 2))
+
+        # 再次回到 0.5 时直接使用缓存的结果
+        self.assertIs(stack.compute(0.5, True), data1)
+        self.assertEqual((compute_cache.hits, compute_cache.misses), (1, 2))
+
+        # 只有 Display 作用的时刻不进入缓存
+        stack.compute(1.5, True)
+        self.assertEqual((compute_cache.hits, compute_cache.misses), (1, 2))
+        self.assertEqual(len(compute_cache.entries), 2)
+
+        # 添加动画后先前的结果失效
+        stack.append(make_anim(3, 4))
+        stack.compute(0.7, True)
+        self.assertEqual((compute_cache.hits, compute_cache.misses), (1, 3))
+
+    def test_budget(self) -> None:
+        square, stack = self.build()
+        compute_cache.max_bytes = int(estimate_nbytes(square) * 2.5)
+
+        stack.compute(0.2, True)
+        stack.compute(0.4, True)
+        stack.compute(0.6, True)
+        self.assertEqual(len(compute_cache.entries), 2)
+        self.assertLessEqual(compute_cache.nbytes, compute_cache.max_bytes)
+
+        # 最久未使用的 0.2 的结果已被淘汰
+        stack.compute(0.4, True)
+        self.assertEqual((compute_cache.hits, compute_cache.misses), (1, 3))
+        stack.compute(0.2, True)
+        self.assertEqual((compute_cache.hits, compute_cache.misses), (1, 4))
@@ -0,0 +1,61 @@
+import io
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+from janim.anims.build_cache import (BuildCachePickler,
+                                     get_local_dependencies)
+from janim.anims.timeline import Timeline
+from janim.anims.updater import DataUpdater
+from janim.constants import RIGHT
+from janim.items.geometry.arc import Circle
+
+
+class UpdaterTimeline(Timeline):
+    def construct(self) -> None:
+        circle = Circle().show()
+        distance = 2
+        self.play(DataUpdater(circle, lambda data, p: data.points.shift(RIGHT * distance * p.alpha)))
+
+
+class BuildCacheTest(unittest.TestCase):
+    def test_pickle_built(self) -> None:
+        built = UpdaterTimeline().build(quiet=True)
+
+        f = io.BytesIO()
+        BuildCachePickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(built)
+        loaded = pickle.loads(f.getvalue())
+
+        self.assertEqual(built.duration, loaded.duration)
+        for appr1, appr2 in zip(built.timeline.item_appearances.values(),
+                                loaded.timeline.item_appearances.values()):
+            self.assertEqual(appr1.visibility, appr2.visibility)
+            for t in (0, 0.5, 1):
+                np.testing.assert_allclose(
+                    appr1.stack.compute(t, True).points.get(),
+                    appr2.stack.compute(t, True).points.get()
+                )
+
+    def test_get_local_dependencies(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, 'pkg'))
+            files = {
+                'main.py': 'import os\nfrom pkg import sub\nimport helper\n',
+                'helper.py': 'from pkg.sub import value\n',
+                'unused.py': '',
+                'pkg/__init__.py': '',
+                'pkg/sub.py': 'from . import other\n',
+                'pkg/other.py': '',
+            }
+            for name, content in files.items():
+                with open(os.path.join(directory, name), 'wt') as f:
+                    f.write(content)
+
+            deps = get_local_dependencies(os.path.join(directory, 'main.py'))
+            self.assertEqual(
+                sorted(os.path.relpath(path, directory).replace(os.sep, '/') for path in deps),
+                ['helper.py', 'main.py', 'pkg/__init__.py', 'pkg/other.py', 'pkg/sub.py']
+            )
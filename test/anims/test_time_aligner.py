@@ -0,0 +1,50 @@
+import random
+import unittest
+from unittest.mock import patch
+
+import janim.anims.animation as animation
+from janim.anims.animation import ALIGN_EPSILON, TimeAligner
+
+
+class TimeAlignerTest(unittest.TestCase):
+    def test_align_t(self) -> None:
+        aligner = TimeAligner()
+        self.assertEqual(aligner.align_t(1), 1)
+        self.assertEqual(aligner.align_t(3), 3)
+        self.assertEqual(aligner.align_t(2), 2)
+        self.assertEqual(aligner.align_t(2 + ALIGN_EPSILON / 2), 2)
+        self.assertEqual(aligner.align_t(1 - ALIGN_EPSILON / 2), 1)
+        self.assertEqual(aligner.align_t(0), 0)
+        self.assertEqual(aligner.recorded_times, [0, 1, 2, 3])
+
+        # 两侧都有相近的值时，使用较大的那个
+        aligner.align_t(5)
+        aligner.align_t(5 + ALIGN_EPSILON * 1.5)
+        self.assertEqual(aligner.align_t(5 + ALIGN_EPSILON * 0.75), 5 + ALIGN_EPSILON * 1.5)
+
+        self.assertEqual(aligner.align_t_for_render(3 + ALIGN_EPSILON / 2), 3)
+        self.assertEqual(aligner.align_t_for_render(4), 4)
+        self.assertNotIn(4, aligner.recorded_times)
+
+    @patch.object(animation, 'ALIGN_BLOCK_SIZE', 4)
+    def test_random_order(self) -> None:
+        rnd = random.Random(0)
+        aligner = TimeAligner()
+        recorded: list[float] = []
+
+        for _ in range(1000):
+            t = rnd.randint(0, 300) / 4 + rnd.choice([0, ALIGN_EPSILON / 3, -ALIGN_EPSILON / 3])
+            expected = min(
+                (r for r in recorded if abs(t - r) < ALIGN_EPSILON),
+                key=lambda r: (r < t, abs(t - r)),
+                default=None
+            )
+            if expected is None:
+                recorded.append(t)
+                recorded.sort()
+                expected = t
+            self.assertEqual(aligner.align_t(t), expected)
+
+        self.assertEqual(aligner.recorded_times, recorded)
+        self.assertGreater(len(aligner.blocks), 1)
+        self.assertTrue(all(len(block) <= 4 for block in aligner.blocks))
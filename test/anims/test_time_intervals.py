@@ -0,0 +1,35 @@
+import random
+import unittest
+
+from janim.anims.animation import TimeIntervals, TimeRange
+from janim.constants import FOREVER
+
+
+class TimeIntervalsTest(unittest.TestCase):
+    def test_get(self) -> None:
+        rnd = random.Random(0)
+        ranges: list[list[TimeRange]] = []
+        for _ in range(300):
+            t = rnd.randint(0, 40) / 4
+            lst = []
+            for _ in range(rnd.randint(0, 3)):
+                end = t + rnd.randint(0, 8) / 4
+                lst.append(TimeRange(t, end))
+                t = end + rnd.randint(1, 8) / 4
+            if rnd.random() < 0.3:
+                lst.append(TimeRange(t, FOREVER))
+            ranges.append(lst)
+
+        intervals = TimeIntervals(range(len(ranges)), lambda i: ranges[i])
+
+        def expected(t: float) -> list[int]:
+            return [
+                i
+                for i, lst in enumerate(ranges)
+                if any(rg.at <= t and (rg.end is FOREVER or t < rg.end) for rg in lst)
+            ]
+
+        ts = [x / 8 for x in range(-8, 200)]
+        # 按顺序查询会使用缓存，打乱顺序后则不会
+        for t in ts + rnd.sample(ts, len(ts)):
+            self.assertEqual(intervals.get(t), expected(t))
@@ -63,8 +63,8 @@ class TimelineTest(unittest.TestCase):
         tl = MyTimeline()
         tl.build(quiet=True)
 
-        self.assertEqual(len(tl.item_appearances[tl.item1].stack.stacks), 2)
-        self.assertEqual(len(tl.item_appearances[tl.item2].stack.stacks), 2)
+        self.assertEqual(len(tl.item_appearances[tl.item1].stack.segments()), 2)
+        self.assertEqual(len(tl.item_appearances[tl.item2].stack.segments()), 2)
 
         self.check_data_at_time: list[tuple[MyItem, float, int]] = [
             (tl.item1, 1, 114),
@@ -82,6 +82,46 @@ class TimelineTest(unittest.TestCase):
                 msg=f'check_data_at_time {id(item):X} {t} {val}'
             )
 
+    def test_dirty_items(self) -> None:
+        testcase_self = self
+
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                item1 = Points(LEFT)
+                item2 = Points(RIGHT)
+                self.track(item1)
+                self.track(item2)
+
+                self.forward()
+                testcase_self.assertEqual(self.dirty_items, [])
+
+                item1.points.shift(RIGHT)
+                testcase_self.assertEqual(self.dirty_items, [item1])
+
+                # 复制以及 store 得到的物件的变化不会影响原物件
+                item2.copy().points.shift(RIGHT)
+                item2.store().points.shift(RIGHT)
+                testcase_self.assertNotIn(item2, self.dirty_items)
+
+                self.forward()
+                testcase_self.assertEqual(self.dirty_items, [])
+
+                item2.add(Points(LEFT))
+                testcase_self.assertIn(item2, self.dirty_items)
+
+                self.forward()
+
+                self.item1, self.item2 = item1, item2
+
+        tl = MyTimeline()
+        tl.build(quiet=True)
+
+        self.assertIsNone(tl.dirty_items)
+        self.assertEqual(len(tl.item_appearances[tl.item1].stack.segments()), 2)
+        self.assertEqual(len(tl.item_appearances[tl.item2].stack.segments()), 2)
+        self.assertEqual(len(tl.item2.current(as_time=0.5).stored_children), 0)
+        self.assertEqual(len(tl.item2.current(as_time=2.5).stored_children), 1)
+
     def test_fmt_time(self) -> None:
         self.assertEqual(  '     21s      ', Timeline.fmt_time(21))
         self.assertEqual(  '     59s      ', Timeline.fmt_time(59))
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from janim.items.audio import Audio, AudioCache
+from janim.utils.config import Config
+
+
+class AudioCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.config = Config(temp_dir=self.tempdir.name, audio_framerate=100, audio_channels=2)
+        self.config.__enter__()
+
+        self.file_path = os.path.join(self.tempdir.name, 'voice.wav')
+        with open(self.file_path, 'wb') as f:
+            f.write(b'voice')
+
+        self.decoded: list[str] = []
+
+        def decode(file_path, begin, end, framerate, channels):
+            self.decoded.append(file_path)
+            return np.full((100, channels), len(self.decoded), dtype=np.int16)
+
+        self.patcher = patch.object(Audio, '_decode', staticmethod(decode))
+        self.patcher.start()
+        self.original_cache = Audio.audio_cache_map
+        self.cache = Audio.audio_cache_map = AudioCache()
+
+    def tearDown(self) -> None:
+        self.patcher.stop()
+        Audio.audio_cache_map = self.original_cache
+        self.config.__exit__(None, None, None)
+        self.tempdir.cleanup()
+
+    def test_cache(self) -> None:
+        audio1 = Audio(self.file_path)
+        self.assertEqual(self.decoded, [self.file_path])
+        self.assertEqual(audio1.sample_count(), 100)
+        self.assertEqual(audio1.framerate, 100)
+
+        # 内存中的缓存，共用同一份数据
+        audio2 = Audio(self.file_path)
+        self.assertEqual(len(self.decoded), 1)
+        self.assertIs(audio2._samples.data, audio1._samples.data)
+        self.assertIsInstance(audio2._samples.data, np.memmap)
+
+        # 磁盘中的缓存，相当于新的进程
+        self.cache.clear()
+        audio3 = Audio(self.file_path)
+        self.assertEqual(len(self.decoded), 1)
+        self.assertIsInstance(audio3._samples.data, np.memmap)
+        np.testing.assert_array_equal(audio3._samples.data, audio1._samples.data)
+
+        # 截取的范围不同
+        Audio(self.file_path, 0, 0.5)
+        self.assertEqual(len(self.decoded), 2)
+
+        # 文件发生了变化
+        with open(self.file_path, 'ab') as f:
+            f.write(b'!')
+        audio4 = Audio(self.file_path)
+        self.assertEqual(len(self.decoded), 3)
+        self.assertEqual(audio4._samples.data[0, 0], 3)
+
+    def test_byte_budget(self) -> None:
+        bytes_per_entry = 100 * 2 * 2
+        self.cache.max_bytes = bytes_per_entry * 2
+
+        Audio(self.file_path, 0, 1)
+        Audio(self.file_path, 1, 2)
+        Audio(self.file_path, 0, 1)
+        self.assertEqual(self.cache.nbytes, bytes_per_entry * 2)
+
+        # 超出时移除最久未使用的，也就是 (1, 2)
+        Audio(self.file_path, 2, 3)
+        self.assertEqual(len(self.decoded), 3)
+        self.assertEqual([key[-2:] for key in self.cache.entries], [(0, 1), (2, 3)])
+        self.assertEqual(self.cache.nbytes, bytes_per_entry * 2)
+
+        # 从内存中移除后仍然可以从磁盘中读取
+        Audio(self.file_path, 1, 2)
+        self.assertEqual(len(self.decoded), 3)
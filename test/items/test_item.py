@@ -2,9 +2,11 @@ import unittest
 
 import janim.utils.refresh as refresh
 from janim.components.component import CmptInfo, Component
+from janim.constants.colors import BLUE, RED
 from janim.constants.coord import *
 from janim.items.item import Item
 from janim.items.points import Group, Points
+from janim.items.vitem import VItem
 from janim.utils.signal import Signal
 
 
@@ -87,6 +89,46 @@ class PointsTest(unittest.TestCase):
     def assertNparrayEqual(self, d1, d2) -> None:
         self.assertEqual(np.array(d1).tolist(), np.array(d2).tolist())
 
+    def test_store_readonly(self) -> None:
+        item = VItem(LEFT, RIGHT)
+        s1 = item.store(readonly=True)
+        s2 = item.store(readonly=True)
+        for key, cmpt in s1.components.items():
+            self.assertIs(s2.components[key], cmpt)
+
+        # 只有发生变化的组件会被重新复制，包含它的 _CmptGroup 也是
+        item.fill.set(RED)
+        s3 = item.store(readonly=True)
+        self.assertIsNot(s3.fill, s2.fill)
+        self.assertIsNot(s3.color, s2.color)
+        self.assertIs(s3.color.objects['fill'], s3.fill)
+        self.assertIs(s3.points, s2.points)
+        self.assertIs(s3.stroke, s2.stroke)
+        self.assertTrue(s2.fill.not_changed(s1.fill))
+        self.assertFalse(s3.fill.not_changed(s2.fill))
+
+        item.points.shift(UP)
+        s4 = item.store(readonly=True)
+        self.assertIsNot(s4.points, s3.points)
+        self.assertIs(s4.fill, s3.fill)
+
+        # 对复制以及 store 得到的物件的修改不会影响复用
+        item.copy().fill.set(BLUE)
+        s4.store().points.shift(UP)
+        s5 = item.store(readonly=True)
+        self.assertIs(s5.fill, s4.fill)
+        self.assertIs(s5.points, s4.points)
+
+        # 不是 readonly 时总是得到独立的拷贝
+        self.assertIsNot(item.store().points, s5.points)
+
+        # 被复用的组件的 bind.at_item 是最初复制得到它的物件，再次 store() 得到的拷贝则指向其本身
+        self.assertIs(s5.points.bind.at_item, s4)
+        self.assertIs(s5.fill.bind.at_item, s3)
+        s6 = s5.store()
+        for cmpt in s6.components.values():
+            self.assertIs(cmpt.bind.at_item, s6)
+
     def test_get_all(self) -> None:
         class MyPoints(Points): ...
 
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import svgelements as se
+
+from janim.items.svg.svg_item import SVGCache, SVGItem
+from janim.utils.config import Config
+
+SVG = '''\
+<svg xmlns="http://www.w3.org/2000/svg" width="20pt" height="10pt" viewBox="0 0 20 10">
+    <g data-label="a">
+        <path d="M 0 0 L 10 0 L 10 10 Z" fill="#ff0000" stroke="#00ff00" stroke-width="2"/>
+    </g>
+    <path d="M 10 0 C 12 4 18 4 20 0 A 5 5 0 0 1 10 0" fill-opacity="0.5" transform="translate(0 3)"/>
+    <g data-label="b">
+        <path d="M 0 10 Q 5 5 10 10" fill="none"/>
+    </g>
+</svg>
+'''
+
+
+class LabeledSVGItem(SVGItem):
+    group_key = 'data-label'
+
+
+class SVGCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.config = Config(temp_dir=self.tempdir.name)
+        self.config.__enter__()
+
+        self.patcher = patch.object(SVGItem, 'vitem_builders_map', {})
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        self.patcher.stop()
+        self.config.__exit__(None, None, None)
+        self.tempdir.cleanup()
+
+    def write_svg(self, name: str, content: str) -> str:
+        file_path = os.path.join(self.tempdir.name, name)
+        with open(file_path, 'w') as f:
+            f.write(content)
+        return file_path
+
+    def cache_files(self) -> list[str]:
+        return os.listdir(os.path.join(self.tempdir.name, 'svg_cache'))
+
+    def assertItemsEqual(self, item1: SVGItem, item2: SVGItem) -> None:
+        self.assertEqual(len(item1), len(item2))
+        for child1, child2 in zip(item1, item2):
+            self.assertIs(type(child1), type(child2))
+            np.testing.assert_array_equal(child1.points.get(), child2.points.get())
+            np.testing.assert_array_equal(child1.stroke.get(), child2.stroke.get())
+            np.testing.assert_array_equal(child1.fill.get(), child2.fill.get())
+            np.testing.assert_array_equal(child1.radius.get(), child2.radius.get())
+        self.assertEqual(
+            {key: [item1.children.index(child) for child in group] for key, group in item1.groups.items()},
+            {key: [item2.children.index(child) for child in group] for key, group in item2.groups.items()}
+        )
+
+    def test_cache(self) -> None:
+        file_path = self.write_svg('test.svg', SVG)
+
+        for mark_basepoint in (False, True):
+            parsed = LabeledSVGItem(file_path, mark_basepoint=mark_basepoint)
+            self.assertEqual(len(parsed), 3)
+
+            # 相当于新的进程，此时不再解析 SVG
+            SVGItem.vitem_builders_map.clear()
+            with patch.object(se.SVG, 'parse', side_effect=AssertionError):
+                cached = LabeledSVGItem(file_path, mark_basepoint=mark_basepoint)
+
+            self.assertItemsEqual(cached, parsed)
+            if mark_basepoint:
+                for child1, child2 in zip(cached, parsed):
+                    np.testing.assert_array_equal(child1.mark.get_points(), child2.mark.get_points())
+
+        self.assertEqual(len(self.cache_files()), 2)
+
+        # 分组的设置不同
+        SVGItem.vitem_builders_map.clear()
+        self.assertEqual(SVGItem(file_path).groups, {})
+        self.assertEqual(len(self.cache_files()), 3)
+
+        # 内容相同的文件共用缓存
+        SVGItem.vitem_builders_map.clear()
+        with patch.object(se.SVG, 'parse', side_effect=AssertionError):
+            LabeledSVGItem(self.write_svg('copied.svg', SVG))
+
+    def test_not_cached(self) -> None:
+        file_path = self.write_svg(
+            'rect.svg',
+            '<svg xmlns="http://www.w3.org/2000/svg" width="10pt" height="10pt" viewBox="0 0 10 10">'
+            '<rect x="0" y="0" width="5" height="5"/><path d="M 0 0 L 10 0 L 10 10 Z"/></svg>'
+        )
+        self.assertEqual(len(SVGItem(file_path)), 2)
+        self.assertEqual(self.cache_files(), [])
+
+    def test_broken_cache(self) -> None:
+        file_path = self.write_svg('test.svg', SVG)
+        LabeledSVGItem(file_path)
+        for name in self.cache_files():
+            with open(os.path.join(self.tempdir.name, 'svg_cache', name), 'wb') as f:
+                f.write(b'broken')
+
+        SVGItem.vitem_builders_map.clear()
+        self.assertIsNone(SVGCache.get(('not', 'exists')))
+        self.assertEqual(len(LabeledSVGItem(file_path)), 3)
@@ -0,0 +1,190 @@
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+import janim.items.svg.typst as typst
+from janim.exception import EXITCODE_TYPST_NOT_FOUND, ExitException
+from janim.items.svg.typst import TypstCompiler, TypstMath
+from janim.utils.config import Config
+
+# 代替 typst 的脚本：记录每次编译的起止时间，然后输出一个简单的 SVG
+FAKE_TYPST = textwrap.dedent(f'''\
+    #!{sys.executable}
+    import sys
+    import time
+
+    sys.stdin.read()
+    begin = time.time()
+    time.sleep(0.2)
+    with open(sys.argv[3], 'w') as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" width="10pt" height="10pt" viewBox="0 0 10 10">'
+                '<path d="M 0 0 L 10 0 L 10 10 Z"/></svg>')
+    with open(sys.argv[3] + '.log', 'w') as f:
+        f.write(f'{{begin}} {{time.time()}}')
+''')
+
+
+@unittest.skipIf(sys.platform == 'win32', 'uses a shebang script in place of typst')
+class TypstCompilerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        typst_bin = os.path.join(self.tempdir.name, 'typst')
+        with open(typst_bin, 'w') as f:
+            f.write(FAKE_TYPST)
+        os.chmod(typst_bin, os.stat(typst_bin).st_mode | stat.S_IEXEC)
+
+        self.config = Config(temp_dir=self.tempdir.name, typst_bin=typst_bin)
+        self.config.__enter__()
+
+        self.patcher = patch.object(typst, 'typst_compiler', TypstCompiler(max_workers=4))
+        self.patcher.start()
+
+    def tearDown(self) -> None:
+        self.patcher.stop()
+        self.config.__exit__(None, None, None)
+        self.tempdir.cleanup()
+
+    def compile_logs(self) -> list[tuple[float, float]]:
+        typst_dir = os.path.join(self.tempdir.name, 'Typst')
+        logs = []
+        for name in os.listdir(typst_dir):
+            if name.endswith('.log'):
+                with open(os.path.join(typst_dir, name)) as f:
+                    begin, end = map(float, f.read().split())
+                logs.append((begin, end))
+        return logs
+
+    def test_prefetch(self) -> None:
+        formulas = [f'x^{i}' for i in range(6)]
+
+        t = time.time()
+        TypstMath.prefetch(formulas + formulas)
+        # prefetch 只提交编译，不等待
+        self.assertLess(time.time() - t, 0.2)
+
+        items = [TypstMath(formula) for formula in formulas]
+        self.assertTrue(all(len(item) == 1 for item in items))
+
+        # 相同的文档只编译一次，并且不同的文档是同时编译的
+        logs = sorted(self.compile_logs())
+        self.assertEqual(len(logs), len(formulas))
+        self.assertTrue(any(b_begin < a_end for (_, a_end), (b_begin, _) in zip(logs, logs[1:])))
+
+        # 已编译的直接使用文件
+        compiler = TypstCompiler()
+        _, future = compiler.submit('$ x^0 $', '', '', '', {})
+        self.assertIsNone(future)
+
+    def test_not_found(self) -> None:
+        with Config(typst_bin=os.path.join(self.tempdir.name, 'not_found')):
+            # prefetch 不报错，而是在创建物件时报错
+            TypstMath.prefetch(['x'])
+            with self.assertRaises(ExitException) as cm:
+                TypstMath('x')
+            self.assertEqual(cm.exception.exit_code, EXITCODE_TYPST_NOT_FOUND)
+
+        # 失败的记录已被移除，可以重新编译
+        self.assertEqual(len(TypstMath('x')), 1)
+
+    def test_lazy(self) -> None:
+        from janim.items.vitem import VItem
+        from janim.utils.signal import _signal_gc_callback
+
+        t = time.time()
+        item = TypstMath('x^2', lazy=True, color='#ff0000')
+        # 只提交编译，不等待
+        self.assertLess(time.time() - t, 0.2)
+        self.assertIsInstance(item, TypstMath)
+        self.assertIsNot(type(item), TypstMath)
+
+        between = VItem()
+
+        # 垃圾回收时对 Signal 的清理不会使其完成创建
+        _signal_gc_callback('start', {'generation': 2})
+        self.assertIsNot(type(item), TypstMath)
+
+        # 第一次使用时等待编译完成并创建子物件
+        self.assertEqual(len(item), 1)
+        self.assertIs(type(item), TypstMath)
+
+        eager = TypstMath('x^2', color='#ff0000')
+        self.assertIs(type(eager), TypstMath)
+        self.assertTrue(np.allclose(item.points.box.data, eager.points.box.data))
+        self.assertTrue(np.allclose(item[0].points.get(), eager[0].points.get()))
+        self.assertEqual(item[0].color.get()[0].tolist(), eager[0].color.get()[0].tolist())
+
+        # 深度次序与直接创建时一致：子物件在 item 之前创建，而 item 在 between 之前创建
+        self.assertLess(item.depth, item[0].depth)
+        self.assertLess(between.depth, item.depth)
+
+    def test_lazy_failed(self) -> None:
+        with Config(typst_bin=os.path.join(self.tempdir.name, 'not_found')):
+            item = TypstMath('x', lazy=True)
+
+        # 编译失败时，之后的每次使用都会报错
+        for _ in range(2):
+            with self.assertRaises(ExitException) as cm:
+                len(item)
+            self.assertEqual(cm.exception.exit_code, EXITCODE_TYPST_NOT_FOUND)
+            with self.assertRaises(ExitException):
+                item.points
+            self.assertIsNot(type(item), TypstMath)
+
+    def test_lazy_in_timeline(self) -> None:
+        from janim.anims.timeline import Timeline
+
+        class MyTimeline(Timeline):
+            def __init__(self, text: str) -> None:
+                super().__init__()
+                self.text = text
+
+            def construct(self) -> None:
+                self.unused = TypstMath(self.text, lazy=True)
+                self.forward()
+
+        # 没有被使用的物件在构建结束时完成创建
+        built = MyTimeline('w').build(quiet=True)
+        self.assertIs(type(built.timeline.unused), TypstMath)
+
+        # 因此编译错误至迟在构建结束时报告
+        with Config(typst_bin=os.path.join(self.tempdir.name, 'not_found')):
+            with self.assertRaises(ExitException):
+                MyTimeline('u').build(quiet=True)
+
+    def test_lazy_special_methods(self) -> None:
+        item = TypstMath('y^2', lazy=True)
+        self.assertEqual([len(child.points.get()) > 0 for child in item], [True])
+        self.assertIs(type(item), TypstMath)
+
+        # 已编译的直接创建
+        self.assertIs(type(TypstMath('y^2', lazy=True)), TypstMath)
+
+    def test_in_timeline(self) -> None:
+        from janim.anims.timeline import Timeline
+
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                TypstMath.prefetch([f'z^{i}' for i in range(4)])
+                self.items = [TypstMath(f'z^{i}') for i in range(4)]
+                self.forward()
+
+        # 在 Timeline 中也是直接创建的
+        built = MyTimeline().build(quiet=True)
+        self.assertTrue(all(type(item) is TypstMath for item in built.timeline.items))
+
+        class ErrorTimeline(Timeline):
+            def construct(self) -> None:
+                self.bad = TypstMath('w')
+                self.forward()
+
+        # 编译出错时，在创建物件时报错
+        with Config(typst_bin=os.path.join(self.tempdir.name, 'not_found')):
+            with self.assertRaises(ExitException):
+                ErrorTimeline().build(quiet=True)
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+import janim.render.audio_mixdown as audio_mixdown
+from janim.anims.timeline import Timeline
+from janim.items.audio import Audio
+from janim.utils.config import Config
+
+
+def make_audio(values) -> Audio:
+    audio = Audio()
+    audio.set_samples(np.array(values, dtype=np.int16).reshape((-1, 1)))
+    return audio
+
+
+class AudioMixdownTest(unittest.TestCase):
+    def test_mix(self) -> None:
+        class Sub(Timeline):
+            CONFIG = Config(audio_framerate=10, audio_channels=1)
+
+            def construct(self):
+                self.play_audio(make_audio([1, 2, 3]))
+                self.forward(1)
+
+        class Main(Timeline):
+            CONFIG = Config(audio_framerate=10, audio_channels=1)
+
+            def construct(self):
+                audio = make_audio(range(100, 110))
+                self.play_audio(audio, delay=0.2, clip=(0.5, 0.8))
+                self.play_audio(make_audio([32700] * 4), delay=0.3)
+                Sub().build(quiet=True).to_item(delay=0.6).show()
+                self.forward(1)
+
+        built = Main().build(quiet=True)
+        mixdown = built.get_audio_mixdown(10)
+
+        expected = np.zeros(17, dtype=np.int32)
+        expected[2:5] += [105, 106, 107]
+        expected[3:7] += 32700
+        expected[6:9] += [1, 2, 3]
+        expected = np.clip(expected, -32768, 32767)
+
+        self.assertEqual(len(mixdown), 17)
+        self.assertEqual(mixdown.data[:, 0].tolist(), expected.tolist())
+        self.assertIs(built.get_audio_mixdown(10), mixdown)
+
+        # 超出范围的部分为静音
+        self.assertEqual(mixdown.samples(-2, 3)[:, 0].tolist(), [0, 0, 0, 0, 105])
+        self.assertEqual(mixdown.samples(16, 19)[:, 0].tolist(), [expected[16], 0, 0])
+        self.assertEqual(built.get_audio_samples_of_frame(5, 10, 1, count=2)[:, 0].tolist(),
+                         expected[2:6].tolist())
+
+    def test_resample(self) -> None:
+        class Main(Timeline):
+            CONFIG = Config(audio_framerate=10, audio_channels=1)
+
+            def construct(self):
+                self.play_audio(make_audio([1, 2, 3, 4, 5, 6]), delay=0.1)
+                self.forward(1)
+
+        built = Main().build(quiet=True)
+        mixdown = built.get_audio_mixdown(20)
+        self.assertEqual(mixdown.data[:16, 0].tolist(), [0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6, 0, 0])
+
+    def test_memmap(self) -> None:
+        class Main(Timeline):
+            CONFIG = Config(audio_framerate=10, audio_channels=1)
+
+            def construct(self):
+                self.play_audio(make_audio([1, 2, 3]), delay=0.5)
+                self.forward(1)
+
+        built = Main().build(quiet=True)
+        with patch.object(audio_mixdown, 'MIXDOWN_MEMMAP_BYTES', 0):
+            mixdown = built.get_audio_mixdown(10)
+
+        self.assertIsInstance(mixdown.data, np.memmap)
+        self.assertEqual(mixdown.data[4:9, 0].tolist(), [0, 1, 2, 3, 0])
@@ -0,0 +1,71 @@
+import gc
+import unittest
+
+from janim.render.base import create_context
+from janim.render.buffer_pool import (IDLE_FRAMES, MIN_BUFFER_SIZE, BufferPool,
+                                      PooledBuffers, size_class)
+
+
+class BufferPoolTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.ctx = create_context(standalone=True)
+
+    def test_size_class(self) -> None:
+        self.assertEqual(size_class(1), MIN_BUFFER_SIZE)
+        self.assertEqual(size_class(MIN_BUFFER_SIZE), MIN_BUFFER_SIZE)
+        self.assertEqual(size_class(MIN_BUFFER_SIZE + 1), MIN_BUFFER_SIZE * 2)
+        self.assertEqual(size_class(4096), 4096)
+        self.assertEqual(size_class(4097), 8192)
+
+    def test_reuse(self) -> None:
+        pool = BufferPool()
+        buffer = pool.acquire(self.ctx, 1000)
+        self.assertEqual(buffer.size, 1024)
+        pool.release(buffer)
+
+        self.assertIs(pool.acquire(self.ctx, 600), buffer)
+        self.assertEqual((pool.hits, pool.misses), (1, 1))
+        self.assertEqual(pool.resident_bytes, 1024)
+        self.assertEqual(pool.free_bytes, 0)
+
+        self.assertIsNot(pool.acquire(self.ctx, 2000), buffer)
+        self.assertEqual((pool.hits, pool.misses), (1, 2))
+        self.assertEqual(pool.resident_bytes, 1024 + 2048)
+
+    def test_pooled_buffers(self) -> None:
+        pool = BufferPool()
+        buffers = PooledBuffers(self.ctx, pool)
+        buffers.write('a', bytes(300))
+        buffers.write('b', bytes(100))
+        self.assertEqual(buffers.size('a'), 300)
+
+        # 大小等级不变时，不会更换缓冲区
+        a = buffers.buffers['a']
+        buffers.write('a', bytes(500))
+        self.assertIs(buffers.buffers['a'], a)
+        self.assertEqual(buffers.size('a'), 500)
+
+        # 被回收时归还缓冲区
+        del buffers
+        gc.collect()
+        self.assertEqual(pool.free_bytes, pool.resident_bytes)
+
+        other = PooledBuffers(self.ctx, pool)
+        other.write('a', bytes(400))
+        self.assertIs(other.buffers['a'], a)
+
+    def test_release_idle(self) -> None:
+        pool = BufferPool()
+        active = PooledBuffers(self.ctx, pool)
+        idle = PooledBuffers(self.ctx, pool)
+        active.write('a', bytes(16))
+        idle.write('a', bytes(16))
+
+        for _ in range(IDLE_FRAMES):
+            pool.begin_frame()
+            active.touch()
+
+        self.assertFalse(active.empty)
+        self.assertTrue(idle.empty)
+        self.assertEqual(pool.free_bytes, MIN_BUFFER_SIZE)
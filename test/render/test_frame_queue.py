@@ -0,0 +1,32 @@
+import io
+import unittest
+
+from janim.render.frame_queue import FrameQueue
+
+
+class BrokenPipe(io.RawIOBase):
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        raise BrokenPipeError()
+
+
+class FrameQueueTest(unittest.TestCase):
+    def test_order(self) -> None:
+        stdin = io.BytesIO()
+        with FrameQueue(stdin, 4, size=2) as frame_queue:
+            for i in range(20):
+                buffer = frame_queue.acquire()
+                buffer[:] = bytes([i] * 4)
+                frame_queue.submit(buffer)
+
+        self.assertEqual(stdin.getvalue(), b''.join(bytes([i] * 4) for i in range(20)))
+        self.assertEqual(frame_queue.stats.frames, 20)
+
+    def test_error(self) -> None:
+        with self.assertRaises(BrokenPipeError):
+            with FrameQueue(BrokenPipe(), 4, size=2) as frame_queue:
+                # 出错后不会在 acquire 处一直阻塞，而是在 submit 时抛出
+                for _ in range(20):
+                    frame_queue.submit(frame_queue.acquire())
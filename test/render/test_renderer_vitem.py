@@ -0,0 +1,65 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from janim.imports import *
+from janim.render.base import create_context
+from janim.render.framebuffer import create_framebuffer, framebuffer_context
+from janim.render.renderer_vitem import (VItemBatchRenderer,
+                                         get_vitem_batch_renderer)
+
+WIDTH = 192 * 2
+HEIGHT = 108 * 2
+
+
+class BatchTimeline(Timeline):
+    def construct(self):
+        circles = Group(*[
+            Circle(0.2, color=[RED, GREEN, BLUE][i % 3], fill_alpha=0.5)
+            .points.shift((i % 10 - 5) * 0.7 * RIGHT + (i // 10 - 2) * 0.7 * UP).r
+            for i in range(50)
+        ])
+        square = Square(2, color=YELLOW, fill_alpha=0.8).radius.set(0.1).r.set_stroke_background()
+        star = Star(color=PURPLE, fill_alpha=1).fix_in_frame().points.shift(UL * 2.5).r
+        glow = Circle(color=WHITE).glow.set(color=BLUE, alpha=0.6, size=0.5).r
+        dot = Dot()     # 与 VItem 的渲染器不同，会将前后的物件分为不同的组
+
+        self.show(circles, square, star, glow, dot)
+        square.depth.set(-1)
+        dot.depth.set(0.5)
+
+        self.forward(0.5)
+        self.play(
+            circles.anim.points.shift(UP * 0.3),
+            Rotate(square, PI / 3),
+            self.camera.anim.points.rotate(0.3).shift(LEFT)
+        )
+        self.play(Transform(glow, Square(color=GREEN)))
+
+
+class VItemBatchRendererTest(unittest.TestCase):
+    def render_frames(self, built: BuiltTimeline, ctx: mgl.Context, fbo: mgl.Framebuffer) -> list[bytes]:
+        frames = []
+        with framebuffer_context(fbo):
+            for t in np.linspace(0, built.duration, 9):
+                fbo.clear(0, 0, 0, 1)
+                self.assertTrue(built.render_all(ctx, t))
+                frames.append(fbo.read(components=4))
+        return frames
+
+    def test_same_as_unbatched(self) -> None:
+        with Config(pixel_width=WIDTH, pixel_height=HEIGHT):
+            built = BatchTimeline().build(quiet=True)
+
+        # 逐个物件渲染时，渲染器的数据与上下文相关，所以这里使用同一个上下文
+        ctx = create_context(standalone=True, require=430)
+        fbo = create_framebuffer(ctx, WIDTH, HEIGHT)
+
+        batched = self.render_frames(built, ctx, fbo)
+        self.assertNotEqual(get_vitem_batch_renderer(ctx).slots, [])
+        with patch.object(VItemBatchRenderer, 'is_supported', return_value=False):
+            unbatched = self.render_frames(built, ctx, fbo)
+
+        for t, (a, b) in enumerate(zip(batched, unbatched)):
+            self.assertEqual(a, b, f'frame {t}')
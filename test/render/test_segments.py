@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+
+from janim.anims.creation import Create
+from janim.anims.fading import FadeOut
+from janim.anims.timeline import Timeline
+from janim.constants import PI, RIGHT
+from janim.items.geometry.arc import Circle
+from janim.items.geometry.polygon import Square
+from janim.render.segments import SegmentFingerprinter, SegmentManifest
+from janim.utils.rate_functions import linear
+
+
+RATE_POWER = 2
+
+
+def power_rate_func(t: float) -> float:
+    return t ** RATE_POWER
+
+
+def build_timeline(fadeout_rate_func=None):
+    class MyTimeline(Timeline):
+        def construct(self) -> None:
+            circle = Circle().show()
+            square = Square()
+            self.play(Create(square))
+            self.play(circle.anim.points.shift(RIGHT * 2), square.anim.points.rotate(PI))
+            self.forward(1)
+            if fadeout_rate_func is None:
+                self.play(FadeOut(circle))
+            else:
+                self.play(FadeOut(circle, rate_func=fadeout_rate_func))
+
+    return MyTimeline().build(quiet=True)
+
+
+def fingerprints(built, segment_frames: int) -> list[str]:
+    fingerprinter = SegmentFingerprinter(built)
+    frame_count = round(built.duration * built.cfg.fps) + 1
+    return [
+        fingerprinter.fingerprint(begin, min(begin + segment_frames, frame_count))
+        for begin in range(0, frame_count, segment_frames)
+    ]
+
+
+class SegmentsTest(unittest.TestCase):
+    def test_fingerprint(self) -> None:
+        fps = build_timeline().cfg.fps
+
+        fp1 = fingerprints(build_timeline(), fps)
+        fp2 = fingerprints(build_timeline(), fps)
+        self.assertEqual(fp1, fp2)
+        self.assertEqual(len(set(fp1)), len(fp1))
+
+        # 只修改最后一个动画时，只有其所在的片段（3s 之后）受影响
+        fp3 = fingerprints(build_timeline(linear), fps)
+        self.assertEqual(fp1[:3], fp3[:3])
+        self.assertNotEqual(fp1[3], fp3[3])
+
+    def test_fingerprint_globals(self) -> None:
+        global RATE_POWER
+        fps = build_timeline().cfg.fps
+
+        fp1 = fingerprints(build_timeline(power_rate_func), fps)
+        try:
+            RATE_POWER = 3
+            fp2 = fingerprints(build_timeline(power_rate_func), fps)
+        finally:
+            RATE_POWER = 2
+
+        # 函数所引用的全局变量改变时，指纹也随之改变
+        self.assertEqual(fp1[:3], fp2[:3])
+        self.assertNotEqual(fp1[3], fp2[3])
+
+    def test_fingerprint_unknown(self) -> None:
+        nested = []
+        for _ in range(SegmentFingerprinter.MAX_DEPTH + 2):
+            nested = [nested]
+
+        fps = build_timeline().cfg.fps
+        fp = fingerprints(build_timeline(lambda t: t + 0 * len(nested)), fps)
+
+        # 超出最大深度时，受影响的片段的指纹未知
+        self.assertNotIn(None, fp[:3])
+        self.assertIsNone(fp[3])
+
+    def test_manifest(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            manifest = SegmentManifest.load(directory, 'key')
+            self.assertEqual(manifest.segments, {})
+
+            for filename in ('00000000.mp4', '00000030.mp4', '00000060.mp4',
+                             '00000090_temp.mp4', '00000090.mp4.tmp', 'notes.txt', '00000000.mov'):
+                with open(os.path.join(directory, filename), 'wb'):
+                    pass
+            os.mkdir(os.path.join(directory, '00000120.mp4'))
+
+            manifest.add('00000000.mp4', 0, 30, 'fp-a')
+            manifest.add('00000030.mp4', 30, 60, 'fp-b')
+
+            manifest = SegmentManifest.load(directory, 'key')
+            self.assertTrue(manifest.is_valid('00000000.mp4', 0, 30, 'fp-a'))
+            self.assertFalse(manifest.is_valid('00000000.mp4', 0, 30, 'fp-changed'))
+            self.assertFalse(manifest.is_valid('00000060.mp4', 60, 90, 'fp-c'))
+            manifest.add('00000060.mp4', 60, 90, None)
+            self.assertFalse(manifest.is_valid('00000060.mp4', 60, 90, None))
+
+            # 只删除不再使用的片段文件以及遗留的临时文件，其它文件和文件夹保留
+            manifest.remove_unused({'00000000.mp4'}, '.mp4')
+            self.assertEqual(sorted(os.listdir(directory)),
+                             ['00000000.mov', '00000000.mp4', '00000120.mp4', 'manifest.json', 'notes.txt'])
+            self.assertEqual(list(manifest.segments), ['00000000.mp4'])
+
+            self.assertEqual(SegmentManifest.load(directory, 'other').segments, {})
@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+
+from janim.imports import *
+from janim.render.base import create_context
+from janim.render.framebuffer import create_framebuffer, framebuffer_context
+
+WIDTH = 192 * 2
+HEIGHT = 108 * 2
+
+
+class StaticTimeline(Timeline):
+    def construct(self):
+        background = Group(*[
+            Square(0.5, color=[RED, GREEN, BLUE][i % 3], fill_alpha=0.4)
+            .points.shift((i % 10 - 5) * 0.35 * RIGHT + (i // 10 - 2) * 0.35 * UP).r
+            for i in range(50)
+        ])
+        foreground = Group(*[
+            Circle(0.3, color=YELLOW, fill_alpha=0.6).points.shift(i * 0.5 * RIGHT).r
+            for i in range(4)
+        ])
+        foreground.depth.set(-1)
+        star = Star(color=PURPLE, fill_alpha=0.7)
+
+        self.show(background, foreground, star)
+        self.play(star.anim.points.shift(RIGHT * 3))
+        self.play(foreground.anim.points.shift(DOWN))
+        self.play(self.camera.anim.points.shift(LEFT))
+
+
+class StaticLayersTest(unittest.TestCase):
+    def render_frames(self, built: BuiltTimeline, ctx: mgl.Context, fbo: mgl.Framebuffer) -> np.ndarray:
+        frames = []
+        with framebuffer_context(fbo):
+            for t in np.linspace(0, built.duration, 13):
+                fbo.clear(0, 0, 0, 1)
+                self.assertTrue(built.render_all(ctx, t))
+                frames.append(np.frombuffer(fbo.read(components=4), dtype=np.uint8))
+        return np.array(frames, dtype=int)
+
+    def test_same_as_direct(self) -> None:
+        with Config(pixel_width=WIDTH, pixel_height=HEIGHT):
+            built = StaticTimeline().build(quiet=True)
+
+        ctx = create_context(standalone=True, require=430)
+        fbo = create_framebuffer(ctx, WIDTH, HEIGHT)
+
+        direct = self.render_frames(built, ctx, fbo)
+        built.use_static_layers = True
+        layered = self.render_frames(built, ctx, fbo)
+
+        layer_cache = built.static_layer_caches[ctx]
+        self.assertGreater(layer_cache.hits, 0)
+        self.assertGreater(layer_cache.misses, 0)
+
+        # 直接绘制时每次混合都会舍入到 8 位，所以允许细微的差异
+        self.assertLessEqual(np.abs(direct - layered).max(), 2)
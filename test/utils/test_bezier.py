@@ -0,0 +1,87 @@
+import random
+import unittest
+
+import numpy as np
+
+from janim.utils.bezier import (SEGMENT_CUBIC, SEGMENT_LINE, SEGMENT_MOVE,
+                                SEGMENT_POINTS, SEGMENT_QUAD, PathBuilder,
+                                quadratic_paths_from_segments)
+
+
+class QuadraticPathsFromSegmentsTest(unittest.TestCase):
+    def random_path(self, rng: random.Random) -> tuple[list[int], list[np.ndarray], list[np.ndarray], np.ndarray]:
+        def point(prev: np.ndarray | None = None) -> np.ndarray:
+            # 有一定概率与前一个点相同，以覆盖 cubic_to 中的各种退化情况
+            if prev is not None and rng.random() < 0.3:
+                return prev.copy()
+            return np.array([rng.randint(-5, 5), rng.uniform(-5, 5), 0])
+
+        builder = PathBuilder()
+        kinds = []
+        points = []
+        extra_points = []
+
+        cur = point()
+        builder.move_to(cur)
+        kinds.append(SEGMENT_MOVE)
+        points.append([cur, cur, cur])
+
+        for _ in range(rng.randint(0, 10)):
+            kind = rng.choice([SEGMENT_MOVE, SEGMENT_LINE, SEGMENT_QUAD, SEGMENT_CUBIC, SEGMENT_CUBIC, SEGMENT_POINTS])
+            if kind == SEGMENT_MOVE:
+                cur = point()
+                builder.move_to(cur)
+                points.append([cur, cur, cur])
+            elif kind == SEGMENT_LINE:
+                cur = point(cur)
+                builder.line_to(cur)
+                points.append([cur, cur, cur])
+            elif kind == SEGMENT_QUAD:
+                handle, cur = point(cur), point()
+                builder.conic_to(handle, cur)
+                points.append([handle, cur, cur])
+            elif kind == SEGMENT_CUBIC:
+                handle1 = point(cur)
+                handle2 = point(handle1)
+                cur = point(handle2)
+                builder.cubic_to(handle1, handle2, cur)
+                points.append([handle1, handle2, cur])
+            else:
+                arr = np.array([point() for _ in range(rng.choice([2, 4, 6]))])
+                builder.append(arr)
+                extra_points.append(arr)
+                cur = arr[-1]
+                points.append([cur, cur, cur])
+            kinds.append(kind)
+
+        return kinds, points, extra_points, builder.get()
+
+    def test_same_as_path_builder(self) -> None:
+        rng = random.Random(0)
+
+        kinds = []
+        points = []
+        extra_points = []
+        path_lengths = []
+        expected = []
+        for i in range(300):
+            if i % 50 == 0:
+                path_lengths.append(0)
+                expected.append(np.empty((0, 3)))
+                continue
+            path_kinds, path_points, path_extra_points, path_expected = self.random_path(rng)
+            kinds += path_kinds
+            points += path_points
+            extra_points += path_extra_points
+            path_lengths.append(len(path_kinds))
+            expected.append(path_expected)
+
+        results = quadratic_paths_from_segments(kinds, np.array(points, dtype=float), extra_points, path_lengths)
+
+        self.assertEqual(len(results), len(expected))
+        for result, path_expected in zip(results, expected):
+            np.testing.assert_array_equal(result, path_expected)
+
+    def test_empty(self) -> None:
+        results = quadratic_paths_from_segments([], np.zeros((0, 3, 3)), [], [0, 0])
+        self.assertEqual([result.shape for result in results], [(0, 3), (0, 3)])
@@ -0,0 +1,31 @@
+import os
+import tempfile
+import unittest
+
+from janim.utils.file_ops import atomic_write
+
+
+class FileOpsTest(unittest.TestCase):
+    def test_atomic_write(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'data.txt')
+
+            with atomic_write(path) as temp_path:
+                self.assertEqual(os.path.dirname(temp_path), directory)
+                self.assertTrue(temp_path.endswith('.tmp'))
+                with open(temp_path, 'wt', encoding='utf-8') as f:
+                    f.write('first')
+
+            with open(path, 'rt', encoding='utf-8') as f:
+                self.assertEqual(f.read(), 'first')
+
+            # 写入过程中出现异常时，原有文件保持不变，并且临时文件被删除
+            with self.assertRaises(RuntimeError):
+                with atomic_write(path) as temp_path:
+                    with open(temp_path, 'wt', encoding='utf-8') as f:
+                        f.write('second')
+                    raise RuntimeError()
+
+            with open(path, 'rt', encoding='utf-8') as f:
+                self.assertEqual(f.read(), 'first')
+            self.assertEqual(os.listdir(directory), ['data.txt'])
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+import janim.utils.font.database as database
+import janim.utils.font_manager as font_manager
+from janim.utils.config import Config
+from janim.utils.font.database import (FontIndex, get_database,
+                                       get_font_info_by_attrs)
+from janim.utils.font.variant import Style
+
+
+def build_font(file_path: str, family_name: str, style_name: str, weight: int, italic: bool = False) -> None:
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(['.notdef'])
+    fb.setupCharacterMap({})
+    fb.setupGlyf({'.notdef': TTGlyphPen(None).glyph()})
+    fb.setupHorizontalMetrics({'.notdef': (500, 0)})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({'familyName': family_name, 'styleName': style_name})
+    fb.setupOS2(usWeightClass=weight, fsSelection=0x01 if italic else 0x40)
+    fb.setupPost()
+    fb.updateHead(macStyle=0x02 if italic else 0)
+    fb.save(file_path)
+
+
+class FontIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.config = Config(temp_dir=self.tempdir.name)
+        self.config.__enter__()
+
+        self.font_paths = []
+        for style_name, weight, italic in [('Regular', 400, False), ('Bold', 700, False), ('Italic', 400, True)]:
+            file_path = os.path.join(self.tempdir.name, f'JAnimTest-{style_name}.ttf')
+            build_font(file_path, 'JAnim Test', style_name, weight, italic)
+            self.font_paths.append(file_path)
+
+        with open(os.path.join(self.tempdir.name, 'broken.ttf'), 'wb') as f:
+            f.write(b'broken')
+        self.font_paths.append(os.path.join(self.tempdir.name, 'broken.ttf'))
+
+        self.opened: list[str] = []
+        open_fonts = database.open_fonts
+
+        def record_open_fonts(filepath: str):
+            self.opened.append(filepath)
+            return open_fonts(filepath)
+
+        self.patchers = [
+            patch.object(database, 'open_fonts', record_open_fonts),
+            patch.object(font_manager, 'findSystemFonts', lambda: list(self.font_paths)),
+            patch.object(database, '_database', None),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    def tearDown(self) -> None:
+        for patcher in self.patchers:
+            patcher.stop()
+        self.config.__exit__(None, None, None)
+        self.tempdir.cleanup()
+
+    def reload(self) -> None:
+        # 相当于新的进程
+        database._database = None
+        self.opened.clear()
+        get_database()
+
+    def test_index(self) -> None:
+        self.reload()
+        self.assertEqual(sorted(self.opened), sorted(self.font_paths))
+
+        # 之后的进程直接使用索引，不需要打开字体文件
+        self.reload()
+        self.assertEqual(self.opened, [])
+
+        info = get_font_info_by_attrs('JAnim Test', 'bold', 'normal')
+        self.assertEqual((info.full_name, info.weight, info.style), ('JAnim Test Bold', 700, Style.Normal))
+        info = get_font_info_by_attrs('JAnim Test', 'regular', 'italic')
+        self.assertEqual((info.filepath, info.style), (self.font_paths[2], Style.Italic))
+        info = get_font_info_by_attrs('JAnim Test Bold', 'regular', 'normal', force_full_name=True)
+        self.assertEqual(info.filepath, self.font_paths[1])
+        self.assertEqual(self.opened, [])
+
+        # 只有在需要完整的 name 表时才会打开
+        self.assertEqual(info.name.getBestFamilyName(), 'JAnim Test')
+        self.assertEqual(self.opened, [self.font_paths[1]])
+
+    def test_incremental_update(self) -> None:
+        self.reload()
+
+        # 发生变化的字体文件被重新读取
+        build_font(self.font_paths[0], 'JAnim Test', 'Light', 300)
+        stat = os.stat(self.font_paths[0])
+        os.utime(self.font_paths[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        # 不再存在的字体文件被移除
+        os.remove(self.font_paths[1])
+        self.font_paths.pop(1)
+
+        self.reload()
+        self.assertEqual(self.opened, [self.font_paths[0]])
+        family = get_database().family_by_name['JAnim Test']
+        self.assertEqual(sorted(info.weight for info in family.infos), [300, 400])
+
+        index = FontIndex(FontIndex.get_default_file_path())
+        index.load()
+        self.assertEqual(sorted(index.entries.keys()), sorted(self.font_paths))
+        self.assertIsNone(index.entries[self.font_paths[-1]][2])
+
+    def test_broken_index(self) -> None:
+        with open(FontIndex.get_default_file_path(), 'w') as f:
+            f.write('broken')
+
+        self.reload()
+        self.assertEqual(len(get_database().family_by_name['JAnim Test'].infos), 3)
+
+        self.reload()
+        self.assertEqual(self.opened, [])
@@ -0,0 +1,52 @@
+import math
+import random
+import unittest
+
+from janim.utils.interval_tree import IntervalTree
+
+
+class IntervalTreeTest(unittest.TestCase):
+    def test_random(self) -> None:
+        rnd = random.Random(0)
+        tree: IntervalTree[int] = IntervalTree()
+        intervals: dict[int, tuple[float, float]] = {}
+        nodes = {}
+
+        for seq in range(300):
+            begin = rnd.randint(0, 40) / 2
+            end = math.inf if rnd.random() < 0.1 else begin + rnd.randint(1, 20) / 2
+            nodes[seq] = tree.insert(begin, end, seq, seq)
+            intervals[seq] = (begin, end)
+
+            if rnd.random() < 0.3:
+                removed = rnd.choice(list(intervals))
+                tree.remove(nodes.pop(removed))
+                del intervals[removed]
+
+            if rnd.random() < 0.3:
+                changed = rnd.choice(list(intervals))
+                begin, end = intervals[changed]
+                end = begin + rnd.randint(1, 20) / 2
+                tree.set_end(nodes[changed], end)
+                intervals[changed] = (begin, end)
+
+        self.assertEqual(len(tree), len(intervals))
+        self.assertEqual([node.seq for node in tree], sorted(intervals, key=lambda seq: (intervals[seq][0], seq)))
+
+        def expected(cond) -> list[int]:
+            return sorted(
+                (seq for seq, (begin, end) in intervals.items() if cond(begin, end)),
+                key=lambda seq: (intervals[seq][0], seq)
+            )
+
+        for t in [x / 4 for x in range(-4, 140)]:
+            self.assertEqual([node.seq for node in tree.stab(t)],
+                             expected(lambda begin, end: begin <= t < end))
+            self.assertEqual([node.seq for node in tree.stab(t, at_left=True)],
+                             expected(lambda begin, end: begin < t <= end))
+            self.assertEqual([node.seq for node in tree.overlap(t, t + 3)],
+                             expected(lambda begin, end: begin < t + 3 and end > t))
+            self.assertEqual(tree.next_begin(t),
+                             min((begin for begin, _ in intervals.values() if begin > t), default=math.inf))
+            self.assertEqual(tree.next_begin(t, inclusive=True),
+                             min((begin for begin, _ in intervals.values() if begin >= t), default=math.inf))
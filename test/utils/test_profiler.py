@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+
+from janim.imports import *
+from janim.utils.profiler import (Profiler, disable_profiling,
+                                  enable_profiling, get_profiler, profile_span)
+
+
+class ProfilerTimeline(Timeline):
+    def construct(self):
+        circle = Circle(fill_alpha=0.5)
+        self.play(Create(circle))
+
+
+class ProfilerTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        disable_profiling()
+
+    def test_disabled(self) -> None:
+        self.assertIsNone(get_profiler())
+        with profile_span('test', 'test', item=Circle()):
+            pass
+        self.assertIsNone(get_profiler())
+
+    def test_span(self) -> None:
+        profiler = enable_profiling()
+        self.assertIs(enable_profiling(), profiler)
+
+        with profile_span('outer', 'test', item=Circle(), renderer=VItem.renderer_cls, count=2, skipped=None):
+            with profile_span('inner', 'test'):
+                pass
+
+        inner, outer = profiler.events
+        self.assertEqual(inner['name'], 'inner')
+        self.assertEqual(outer['name'], 'outer')
+        self.assertEqual(outer['ph'], 'X')
+        self.assertEqual(outer['args'], dict(item='Circle', renderer='VItemRenderer', count=2))
+        self.assertLessEqual(outer['ts'], inner['ts'])
+        self.assertGreaterEqual(outer['ts'] + outer['dur'], inner['ts'] + inner['dur'])
+
+        other = Profiler()
+        with other.span('other', 'test', {}):
+            pass
+        profiler.merge(other)
+        self.assertEqual(len(profiler.events), 3)
+
+    def test_render_all(self) -> None:
+        built = ProfilerTimeline().build(quiet=True)
+
+        profiler = enable_profiling()
+        built.capture(built.duration / 2)
+        disable_profiling()
+
+        names = {event['name'] for event in profiler.events}
+        for name in ('BuiltTimeline.render_all', 'AnimStack.compute', 'ItemAnimation.apply', 'Renderer.render'):
+            self.assertIn(name, names)
+
+        applies = [event['args'] for event in profiler.events if event['name'] == 'ItemAnimation.apply']
+        self.assertIn(dict(anim='_DataUpdater', generate_by='Create', item='Circle'), applies)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'profile.json')
+            profiler.save(file_path)
+            with open(file_path, encoding='utf-8') as f:
+                trace = json.load(f)
+
+        metadata = [event for event in trace['traceEvents'] if event['ph'] == 'M']
+        self.assertEqual(len(trace['traceEvents']), len(profiler.events) + len(metadata))
+        self.assertTrue(any(event['name'] == 'thread_name' for event in metadata))